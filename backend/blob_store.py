@@ -0,0 +1,157 @@
+"""
+Agentic Data Scientist — Content-addressed dataset cache.
+
+Uploaded datasets are stored once under ``OUTPUT_ROOT/.blobs/objects``, keyed
+by SHA-256, and materialized in each session's ``user_data`` directory as a
+copy-on-write reflink, or a plain copy where the filesystem has no reflinks.
+A small SQLite table records which session references which blob; when a
+session is deleted its references are dropped and unreferenced blobs are
+garbage-collected.
+
+Datasets are never hardlinked: ``user_data`` is a writable agent workspace,
+and an agent writing a hardlinked file in place (file modes do not stop root
+or the owner) would change the shared object under every other session and
+break its SHA-256 address. Objects themselves are kept read-only.
+"""
+
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import stat
+import threading
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.getenv("DATASET_CACHE", "true").lower() in ("true", "1")
+
+_SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
+# Linux FICLONE ioctl (copy-on-write clone on btrfs/xfs/overlayfs with reflink support)
+_FICLONE = 0x40049409
+
+
+def is_sha256(value: str) -> bool:
+    return bool(_SHA256_RE.match(value or ""))
+
+
+def _reflink(src: Path, dest: Path) -> bool:
+    try:
+        import fcntl
+    except ImportError:  # Windows
+        return False
+    try:
+        with open(src, "rb") as s, open(dest, "wb") as d:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+        return True
+    except OSError:
+        dest.unlink(missing_ok=True)
+        return False
+
+
+class BlobStore:
+    """SHA-256 keyed blob store with per-session reference counts."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.tmp_dir = self.root / "tmp"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.root / "refs.db"), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS refs (
+                sha256     TEXT NOT NULL,
+                session_id TEXT NOT NULL,
+                name       TEXT NOT NULL,
+                PRIMARY KEY (session_id, name)
+            );
+            CREATE INDEX IF NOT EXISTS idx_refs_sha ON refs (sha256);
+            """
+        )
+
+    # All methods below are blocking; call them from a worker thread.
+
+    def object_path(self, sha256: str) -> Path:
+        if not is_sha256(sha256):
+            raise ValueError(f"Invalid SHA-256 digest: {sha256!r}")
+        return self.objects_dir / sha256[:2] / sha256
+
+    def tmp_path(self) -> Path:
+        """A fresh path to stream an upload into before its hash is known."""
+        return self.tmp_dir / uuid.uuid4().hex
+
+    def ingest(self, tmp: Path, sha256: str) -> bool:
+        """Move a fully written temp file into the store. Returns False if it was already cached."""
+        obj = self.object_path(sha256)
+        with self._lock:
+            if obj.exists():
+                tmp.unlink(missing_ok=True)
+                return False
+            obj.parent.mkdir(exist_ok=True)
+            os.replace(tmp, obj)
+            os.chmod(obj, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            return True
+
+    def link(self, sha256: str, dest: Path, session_id: str, name: str) -> str:
+        """
+        Materialize a blob at ``dest`` and record the reference.
+
+        ``dest`` never shares storage writably with the object, so the
+        session may modify it. Returns the method used: ``"reflink"`` or
+        ``"copy"``.
+        """
+        obj = self.object_path(sha256)
+        with self._lock:
+            if not obj.exists():
+                raise FileNotFoundError(f"Blob not found: {sha256}")
+            dest.unlink(missing_ok=True)
+            if _reflink(obj, dest):
+                method = "reflink"
+            else:
+                shutil.copyfile(obj, dest)
+                method = "copy"
+            os.chmod(dest, stat.S_IRUSR | stat.S_IWUSR | stat.S_IRGRP | stat.S_IROTH)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO refs (sha256, session_id, name) VALUES (?, ?, ?)",
+                (sha256, session_id, name),
+            )
+        return method
+
+    def stat(self, sha256: str) -> Optional[Dict]:
+        """Size and reference count of a cached blob, or None if absent."""
+        obj = self.object_path(sha256)
+        with self._lock:
+            if not obj.exists():
+                return None
+            (refcount,) = self._conn.execute("SELECT COUNT(*) FROM refs WHERE sha256 = ?", (sha256,)).fetchone()
+            return {"sha256": sha256, "size": obj.stat().st_size, "refcount": refcount}
+
+    def release_session(self, session_id: str) -> List[str]:
+        """Drop a session's references and delete blobs nobody references any more."""
+        with self._lock:
+            shas = [
+                row[0]
+                for row in self._conn.execute("SELECT DISTINCT sha256 FROM refs WHERE session_id = ?", (session_id,))
+            ]
+            self._conn.execute("DELETE FROM refs WHERE session_id = ?", (session_id,))
+            removed = []
+            for sha256 in shas:
+                (refcount,) = self._conn.execute("SELECT COUNT(*) FROM refs WHERE sha256 = ?", (sha256,)).fetchone()
+                if refcount == 0:
+                    self.object_path(sha256).unlink(missing_ok=True)
+                    removed.append(sha256)
+        if removed:
+            logger.info("Garbage-collected %d unreferenced dataset blob(s)", len(removed))
+        return removed
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,221 @@
+"""
+Agentic Data Scientist — Replayable per-session event log.
+
+Every event produced by an agent run is assigned a monotonically increasing
+ID, appended to a JSONL file and kept in a bounded in-memory ring buffer.
+Any number of SSE subscribers can follow the log concurrently and resume
+from an arbitrary ID (the ``Last-Event-ID`` header); events that have fallen
+out of the ring are replayed from disk.
+
+Two policies keep a fast producer in check (``EVENT_LOG_POLICY``):
+
+- ``coalesce`` (default): consecutive partial message events from the same
+  author are merged into one event, flushed when a different event arrives or
+  after ``EVENT_LOG_COALESCE_INTERVAL`` seconds. This also bounds the number
+  of SSE frames written per second.
+- ``block``: ``append`` waits while the slowest connected subscriber is a
+  full ring behind, propagating backpressure to the agent run. With no
+  subscribers connected the producer never blocks.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+from itertools import count, islice
+from pathlib import Path
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+RING_SIZE = int(os.getenv("EVENT_LOG_RING_SIZE", "2000"))
+POLICY = os.getenv("EVENT_LOG_POLICY", "coalesce")  # "coalesce" | "block"
+COALESCE_INTERVAL = float(os.getenv("EVENT_LOG_COALESCE_INTERVAL", "0.1"))
+
+
+def _is_partial_message(event: dict) -> bool:
+    return event.get("type") == "message" and bool(event.get("is_partial"))
+
+
+def _can_coalesce(pending: dict, event: dict) -> bool:
+    return pending.get("author") == event.get("author") and bool(pending.get("is_thought")) == bool(
+        event.get("is_thought")
+    )
+
+
+def _read_from_disk(path: Path, after_id: int, before_id: Optional[int] = None) -> List[Tuple[int, str]]:
+    """Return ``(id, json)`` pairs with ``after_id < id < before_id`` from a log file."""
+    entries = []
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            for line in fh:
+                sep = line.find(" ")
+                if sep <= 0:
+                    continue
+                event_id = int(line[:sep])
+                if event_id <= after_id:
+                    continue
+                if before_id is not None and event_id >= before_id:
+                    break
+                entries.append((event_id, line[sep + 1 :].rstrip("\n")))
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+class EventLog:
+    """
+    Append-only event log for one session.
+
+    Each line of the backing file is ``"<id> <json>"`` so a reader can skip
+    to a given ID without decoding payloads.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        ring_size: int = RING_SIZE,
+        policy: str = POLICY,
+        coalesce_interval: float = COALESCE_INTERVAL,
+    ):
+        if policy not in ("coalesce", "block"):
+            raise ValueError(f"Unknown event log policy: {policy!r}")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.policy = policy
+        self._ring: Deque[Tuple[int, str]] = deque(maxlen=ring_size)
+        self._last_id = 0
+        self._closed = False
+        self._changed = asyncio.Event()
+        self._file = open(self.path, "a", encoding="utf-8")
+        # Coalescing state: a partial message not yet assigned an ID
+        self._coalesce_interval = coalesce_interval
+        self._pending: Optional[dict] = None
+        self._pending_timer: Optional[asyncio.TimerHandle] = None
+        self.coalesced_count = 0
+        # Backpressure state: last ID delivered to each connected subscriber
+        self._subscriber_ids = count()
+        self._cursors: Dict[int, int] = {}
+        self._progress = asyncio.Event()
+
+    @property
+    def last_id(self) -> int:
+        return self._last_id
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _write(self, event: dict) -> int:
+        self._last_id += 1
+        payload = json.dumps(event)
+        self._ring.append((self._last_id, payload))
+        self._file.write(f"{self._last_id} {payload}\n")
+        self._notify()
+        return self._last_id
+
+    def _flush_pending(self) -> None:
+        if self._pending_timer is not None:
+            self._pending_timer.cancel()
+            self._pending_timer = None
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            self._write(pending)
+
+    async def _wait_for_subscribers(self) -> None:
+        """Block while the slowest subscriber is a full ring behind."""
+        while self._cursors and self._last_id - min(self._cursors.values()) >= self._ring.maxlen:
+            progress = self._progress
+            await progress.wait()
+
+    def _signal_progress(self) -> None:
+        self._progress.set()
+        self._progress = asyncio.Event()
+
+    def _advance(self, subscriber: int, event_id: int) -> None:
+        self._cursors[subscriber] = event_id
+        self._signal_progress()
+
+    async def append(self, event: dict) -> Optional[int]:
+        """
+        Append an event and wake all subscribers.
+
+        Returns the assigned ID, or None if the event was buffered for
+        coalescing (it will be written as part of a merged event).
+        """
+        if self._closed:
+            raise RuntimeError("Cannot append to a closed event log")
+
+        if self.policy == "coalesce" and _is_partial_message(event):
+            if self._pending is not None and _can_coalesce(self._pending, event):
+                self._pending["content"] = self._pending.get("content", "") + event.get("content", "")
+                self._pending["timestamp"] = event.get("timestamp", self._pending.get("timestamp"))
+                self.coalesced_count += 1
+                return None
+            self._flush_pending()
+            self._pending = dict(event)
+            self._pending_timer = asyncio.get_running_loop().call_later(self._coalesce_interval, self._flush_pending)
+            return None
+
+        self._flush_pending()
+        if self.policy == "block":
+            await self._wait_for_subscribers()
+        return self._write(event)
+
+    def close(self) -> None:
+        """Mark the log complete; subscribers finish once they have caught up."""
+        if self._closed:
+            return
+        self._flush_pending()
+        self._closed = True
+        self._file.close()
+        self._notify()
+
+    async def subscribe(self, last_event_id: int = 0) -> AsyncIterator[Tuple[int, str]]:
+        """Yield ``(id, json)`` for every event after ``last_event_id``, following live appends."""
+        cursor = max(last_event_id, 0)
+        subscriber = next(self._subscriber_ids)
+        self._cursors[subscriber] = cursor
+        try:
+            async for entry in self._follow(cursor, subscriber):
+                yield entry
+        finally:
+            self._cursors.pop(subscriber, None)
+            self._signal_progress()
+
+    async def _follow(self, cursor: int, subscriber: int) -> AsyncIterator[Tuple[int, str]]:
+        while True:
+            changed = self._changed
+            if cursor < self._last_id:
+                first_in_ring = self._ring[0][0] if self._ring else self._last_id + 1
+                if cursor + 1 < first_in_ring:
+                    # Fell out of the ring: replay the gap from disk
+                    if not self._file.closed:
+                        self._file.flush()
+                    backlog = await asyncio.to_thread(_read_from_disk, self.path, cursor, first_in_ring)
+                    if not backlog:
+                        logger.warning("Event log %s is missing IDs %d..%d", self.path, cursor + 1, first_in_ring - 1)
+                        cursor = first_in_ring - 1
+                        continue
+                else:
+                    backlog = list(islice(self._ring, cursor + 1 - first_in_ring, None))
+                for event_id, payload in backlog:
+                    cursor = event_id
+                    yield event_id, payload
+                    self._advance(subscriber, event_id)
+                continue
+            if self._closed:
+                return
+            await changed.wait()
+
+
+async def replay(path: Path, last_event_id: int = 0) -> AsyncIterator[Tuple[int, str]]:
+    """Replay a finished session's log from disk (e.g. after a backend restart)."""
+    for entry in await asyncio.to_thread(_read_from_disk, Path(path), last_event_id):
+        yield entry
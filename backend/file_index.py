@@ -0,0 +1,339 @@
+"""
+Agentic Data Scientist — Incremental per-session file index.
+
+Each session's working directory is scanned once and then kept up to date
+from filesystem notifications (``watchfiles``: inotify / FSEvents /
+ReadDirectoryChangesW). Only the paths that changed are re-stat'ed, so a
+file appearing five directories deep costs one ``stat`` instead of a full
+tree walk. If notifications are unavailable the index falls back to a
+rescan-and-diff at most every ``FILE_INDEX_POLL_INTERVAL`` seconds, and
+only when a client actually asks for the tree.
+
+Hidden files and directories (``.git``, ``.venv``, ...) are not indexed and
+their change events are dropped, mirroring the workspace artifact watcher.
+The notify backend watches recursively, so it still registers watches on
+hidden trees; only their events are filtered out.
+
+Every change bumps the index ``version`` and is recorded in a bounded
+journal, so clients holding version ``N`` can ask for just the changes
+since ``N`` instead of the whole tree.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+
+try:
+    import watchfiles
+except ImportError:  # pragma: no cover - shipped with uvicorn[standard]
+    watchfiles = None
+
+
+logger = logging.getLogger(__name__)
+
+MAX_SESSIONS = int(os.getenv("FILE_INDEX_MAX_SESSIONS", "50"))
+POLL_INTERVAL = float(os.getenv("FILE_INDEX_POLL_INTERVAL", "2.0"))
+WATCH = os.getenv("FILE_INDEX_WATCH", "true").lower() in ("true", "1")
+JOURNAL_SIZE = int(os.getenv("FILE_INDEX_JOURNAL_SIZE", "5000"))
+WATCH_DEBOUNCE_MS = 200
+
+
+def _entry(rel: str, st: os.stat_result, is_dir: bool) -> dict:
+    entry = {"name": rel.rsplit("/", 1)[-1], "path": rel, "type": "directory" if is_dir else "file"}
+    if not is_dir:
+        entry["size"] = st.st_size
+        entry["mtime"] = st.st_mtime
+    return entry
+
+
+def _is_hidden(rel: str) -> bool:
+    return any(part.startswith(".") for part in rel.split("/"))
+
+
+def _sort_key(entry: dict):
+    return (entry["type"] != "directory", entry["name"].lower())
+
+
+class FileIndex:
+    """
+    Flat ``path -> entry`` index of one directory tree.
+
+    Paths are POSIX-style and relative to ``root``. All mutating methods are
+    blocking and thread-safe; call them from a worker thread.
+    """
+
+    def __init__(self, root: Path, journal_size: int = JOURNAL_SIZE):
+        self.root = Path(root).absolute()
+        self.version = 0
+        self.watching = False
+        self.last_scan = 0.0
+        self._entries: Dict[str, dict] = {}
+        self._children: Dict[str, Set[str]] = {"": set()}
+        self._journal: Deque[Tuple[int, dict]] = deque(maxlen=journal_size)
+        self._tree_cache: Optional[Tuple[int, list]] = None
+        self._lock = threading.Lock()
+
+    # ── Paths ────────────────────────────────────────────────────────────────
+
+    def _rel(self, path: str) -> Optional[str]:
+        try:
+            rel = Path(path).relative_to(self.root).as_posix()
+        except ValueError:
+            return None
+        return "" if rel == "." else rel
+
+    def accepts(self, path: str) -> bool:
+        """Whether an absolute path belongs in the index (inside ``root`` and not hidden)."""
+        rel = self._rel(path)
+        return bool(rel) and not _is_hidden(rel)
+
+    @staticmethod
+    def _parent(rel: str) -> str:
+        return rel.rsplit("/", 1)[0] if "/" in rel else ""
+
+    # ── Mutations (lock held) ────────────────────────────────────────────────
+
+    def _record(self, change: dict) -> None:
+        self.version += 1
+        self._journal.append((self.version, change))
+
+    def _put(self, rel: str, entry: dict) -> None:
+        old = self._entries.get(rel)
+        if old == entry:
+            return
+        if old is not None and old["type"] != entry["type"]:
+            self._remove(rel)
+        self._entries[rel] = entry
+        self._children.setdefault(self._parent(rel), set()).add(rel)
+        if entry["type"] == "directory":
+            self._children.setdefault(rel, set())
+        self._record({"op": "upsert", "path": rel, "entry": entry})
+
+    def _remove(self, rel: str) -> None:
+        """Drop ``rel`` and its whole subtree; one journal entry covers the subtree."""
+        if rel not in self._entries:
+            return
+        stack = [rel]
+        while stack:
+            current = stack.pop()
+            self._entries.pop(current, None)
+            stack.extend(self._children.pop(current, ()))
+        self._children.get(self._parent(rel), set()).discard(rel)
+        self._record({"op": "delete", "path": rel})
+
+    def _ensure_parents(self, rel: str) -> None:
+        parent = self._parent(rel)
+        missing = []
+        while parent and parent not in self._entries:
+            missing.append(parent)
+            parent = self._parent(parent)
+        for path in reversed(missing):
+            try:
+                st = os.stat(self.root / path)
+            except OSError:
+                return
+            self._put(path, _entry(path, st, True))
+
+    def _scan(self, directory: Path) -> Dict[str, dict]:
+        """Walk ``directory`` with ``os.scandir`` and return its entries."""
+        found: Dict[str, dict] = {}
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    for dirent in it:
+                        if dirent.name.startswith("."):
+                            continue
+                        rel = self._rel(dirent.path)
+                        try:
+                            is_dir = dirent.is_dir(follow_symlinks=False)
+                            st = dirent.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        found[rel] = _entry(rel, st, is_dir)
+                        if is_dir:
+                            stack.append(Path(dirent.path))
+            except (PermissionError, FileNotFoundError, NotADirectoryError):
+                continue
+        return found
+
+    # ── Public API ───────────────────────────────────────────────────────────
+
+    def rescan(self) -> int:
+        """Full scan, diffed against the current index. Returns the number of changes."""
+        found = self._scan(self.root)
+        with self._lock:
+            before = self.version
+            for rel in sorted(set(self._entries) - set(found), key=len):
+                self._remove(rel)
+            # Parents sort before their children, so directories are inserted first
+            for rel in sorted(found):
+                self._put(rel, found[rel])
+            self.last_scan = time.monotonic()
+            return self.version - before
+
+    def apply(self, paths: Iterable[str]) -> int:
+        """Re-stat only the given absolute paths. Returns the number of changes."""
+        with self._lock:
+            before = self.version
+            for path in paths:
+                rel = self._rel(path)
+                if not rel or _is_hidden(rel):
+                    continue
+                full = self.root / rel
+                try:
+                    st = os.lstat(full)
+                except OSError:
+                    self._remove(rel)
+                    continue
+                self._ensure_parents(rel)
+                is_dir = os.path.isdir(full) and not os.path.islink(full)
+                if is_dir and rel not in self._entries:
+                    # A directory moved in (or created with content) — index its subtree too
+                    self._put(rel, _entry(rel, st, True))
+                    for child, entry in sorted(self._scan(full).items()):
+                        self._put(child, entry)
+                else:
+                    self._put(rel, _entry(rel, st, is_dir))
+            return self.version - before
+
+    def tree(self) -> list:
+        """Nested tree in the shape the UI expects (directories first, by name)."""
+        with self._lock:
+            if self._tree_cache is not None and self._tree_cache[0] == self.version:
+                return self._tree_cache[1]
+
+            def _build(parent: str) -> list:
+                nodes = []
+                for rel in self._children.get(parent, ()):
+                    node = dict(self._entries[rel])
+                    if node["type"] == "directory":
+                        node["children"] = _build(rel)
+                    nodes.append(node)
+                nodes.sort(key=_sort_key)
+                return nodes
+
+            tree = _build("")
+            self._tree_cache = (self.version, tree)
+            return tree
+
+    def changes_since(self, version: int) -> Optional[List[dict]]:
+        """
+        Changes after ``version`` in order, or None if the journal no longer
+        reaches back that far (the client must refetch the full tree).
+
+        A ``delete`` of a directory implies the deletion of its subtree.
+        """
+        with self._lock:
+            if version == self.version:
+                return []
+            if version > self.version or not self._journal or self._journal[0][0] > version + 1:
+                return None
+            return [change for v, change in self._journal if v > version]
+
+
+class FileIndexCache:
+    """
+    LRU of live :class:`FileIndex` objects, one per session.
+
+    Each index is kept current by a ``watchfiles`` task; evicting an index
+    stops its watcher.
+    """
+
+    def __init__(self, max_sessions: int = MAX_SESSIONS, watch: bool = WATCH, poll_interval: float = POLL_INTERVAL):
+        self.max_sessions = max_sessions
+        self.watch = watch and watchfiles is not None
+        self.poll_interval = poll_interval
+        self._indexes: "OrderedDict[str, FileIndex]" = OrderedDict()
+        self._watchers: Dict[str, Tuple[asyncio.Task, asyncio.Event]] = {}
+        self._building: Dict[str, asyncio.Future] = {}
+
+    async def get(self, session_id: str, root: Path) -> FileIndex:
+        """Return an up-to-date index for ``root``, building it on first use."""
+        index = self._indexes.get(session_id)
+        if index is not None:
+            self._indexes.move_to_end(session_id)
+            if not index.watching and time.monotonic() - index.last_scan >= self.poll_interval:
+                await asyncio.to_thread(index.rescan)
+            return index
+
+        # Concurrent first requests share one initial scan
+        pending = self._building.get(session_id)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        future = asyncio.get_running_loop().create_future()
+        self._building[session_id] = future
+        try:
+            index = FileIndex(root)
+            # Watches are registered before the initial scan so nothing created in between is missed
+            if self.watch:
+                stop, registered = asyncio.Event(), asyncio.Event()
+                task = asyncio.create_task(self._watch(session_id, index, stop, registered))
+                self._watchers[session_id] = (task, stop)
+                await registered.wait()
+            await asyncio.to_thread(index.rescan)
+            self._indexes[session_id] = index
+            while len(self._indexes) > self.max_sessions:
+                self.discard(next(iter(self._indexes)))
+            future.set_result(index)
+            return index
+        except BaseException as exc:
+            self._stop_watcher(session_id)
+            future.set_exception(exc)
+            future.exception()  # mark retrieved for waiters that never came
+            raise
+        finally:
+            self._building.pop(session_id, None)
+
+    async def _watch(self, session_id: str, index: FileIndex, stop: asyncio.Event, registered: asyncio.Event) -> None:
+        """Apply change batches to ``index``; ``registered`` is set once the watches are in place."""
+        batches = watchfiles.awatch(
+            index.root,
+            watch_filter=lambda _change, path: index.accepts(path),
+            debounce=WATCH_DEBOUNCE_MS,
+            stop_event=stop,
+        )
+        try:
+            # Advancing the generator once creates the notifier, which registers its
+            # watches before it first waits for events; only then is the index watched
+            pending = asyncio.ensure_future(anext(batches))
+            await asyncio.sleep(0)
+            index.watching = not pending.done()
+            registered.set()
+            while True:
+                changes = await pending
+                await asyncio.to_thread(index.apply, {path for _, path in changes})
+                pending = asyncio.ensure_future(anext(batches))
+        except StopAsyncIteration:
+            pass
+        except Exception as exc:
+            # e.g. inotify watch limit reached — degrade to lazy polling
+            logger.warning("File watcher for session %s failed, falling back to polling: %s", session_id, exc)
+        finally:
+            index.watching = False
+            registered.set()
+
+    def _stop_watcher(self, session_id: str) -> Optional[asyncio.Task]:
+        # Signal rather than cancel, so the notify backend shuts down cleanly
+        task, stop = self._watchers.pop(session_id, (None, None))
+        if stop is not None:
+            stop.set()
+        return task
+
+    def discard(self, session_id: str) -> None:
+        """Forget a session's index and stop its watcher."""
+        self._indexes.pop(session_id, None)
+        self._stop_watcher(session_id)
+
+    async def close(self) -> None:
+        """Stop every watcher and wait for the notification threads to exit."""
+        tasks = [self._stop_watcher(session_id) for session_id in list(self._watchers)]
+        self._indexes.clear()
+        await asyncio.gather(*tasks, return_exceptions=True)
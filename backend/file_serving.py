@@ -0,0 +1,174 @@
+"""
+Agentic Data Scientist — Conditional, ranged and compressed file serving.
+
+Session artifacts are served with a strong ``ETag`` derived from the file's
+SHA-256 so the dashboard can revalidate instead of re-downloading
+(``If-None-Match`` / ``If-Modified-Since`` → 304). Byte ranges are handled by
+Starlette's ``FileResponse``; text artifacts are compressed on the fly with
+zstd (if ``zstandard`` is installed) or gzip when the client accepts it and
+did not ask for a range.
+
+Hashes are cached per ``(path, size, mtime)`` and primed from the manifest
+that every completed run reports, so a finished session's files are never
+hashed on the request path. Files above ``ETAG_HASH_MAX_MB`` that are not in
+the cache get a weak validator instead of being read twice.
+"""
+
+import asyncio
+import hashlib
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterable, Optional, Tuple
+
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+HASH_CACHE_SIZE = int(os.getenv("ETAG_HASH_CACHE_SIZE", "4096"))
+HASH_MAX_BYTES = int(os.getenv("ETAG_HASH_MAX_MB", "256")) * 1024 * 1024
+COMPRESS_MIN_BYTES = 1024
+CHUNK_SIZE = 256 * 1024
+
+_TEXT_TYPES = {
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-ndjson",
+    "image/svg+xml",
+}
+
+
+class ContentHashCache:
+    """Thread-safe LRU of file SHA-256 digests keyed by ``(path, size, mtime)``."""
+
+    def __init__(self, max_entries: int = HASH_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, int, float], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _put(self, key: Tuple[str, int, float], sha256: str) -> None:
+        with self._lock:
+            self._entries[key] = sha256
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def prime(self, working_dir: Path, manifest: Iterable[Dict]) -> None:
+        """Seed the cache from a run's artifact manifest (``path``, ``size``, ``mtime``, ``sha256``)."""
+        for entry in manifest:
+            if entry.get("sha256"):
+                path = str((Path(working_dir) / entry["path"]).resolve())
+                self._put((path, entry["size"], entry["mtime"]), entry["sha256"])
+
+    def get(self, path: Path, st: os.stat_result, max_bytes: int = HASH_MAX_BYTES) -> Optional[str]:
+        """Digest of ``path`` (blocking), or None if it is too large to hash on demand."""
+        key = (str(path), st.st_size, st.st_mtime)
+        with self._lock:
+            sha256 = self._entries.get(key)
+            if sha256 is not None:
+                self._entries.move_to_end(key)
+                return sha256
+        if st.st_size > max_bytes:
+            return None
+        digest = hashlib.sha256()
+        with open(path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+                digest.update(chunk)
+        sha256 = digest.hexdigest()
+        self._put(key, sha256)
+        return sha256
+
+
+def make_etag(st: os.stat_result, sha256: Optional[str], encoding: Optional[str] = None) -> str:
+    """Strong ETag from the content hash (one per encoding), or a weak one from size and mtime."""
+    if sha256 is None:
+        return f'W/"{st.st_size:x}-{st.st_mtime_ns:x}"'
+    suffix = f"-{encoding}" if encoding else ""
+    return f'"{sha256}{suffix}"'
+
+
+def _opaque(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(headers, etag: str, mtime: float) -> bool:
+    """Evaluate ``If-None-Match`` (weak comparison) or, absent that, ``If-Modified-Since``."""
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        tags = {_opaque(tag.strip()) for tag in if_none_match.split(",")}
+        return _opaque(etag) in tags
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(mtime) <= since
+    return False
+
+
+def is_compressible(media_type: str) -> bool:
+    base = (media_type or "").split(";")[0].strip().lower()
+    return base.startswith("text/") or base in _TEXT_TYPES or base.endswith("+json")
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick ``zstd`` or ``gzip`` from an ``Accept-Encoding`` header, honouring ``q=0``."""
+    accepted = {}
+    for item in (accept_encoding or "").split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name.lower()] = q
+    for encoding in ("zstd", "gzip"):
+        if encoding == "zstd" and zstandard is None:
+            continue
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def _compressor(encoding: str):
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=3).compressobj()
+    return zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 → gzip container
+
+
+async def compressed_stream(path: Path, encoding: str) -> AsyncIterator[bytes]:
+    """Read ``path`` in chunks and compress on a worker thread."""
+    compressor = _compressor(encoding)
+
+    def _next_block(fh) -> Tuple[bytes, bool]:
+        chunk = fh.read(CHUNK_SIZE)
+        if not chunk:
+            return compressor.flush(), True
+        return compressor.compress(chunk), False
+
+    fh = await asyncio.to_thread(open, path, "rb")
+    try:
+        done = False
+        while not done:
+            block, done = await asyncio.to_thread(_next_block, fh)
+            if block:
+                yield block
+    finally:
+        fh.close()
+
+
+def last_modified(st: os.stat_result) -> str:
+    return formatdate(st.st_mtime, usegmt=True)
@@ -3,29 +3,36 @@ Agentic Data Scientist — FastAPI backend.
 
 Routes:
   POST /api/sessions                     → create & start an agent session
-  GET  /api/sessions                     → list all sessions
-  GET  /api/sessions/{id}/stream         → SSE event stream
+  GET  /api/sessions                     → list sessions (paginated, newest first)
+  GET  /api/sessions/{id}/stream         → SSE event stream (resumable via Last-Event-ID)
   GET  /api/sessions/{id}                → session metadata
   DELETE /api/sessions/{id}             → delete session + files
+  GET  /api/datasets/{sha256}            → look up a cached dataset blob
   GET  /api/sessions/{id}/files          → list output files (tree)
   GET  /api/sessions/{id}/files/{path}   → download / serve a file
+  GET  /api/sessions/{id}/files/{path}/preview → paged tabular preview
 """
 
 import asyncio
+import csv
+import importlib
 import json
 import logging
+import mimetypes
 import os
-import sys
 import shutil
+import stat
+import sys
 import time
 from pathlib import Path
 from typing import List, Optional
 
-from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi import FastAPI, File, Form, Header, HTTPException, Query, Request, Response, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 
+
 # ── Windows asyncio fix ───────────────────────────────────────────────────────
 # Use the default ProactorEventLoop on Windows — it supports subprocesses.
 # WindowsSelectorEventLoopPolicy is intentionally NOT used here.
@@ -39,8 +46,28 @@ _here = Path(__file__).parent
 _project_root = _here.parent
 sys.path.insert(0, str(_project_root / "src"))
 
-from agentic_data_scientist import DataScientist  # noqa: E402
-from backend.session_store import store  # noqa: E402
+from agentic_data_scientist.core.agent_pool import POOL_ENABLED, AgentPool  # noqa: E402
+from agentic_data_scientist.core.llm_clients import registry as llm_clients  # noqa: E402
+from backend.blob_store import ENABLED as DATASET_CACHE_ENABLED, BlobStore  # noqa: E402
+from backend.event_log import replay  # noqa: E402
+from backend.file_index import FileIndexCache  # noqa: E402
+from backend.file_serving import (  # noqa: E402
+    COMPRESS_MIN_BYTES,
+    ContentHashCache,
+    choose_encoding,
+    compressed_stream,
+    is_compressible,
+    is_not_modified,
+    last_modified,
+    make_etag,
+)
+from backend.preview import PreviewCache, UnsupportedFormat  # noqa: E402
+from backend.processes import kill_processes_in  # noqa: E402
+from backend.scheduler import SessionScheduler  # noqa: E402
+from backend.session_store import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, SessionStore  # noqa: E402
+from backend.uploads import UploadBudget, UploadTooLarge, attach_blobs, save_uploads  # noqa: E402
+from backend.worker import EXECUTION_MODE, run_in_worker  # noqa: E402
+
 
 # ── FastAPI app ───────────────────────────────────────────────────────────────
 app = FastAPI(
@@ -55,8 +82,42 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Index-Version", "ETag", "Content-Range", "Accept-Ranges"],
 )
 
+
+@app.on_event("startup")
+async def _open_store():
+    # Opened here rather than at import, so importing this module (tests, tools,
+    # --profile-startup) never touches the sessions of a running backend
+    global store
+    store = await asyncio.to_thread(SessionStore)
+    store.recover_interrupted()
+
+
+@app.on_event("startup")
+async def _warm_agent_pool():
+    # The agent runtime (ADK, LiteLLM) is not imported with this module; load it
+    # here in in-process mode, before requests arrive, so pool builds in worker
+    # threads never race a request handler importing the same modules.
+    if EXECUTION_MODE != "process":
+        await asyncio.to_thread(importlib.import_module, "agentic_data_scientist.core.api")
+    if agent_pool is not None:
+        agent_pool.fill()
+
+
+@app.on_event("shutdown")
+async def _close_store():
+    # Drain pending metadata writes before the process exits
+    if agent_pool is not None:
+        await agent_pool.close()
+    await file_indexes.close()
+    if store is not None:
+        await asyncio.to_thread(store.close)
+    if blob_store is not None:
+        blob_store.close()
+
+
 @app.middleware("http")
 async def add_process_time_header(request, call_next):
     start_time = time.perf_counter()
@@ -66,10 +127,35 @@ async def add_process_time_header(request, call_next):
     response.headers["X-Process-Time"] = str(process_time)
     return response
 
+
+# ── Session metadata (opened by the startup hook) ───────────────────────────
+store: Optional[SessionStore] = None
+
 # ── Working-dir root ──────────────────────────────────────────────────────────
 OUTPUT_ROOT = _project_root / "agentic_output"
 OUTPUT_ROOT.mkdir(exist_ok=True)
 
+# ── Content-addressed dataset cache (shared across sessions) ─────────────────
+blob_store = BlobStore(OUTPUT_ROOT / ".blobs") if DATASET_CACHE_ENABLED else None
+
+# ── Incrementally maintained file trees (LRU across sessions) ───────────────
+file_indexes = FileIndexCache()
+
+# ── Content hashes for file ETags (primed from each run's manifest) ─────────
+content_hashes = ContentHashCache()
+
+# ── Admission control: bounded concurrent agent runs ───────────────────────
+scheduler = SessionScheduler(on_start=lambda session_id: store.update(session_id, status="running"))
+# How long a cancelled run may take to unwind before its processes are killed regardless
+CANCEL_TIMEOUT = float(os.getenv("CANCEL_TIMEOUT_SECONDS", "10"))
+
+# ── Shared pre-built orchestrated agent graph (worker processes build their own) ──
+agent_pool = AgentPool() if POOL_ENABLED and EXECUTION_MODE != "process" else None
+
+# ── Row-offset indexes for tabular previews ─────────────────────────────────
+previews = PreviewCache()
+MAX_PREVIEW_ROWS = 1000
+
 # ── Auto-EDA prompt injected when no query given ──────────────────────────────
 AUTO_EDA_PROMPT = (
     "You are an expert data scientist. Perform a comprehensive exploratory data "
@@ -87,6 +173,12 @@ class CreateSessionRequest(BaseModel):
     mode: str = "orchestrated"  # "orchestrated" | "simple"
 
 
+class UploadSummary(BaseModel):
+    name: str
+    size: int
+    sha256: str
+
+
 class SessionSummary(BaseModel):
     session_id: str
     query: str
@@ -96,12 +188,45 @@ class SessionSummary(BaseModel):
     duration: Optional[float]
     files_created: List[str]
     error: Optional[str]
+    uploads: List[UploadSummary] = []
+    queue_position: Optional[int] = None
+
+
+# ── Background task: run agent and append events to the session log ──────────
+CANCELLED_EVENT = {"type": "cancelled", "message": "Session cancelled"}
+
+
+async def _agent_events(query: str, agent_type: str, working_dir: str, file_list: list):
+    """Event dicts of one run, produced in-process or by an isolated worker process."""
+    if EXECUTION_MODE == "process":
+        job = {
+            "query": query,
+            "agent_type": agent_type,
+            "working_dir": str(working_dir),
+            "files": [[name, str(path)] for name, path in file_list],
+        }
+        async for event in run_in_worker(job):
+            yield event
+        return
+
+    from agentic_data_scientist import DataScientist
+
+    ds = DataScientist(
+        agent_type=agent_type,
+        working_dir=working_dir,
+        auto_cleanup=False,
+        pool=agent_pool,
+    )
+    try:
+        async for event in await ds.run_async(query, files=file_list, stream=True):
+            yield event
+    finally:
+        await ds.close()
 
 
-# ── Background task: run agent and push events into queue ─────────────────────
 async def _run_agent(session_id: str, query: str, mode: str, file_list: list):
-    """Run DataScientist async and push every event dict to the session queue."""
-    record = store.get(session_id)
+    """Run DataScientist async and append every event dict to the session event log."""
+    record = await store.get_async(session_id)
     if not record:
         return
 
@@ -109,29 +234,37 @@ async def _run_agent(session_id: str, query: str, mode: str, file_list: list):
     agent_type = "adk" if mode == "orchestrated" else "claude_code"
 
     try:
-        ds = DataScientist(
-            agent_type=agent_type,
-            working_dir=working_dir,
-            auto_cleanup=False,
-        )
-
-        async for event in await ds.run_async(query, files=file_list, stream=True):
-            await record.event_queue.put(event)
+        status = "completed"
+        async for event in _agent_events(query, agent_type, working_dir, file_list):
+            await record.event_log.append(event)
+            # Session metadata is derived here, once, rather than by each SSE subscriber
+            if isinstance(event, dict):
+                if event.get("type") == "completed":
+                    content_hashes.prime(Path(working_dir), event.get("manifest", []))
+                    store.update(
+                        session_id,
+                        duration=event.get("duration"),
+                        files_created=event.get("files_created", []),
+                    )
+                elif event.get("type") == "error":
+                    status = "error"
+                    store.update(session_id, error=event.get("content") or event.get("message"))
 
-        # Collect final state from the last event (completed / error)
-        store.update(
-            session_id,
-            status="completed",
-        )
+        store.update(session_id, status=status)
 
+    except asyncio.CancelledError:
+        logger.info("Session %s cancelled", session_id)
+        await record.event_log.append(CANCELLED_EVENT)
+        store.update(session_id, status="cancelled")
+        raise
     except Exception as exc:
         logger.exception("Agent error for session %s", session_id)
         error_event = {"type": "error", "message": str(exc)}
-        await record.event_queue.put(error_event)
+        await record.event_log.append(error_event)
         store.update(session_id, status="error", error=str(exc))
     finally:
-        # Sentinel — signals SSE generator to close
-        await record.event_queue.put(None)
+        # Subscribers drain what is left and then receive [DONE]
+        record.event_log.close()
 
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
@@ -145,43 +278,59 @@ def _session_to_summary(record) -> SessionSummary:
         duration=record.duration,
         files_created=record.files_created,
         error=record.error,
+        uploads=[UploadSummary(**{k: u[k] for k in ("name", "size", "sha256")}) for u in record.uploads],
+        queue_position=scheduler.position(record.session_id) if record.status == "queued" else None,
     )
 
 
-def _file_tree(directory: Path, base: Path) -> list:
-    """Efficient recursive file tree as list of dicts using os.scandir."""
-    entries = []
-    try:
-        # os.scandir is faster as it gets file attributes in one syscall 
-        with os.scandir(directory) as it:
-            for entry in it:
-                rel = str(Path(entry.path).relative_to(base))
-                if entry.is_dir():
-                    entries.append({
-                        "name": entry.name,
-                        "path": rel,
-                        "type": "directory",
-                        "children": _file_tree(Path(entry.path), base),
-                    })
-                else:
-                    entries.append({
-                        "name": entry.name,
-                        "path": rel,
-                        "type": "file",
-                        "size": entry.stat().st_size,
-                    })
-        # Sort results for consistent UI presentation
-        entries.sort(key=lambda x: (x["type"] != "directory", x["name"].lower()))
-    except (PermissionError, FileNotFoundError):
-        pass
-    return entries
+async def _cancel_run(record) -> bool:
+    """
+    Stop a queued or running session and kill processes left in its working dir.
+
+    Returns False if the session was not active.
+    """
+    session_id = record.session_id
+    if scheduler.discard(session_id):
+        await record.event_log.append(CANCELLED_EVENT)
+        record.event_log.close()
+    elif scheduler.task(session_id) is not None:
+        if not await scheduler.cancel(session_id, CANCEL_TIMEOUT):
+            logger.warning("Session %s did not unwind within %.0fs", session_id, CANCEL_TIMEOUT)
+    else:
+        return False
+    store.update(session_id, status="cancelled")
+    await asyncio.to_thread(kill_processes_in, Path(record.working_dir))
+    return True
+
+
+def _remove_session_files(session_id: str, working_dir: Path) -> None:
+    """Delete a session's working dir and release its dataset blobs (blocking)."""
+    if working_dir.exists():
+        shutil.rmtree(working_dir, ignore_errors=True)
+    if blob_store is not None:
+        blob_store.release_session(session_id)
 
 
 # ── Routes ────────────────────────────────────────────────────────────────────
 
+
 @app.get("/health")
 async def health():
-    return {"status": "ok"}
+    return {
+        "status": "ok",
+        "sessions": scheduler.stats(),
+        "agent_pool": agent_pool.stats() if agent_pool is not None else None,
+        # In process mode the LLM clients live in the workers and this stays empty
+        "llm_clients": llm_clients.stats(),
+        "llm_cache": llm_clients.cache.stats(),
+        "tool_cache": _tool_cache_stats(),
+    }
+
+
+def _tool_cache_stats():
+    # The file tools (and ADK with them) are imported once an agent runs in this process
+    file_ops = sys.modules.get("agentic_data_scientist.tools.file_ops")
+    return file_ops.tool_cache_stats() if file_ops is not None else None
 
 
 @app.post("/api/sessions", response_model=SessionSummary, status_code=201)
@@ -189,13 +338,29 @@ async def create_session(
     query: Optional[str] = Form(None),
     mode: str = Form("orchestrated"),
     files: Optional[List[UploadFile]] = File(None),
+    datasets: Optional[str] = Form(None),
 ):
     """
     Create a new agent session. Accepts multipart form data so files can be
     uploaded together with the query. If no query is provided but files are
     attached, the auto-EDA prompt is used.
+
+    ``datasets`` may carry a JSON list of ``{"name", "sha256"}`` objects naming
+    datasets that are already cached (see ``GET /api/datasets/{sha256}``);
+    they are linked into the session without being uploaded again.
     """
-    effective_query = (query or "").strip() or (AUTO_EDA_PROMPT if files else "")
+    dataset_refs = []
+    if datasets:
+        if blob_store is None:
+            raise HTTPException(status_code=400, detail="Dataset cache is disabled.")
+        try:
+            dataset_refs = json.loads(datasets)
+            if not isinstance(dataset_refs, list) or not all(isinstance(r, dict) for r in dataset_refs):
+                raise ValueError
+        except ValueError:
+            raise HTTPException(status_code=400, detail="datasets must be a JSON list of {name, sha256} objects.")
+
+    effective_query = (query or "").strip() or (AUTO_EDA_PROMPT if files or dataset_refs else "")
     if not effective_query:
         raise HTTPException(status_code=400, detail="Provide a query or upload files.")
     if mode not in ("orchestrated", "simple"):
@@ -203,83 +368,141 @@ async def create_session(
 
     # Create per-session working dir
     import uuid as _uuid
+
     session_id = str(_uuid.uuid4())
     working_dir = OUTPUT_ROOT / session_id
     working_dir.mkdir(parents=True, exist_ok=True)
 
-    record = store.create(session_id, effective_query, mode, str(working_dir))
-
-    # Save uploaded files into working_dir/user_data/
-    file_list = []
-    if files:
-        user_data_dir = working_dir / "user_data"
-        user_data_dir.mkdir(exist_ok=True)
-        for upload in files:
-            dest = user_data_dir / upload.filename
-            content = await upload.read()
-            dest.write_bytes(content)
-            file_list.append((upload.filename, dest))
+    # Stream uploaded files into working_dir/user_data/ (chunked, off the event loop)
+    uploaded = []
+    user_data_dir = working_dir / "user_data"
+    try:
+        if files:
+            uploaded += await save_uploads(files, user_data_dir, UploadBudget(), blob_store, session_id)
+        if dataset_refs:
+            names = {u.name for u in uploaded}
+            if any(ref.get("name") in names for ref in dataset_refs):
+                raise ValueError("Duplicate upload filenames in one request")
+            uploaded += await attach_blobs(dataset_refs, user_data_dir, blob_store, session_id)
+    except (UploadTooLarge, ValueError, FileNotFoundError) as exc:
+        await asyncio.to_thread(_remove_session_files, session_id, working_dir)
+        status_code = {UploadTooLarge: 413, FileNotFoundError: 404}.get(type(exc), 400)
+        raise HTTPException(status_code=status_code, detail=str(exc))
+    file_list = [(u.name, Path(u.path)) for u in uploaded]
+
+    record = store.create(
+        session_id, effective_query, mode, str(working_dir), uploads=[u.to_dict() for u in uploaded], status="queued"
+    )
 
-    # Start agent in background
-    asyncio.create_task(_run_agent(session_id, effective_query, mode, file_list))
+    # Admit the run now if there is capacity, otherwise it waits in the queue
+    scheduler.submit(session_id, mode, lambda: _run_agent(session_id, effective_query, mode, file_list))
 
     return _session_to_summary(record)
 
 
 @app.get("/api/sessions", response_model=List[SessionSummary])
-async def list_sessions():
-    return [_session_to_summary(r) for r in store.list_all()]
+async def list_sessions(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+):
+    """
+    List sessions newest first. Pass the ``X-Next-Cursor`` response header
+    back as ``cursor`` to fetch the following page.
+    """
+    try:
+        records, next_cursor = await store.list_page_async(limit=limit, offset=offset, cursor=cursor, status=status)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return [_session_to_summary(r) for r in records]
 
 
 @app.get("/api/sessions/{session_id}", response_model=SessionSummary)
 async def get_session(session_id: str):
-    record = store.get(session_id)
+    record = await store.get_async(session_id)
     if not record:
         raise HTTPException(status_code=404, detail="Session not found.")
     return _session_to_summary(record)
 
 
+@app.post("/api/sessions/{session_id}/cancel", response_model=SessionSummary)
+async def cancel_session(session_id: str):
+    """
+    Stop a queued or running session. The agent run is cancelled, processes it
+    started are killed, and the session ends with status ``cancelled``.
+    """
+    record = await store.get_async(session_id)
+    if not record:
+        raise HTTPException(status_code=404, detail="Session not found.")
+    if not await _cancel_run(record):
+        raise HTTPException(status_code=409, detail=f"Session is not active (status: {record.status}).")
+    return _session_to_summary(await store.get_async(session_id))
+
+
 @app.delete("/api/sessions/{session_id}", status_code=204)
 async def delete_session(session_id: str):
-    record = store.get(session_id)
+    record = await store.get_async(session_id)
     if not record:
         raise HTTPException(status_code=404, detail="Session not found.")
-    # Remove files
-    wd = Path(record.working_dir)
-    if wd.exists():
-        shutil.rmtree(wd, ignore_errors=True)
-    store.delete(session_id)
+    await _cancel_run(record)
+    file_indexes.discard(session_id)
+    await asyncio.to_thread(_remove_session_files, session_id, Path(record.working_dir))
+    await store.delete_async(session_id)
+
+
+@app.get("/api/datasets/{sha256}")
+async def get_dataset(sha256: str):
+    """Report whether a dataset is cached, so clients can skip re-uploading it."""
+    if blob_store is None:
+        raise HTTPException(status_code=404, detail="Dataset cache is disabled.")
+    try:
+        info = await asyncio.to_thread(blob_store.stat, sha256.lower())
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if info is None:
+        raise HTTPException(status_code=404, detail="Dataset not found.")
+    return info
 
 
 @app.get("/api/sessions/{session_id}/stream")
-async def stream_events(session_id: str):
+async def stream_events(
+    session_id: str,
+    last_event_id: Optional[int] = Query(None, ge=0),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
     """
-    SSE endpoint. Each event is JSON-encoded and prefixed with 'data: '.
-    Ends with a [DONE] sentinel.
+    SSE endpoint. Each event is JSON-encoded, prefixed with 'data: ' and tagged
+    with an 'id:' line. Ends with a [DONE] sentinel.
+
+    Any number of clients may subscribe to the same session. A reconnecting
+    client resumes after the ID in its ``Last-Event-ID`` header (or the
+    ``last_event_id`` query parameter) instead of losing events.
     """
-    record = store.get(session_id)
+    record = await store.get_async(session_id)
     if not record:
         raise HTTPException(status_code=404, detail="Session not found.")
 
+    resume_from = last_event_id or 0
+    if last_event_id_header:
+        try:
+            resume_from = max(resume_from, int(last_event_id_header))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Last-Event-ID must be an integer.")
+
+    if record.event_log is not None:
+        source = record.event_log.subscribe(resume_from)
+    else:
+        # Session from a previous process — replay its log from disk
+        source = replay(store.event_log_path(session_id), resume_from)
+
     async def event_generator():
-        queue = record.event_queue
-        while True:
-            event = await queue.get()
-            if event is None:
-                yield "data: [DONE]\n\n"
-                break
-            # Update session metadata from completed event
-            if isinstance(event, dict):
-                if event.get("type") == "completed":
-                    store.update(
-                        session_id,
-                        status="completed",
-                        duration=event.get("duration"),
-                        files_created=event.get("files_created", []),
-                    )
-                elif event.get("type") == "error":
-                    store.update(session_id, status="error", error=event.get("message"))
-                yield f"data: {json.dumps(event)}\n\n"
+        async for event_id, payload in source:
+            yield f"id: {event_id}\ndata: {payload}\n\n"
+        yield "data: [DONE]\n\n"
 
     return StreamingResponse(
         event_generator(),
@@ -291,44 +514,39 @@ async def stream_events(session_id: str):
     )
 
 
-# ── Caching for file trees ───────────────────────────────────────────────────
-_file_tree_cache = {}
-_CACHE_TTL = 2.0  # seconds
-
 @app.get("/api/sessions/{session_id}/files")
-async def list_files(session_id: str):
-    """Return a recursive file tree for the session's working directory (optimized)."""
-    record = store.get(session_id)
+async def list_files(session_id: str, response: Response, since: Optional[int] = Query(None, ge=0)):
+    """
+    Return the recursive file tree of the session's working directory.
+
+    The tree comes from an incrementally maintained index; its version is
+    sent in ``X-Index-Version``. Passing ``?since=<version>`` returns only
+    the changes after that version (``{"version", "changes"}``), or the
+    full tree with ``"reset": true`` if those changes are no longer known.
+    """
+    record = await store.get_async(session_id)
     if not record:
         raise HTTPException(status_code=404, detail="Session not found.")
-    
+
     wd = Path(record.working_dir)
     if not wd.exists():
-        return []
-
-    # Simple cache check based on mtime of the base directory
-    mtime = wd.stat().st_mtime
-    cache_key = f"{session_id}_{mtime}"
-    
-    if cache_key in _file_tree_cache:
-        return _file_tree_cache[cache_key]
-
-    # Run blocking file I/O in a thread to keep the event loop free
-    tree = await asyncio.to_thread(_file_tree, wd, wd)
-    
-    # Cache the result
-    _file_tree_cache[cache_key] = tree
-    # Basic cache cleanup: keep only latest 50 results
-    if len(_file_tree_cache) > 50:
-        _file_tree_cache.pop(next(iter(_file_tree_cache)))
-        
-    return tree
+        return [] if since is None else {"version": 0, "changes": []}
 
+    index = await file_indexes.get(session_id, wd)
+    version = index.version
+    response.headers["X-Index-Version"] = str(version)
+    if since is None:
+        return await asyncio.to_thread(index.tree)
 
-@app.get("/api/sessions/{session_id}/files/{file_path:path}")
-async def serve_file(session_id: str, file_path: str):
-    """Download or serve a file from the session working directory."""
-    record = store.get(session_id)
+    changes = index.changes_since(since)
+    if changes is None:
+        return {"version": version, "reset": True, "tree": await asyncio.to_thread(index.tree)}
+    return {"version": version, "changes": changes}
+
+
+async def _resolve_session_file(session_id: str, file_path: str):
+    """Resolve a path inside a session's working dir; returns ``(path, stat)`` or raises 403/404."""
+    record = await store.get_async(session_id)
     if not record:
         raise HTTPException(status_code=404, detail="Session not found.")
     wd = Path(record.working_dir)
@@ -336,6 +554,60 @@ async def serve_file(session_id: str, file_path: str):
     # Path traversal guard
     if not str(target).startswith(str(wd.resolve())):
         raise HTTPException(status_code=403, detail="Access denied.")
-    if not target.exists() or not target.is_file():
+    try:
+        st = await asyncio.to_thread(target.stat)
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
         raise HTTPException(status_code=404, detail="File not found.")
-    return FileResponse(str(target))
+    return target, st
+
+
+# Registered before serve_file, whose {file_path:path} would otherwise swallow "/preview"
+@app.get("/api/sessions/{session_id}/files/{file_path:path}/preview")
+async def preview_file(
+    session_id: str,
+    file_path: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PREVIEW_ROWS),
+):
+    """Return the schema, row count and one page of rows of a CSV/TSV/JSONL/Parquet file."""
+    target, _ = await _resolve_session_file(session_id, file_path)
+    try:
+        return await asyncio.to_thread(previews.preview, target, offset, limit)
+    except UnsupportedFormat as exc:
+        raise HTTPException(status_code=415, detail=str(exc))
+    except (ValueError, UnicodeDecodeError, csv.Error) as exc:
+        raise HTTPException(status_code=422, detail=f"Could not parse '{target.name}': {exc}")
+
+
+@app.get("/api/sessions/{session_id}/files/{file_path:path}")
+async def serve_file(session_id: str, file_path: str, request: Request):
+    """
+    Download or serve a file from the session working directory.
+
+    Supports conditional requests (strong content-hash ETag, 304), byte
+    ranges, and gzip/zstd compression of text artifacts.
+    """
+    target, st = await _resolve_session_file(session_id, file_path)
+
+    media_type = mimetypes.guess_type(target.name)[0] or "text/plain"
+    encoding = None
+    if "range" not in request.headers and st.st_size >= COMPRESS_MIN_BYTES and is_compressible(media_type):
+        encoding = choose_encoding(request.headers.get("accept-encoding"))
+
+    sha256 = await asyncio.to_thread(content_hashes.get, target, st)
+    headers = {
+        "ETag": make_etag(st, sha256, encoding),
+        "Last-Modified": last_modified(st),
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if is_not_modified(request.headers, headers["ETag"], st.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+        return StreamingResponse(compressed_stream(target, encoding), media_type=media_type, headers=headers)
+    # FileResponse handles Range / If-Range and sends 206 for partial reads
+    return FileResponse(str(target), media_type=media_type, headers=headers, stat_result=st)
@@ -0,0 +1,297 @@
+"""
+Agentic Data Scientist — Paged previews of tabular result files.
+
+CSV/TSV and JSONL files are indexed lazily: while a file is scanned (in
+chunks, through ``mmap``), the byte offset of every ``CHECKPOINT_ROWS``-th
+row is recorded, so a later request for page N seeks straight to the
+nearest checkpoint and parses at most ``CHECKPOINT_ROWS`` rows before the
+page. The scan only goes as far as the deepest page requested so far; the
+total row count is estimated from the bytes-per-row seen until the scan
+completes. Parquet files use their row-group metadata instead (needs
+``pyarrow``).
+
+Indexes are cached per ``(path, size, mtime)``, so a file that is still
+being written is re-indexed once it changes.
+"""
+
+import csv
+import io
+import json
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+
+CHECKPOINT_ROWS = 1000
+SCAN_CHUNK_SIZE = 4 * 1024 * 1024
+SKIP_BLOCK_SIZE = 8 * 1024
+SAMPLE_BYTES = 64 * 1024
+INDEX_CACHE_SIZE = int(os.getenv("PREVIEW_INDEX_CACHE_SIZE", "64"))
+
+FORMATS = {
+    ".csv": "csv",
+    ".tsv": "tsv",
+    ".tab": "tsv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+}
+
+
+class UnsupportedFormat(Exception):
+    """Raised when a file cannot be previewed as a table."""
+
+
+def detect_format(path: Path) -> str:
+    fmt = FORMATS.get(path.suffix.lower())
+    if fmt is None:
+        raise UnsupportedFormat(f"No tabular preview for '{path.suffix or path.name}' files")
+    if fmt == "parquet" and pq is None:
+        raise UnsupportedFormat("Parquet preview requires pyarrow")
+    return fmt
+
+
+def _infer_type(values: List[Any]) -> str:
+    kinds = set()
+    for value in values:
+        if value is None or value == "":
+            continue
+        if isinstance(value, bool):
+            kinds.add("boolean")
+        elif isinstance(value, int):
+            kinds.add("integer")
+        elif isinstance(value, float):
+            kinds.add("number")
+        elif isinstance(value, str):
+            try:
+                int(value)
+                kinds.add("integer")
+                continue
+            except ValueError:
+                pass
+            try:
+                float(value)
+                kinds.add("number")
+            except ValueError:
+                kinds.add("boolean" if value.lower() in ("true", "false") else "string")
+        else:
+            kinds.add("object")
+    if kinds <= {"integer"}:
+        return "integer" if kinds else "string"
+    if kinds <= {"integer", "number"}:
+        return "number"
+    return kinds.pop() if len(kinds) == 1 else "string"
+
+
+class RowIndex:
+    """
+    Sparse row-offset index of a line-oriented text table.
+
+    ``offsets[i]`` is the byte offset of physical row ``i * CHECKPOINT_ROWS``.
+    For CSV/TSV a newline inside a quoted field does not end a row.
+    """
+
+    def __init__(self, path: Path, fmt: str, checkpoint_rows: int = CHECKPOINT_ROWS):
+        self.path = path
+        self.fmt = fmt
+        self.checkpoint_rows = checkpoint_rows
+        self.size = path.stat().st_size
+        self.offsets: List[int] = [0]
+        self.complete = self.size == 0
+        self._quote = None if fmt == "jsonl" else ord('"')
+        # Scan state: rows ended so far, where scanning resumes, open quote in the current row
+        self._rows = 0
+        self._scan_pos = 0
+        self._in_quotes = False
+        self._lock = threading.Lock()
+
+    @property
+    def has_header(self) -> bool:
+        return self.fmt in ("csv", "tsv")
+
+    def _scan_chunk(self, chunk: bytes, base: int, target_row: int) -> int:
+        """Count rows in ``chunk`` up to ``target_row``; returns how many bytes were consumed."""
+        i = 0
+        quoted = self._quote is not None and self._quote in chunk
+        while self._rows < target_row:
+            stop_row = min(len(self.offsets) * self.checkpoint_rows, target_row)
+            if not quoted and not self._in_quotes:
+                # Fast path: skip whole blocks whose rows all end before the next checkpoint
+                while i < len(chunk):
+                    n = chunk.count(b"\n", i, i + SKIP_BLOCK_SIZE)
+                    if self._rows + n >= stop_row:
+                        break
+                    self._rows += n
+                    i += SKIP_BLOCK_SIZE
+                if i >= len(chunk):
+                    return len(chunk)
+            # Walk row by row up to the checkpoint
+            while self._rows < stop_row:
+                nl = chunk.find(b"\n", i)
+                if nl < 0:
+                    if quoted and chunk.count(b'"', i) % 2:
+                        self._in_quotes = not self._in_quotes
+                    return len(chunk)
+                if quoted and chunk.count(b'"', i, nl) % 2:
+                    self._in_quotes = not self._in_quotes
+                i = nl + 1
+                if not self._in_quotes:
+                    self._rows += 1
+            if self._rows // self.checkpoint_rows == len(self.offsets) and self._rows % self.checkpoint_rows == 0:
+                self.offsets.append(base + i)
+        return i
+
+    def ensure(self, row: int) -> None:
+        """Extend the scan until physical row ``row`` has a checkpoint at or before it (blocking)."""
+        with self._lock:
+            target = (row // self.checkpoint_rows) * self.checkpoint_rows
+            if self.complete or self._rows >= target:
+                return
+            with open(self.path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                while self._rows < target and self._scan_pos < self.size:
+                    end = min(self._scan_pos + SCAN_CHUNK_SIZE, self.size)
+                    self._scan_pos += self._scan_chunk(mm[self._scan_pos : end], self._scan_pos, target)
+            if self._scan_pos >= self.size:
+                # A last row without a trailing newline still counts
+                if not self._ends_with_newline():
+                    self._rows += 1
+                self.complete = True
+
+    def mark_end(self, data_rows: int) -> None:
+        """Record the exact row count once a page has run into the end of the file."""
+        with self._lock:
+            self._rows = data_rows + (1 if self.has_header else 0)
+            self.complete = True
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as fh:
+            fh.seek(-1, os.SEEK_END)
+            return fh.read(1) == b"\n"
+
+    def row_count(self) -> Tuple[int, bool]:
+        """``(data rows, exact)``; estimated from the bytes per row seen so far until fully scanned."""
+        header = 1 if self.has_header else 0
+        if not self.complete and self.size <= SCAN_CHUNK_SIZE:
+            # Small enough to count exactly in one chunk
+            self.ensure(self.size + 1)
+        if self.complete:
+            return max(self._rows - header, 0), True
+        if self._rows and self._scan_pos:
+            estimate = round(self.size * self._rows / self._scan_pos)
+        else:
+            with open(self.path, "rb") as fh:
+                sample = fh.read(SAMPLE_BYTES)
+            lines = max(sample.count(b"\n"), 1)
+            estimate = round(self.size * lines / max(len(sample), 1))
+        return max(estimate - header, 0), False
+
+    def open_at(self, row: int) -> Tuple[io.TextIOWrapper, int]:
+        """Open the file at the checkpoint nearest below ``row``; returns the reader and rows to skip."""
+        self.ensure(row)
+        checkpoint = min(row // self.checkpoint_rows, len(self.offsets) - 1)
+        fh = open(self.path, "rb")
+        fh.seek(self.offsets[checkpoint])
+        text = io.TextIOWrapper(fh, encoding="utf-8", errors="replace", newline="")
+        return text, row - checkpoint * self.checkpoint_rows
+
+
+class PreviewCache:
+    """LRU of :class:`RowIndex` objects keyed by ``(path, size, mtime)``."""
+
+    def __init__(self, max_entries: int = INDEX_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._indexes: "OrderedDict[Tuple[str, int, float], RowIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def index_for(self, path: Path, fmt: str) -> RowIndex:
+        st = path.stat()
+        key = (str(path), st.st_size, st.st_mtime)
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None:
+                index = RowIndex(path, fmt)
+                self._indexes[key] = index
+                while len(self._indexes) > self.max_entries:
+                    self._indexes.popitem(last=False)
+            self._indexes.move_to_end(key)
+            return index
+
+    def preview(self, path: Path, offset: int = 0, limit: int = 100) -> Dict[str, Any]:
+        """Return schema, row-count estimate and rows ``[offset, offset + limit)`` of a table (blocking)."""
+        fmt = detect_format(path)
+        if fmt == "parquet":
+            columns, rows, total = _parquet_page(path, offset, limit)
+            exact = True
+        else:
+            index = self.index_for(path, fmt)
+            columns, rows = _text_page(index, offset, limit)
+            total, exact = index.row_count()
+            if len(rows) < limit and not exact:
+                # The page ran into the end of the file, so the count is now known
+                index.mark_end(offset + len(rows))
+                total, exact = index.row_count()
+        return {
+            "path": path.name,
+            "format": fmt,
+            "columns": columns,
+            "offset": offset,
+            "limit": limit,
+            "rows": rows,
+            "row_count": total,
+            "row_count_exact": exact,
+            "has_more": offset + len(rows) < total or (not exact and len(rows) == limit),
+        }
+
+
+def _text_page(index: RowIndex, offset: int, limit: int) -> Tuple[List[Dict[str, str]], List[List[Any]]]:
+    if index.fmt == "jsonl":
+        text, skip = index.open_at(offset)
+        with text:
+            records = [json.loads(line) for line in islice(text, skip, skip + limit) if line.strip()]
+        names: List[str] = []
+        for record in records:
+            for key in record if isinstance(record, dict) else ():
+                if key not in names:
+                    names.append(key)
+        rows = [[r.get(n) if isinstance(r, dict) else None for n in names] for r in records]
+    else:
+        delimiter = "\t" if index.fmt == "tsv" else ","
+        with index.open_at(0)[0] as head:
+            names = next(csv.reader(head, delimiter=delimiter), [])
+        text, skip = index.open_at(offset + 1)  # physical row 0 is the header
+        with text:
+            rows = list(islice(csv.reader(text, delimiter=delimiter), skip, skip + limit))
+    columns = [
+        {"name": name, "type": _infer_type([row[i] for row in rows if i < len(row)])} for i, name in enumerate(names)
+    ]
+    return columns, rows
+
+
+def _parquet_page(path: Path, offset: int, limit: int) -> Tuple[List[Dict[str, str]], List[List[Any]], int]:
+    parquet = pq.ParquetFile(path)
+    meta = parquet.metadata
+    columns = [{"name": field.name, "type": str(field.type)} for field in parquet.schema_arrow]
+    # Only the row groups overlapping the page are read
+    groups, start, first_row = [], 0, None
+    for i in range(meta.num_row_groups):
+        n = meta.row_group(i).num_rows
+        if start + n > offset and start < offset + limit:
+            groups.append(i)
+            first_row = start if first_row is None else first_row
+        start += n
+    if not groups:
+        return columns, [], meta.num_rows
+    table = parquet.read_row_groups(groups).slice(offset - first_row, limit)
+    rows = [list(record.values()) for record in table.to_pylist()]
+    return columns, json.loads(json.dumps(rows, default=str)), meta.num_rows
@@ -0,0 +1,86 @@
+"""
+Agentic Data Scientist — Cleanup of a session's child processes.
+
+Cancelling an in-process run unwinds the agent's async generators, which
+closes the Claude Agent SDK transport, but anything the coding agent started
+(scripts, notebooks, servers) can outlive it. The sessions' processes are
+identified by their working directory: every descendant of the API process
+whose cwd lies inside the session's working dir is killed together with its
+own subtree. Linux only (reads ``/proc``); elsewhere this is a no-op and
+``EXECUTION_MODE=process`` (which kills the worker's process group) should be
+used instead.
+"""
+
+import logging
+import os
+import signal
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+PROC = Path("/proc")
+
+
+def _children_map() -> Dict[int, List[int]]:
+    children: Dict[int, List[int]] = {}
+    for entry in os.scandir(PROC):
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (PROC / entry.name / "stat").read_text()
+        except OSError:
+            continue
+        # The command name may contain spaces and parentheses; fields resume after the last ')'
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry.name))
+    return children
+
+
+def _subtree(pid: int, children: Dict[int, List[int]]) -> List[int]:
+    found, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        found.append(current)
+        stack.extend(children.get(current, ()))
+    return found
+
+
+def _inside(pid: int, directory: Path) -> bool:
+    try:
+        cwd = Path(os.readlink(PROC / str(pid) / "cwd"))
+    except OSError:
+        return False
+    return cwd == directory or directory in cwd.parents
+
+
+def kill_processes_in(directory: Path, root_pid: Optional[int] = None) -> List[int]:
+    """
+    SIGKILL every descendant of ``root_pid`` (default: this process) running in ``directory``.
+
+    Returns the PIDs signalled.
+    """
+    if not PROC.is_dir():
+        return []
+    directory = Path(directory).resolve()
+    root_pid = os.getpid() if root_pid is None else root_pid
+    children = _children_map()
+
+    targets: List[int] = []
+    stack = list(children.get(root_pid, ()))
+    while stack:
+        pid = stack.pop()
+        if _inside(pid, directory):
+            targets.extend(_subtree(pid, children))
+        else:
+            stack.extend(children.get(pid, ()))
+
+    for pid in targets:
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            continue
+    if targets:
+        logger.info("Killed %d process(es) left in %s", len(targets), directory)
+    return targets
@@ -0,0 +1,132 @@
+"""
+Agentic Data Scientist — Admission control for agent runs.
+
+At most ``MAX_CONCURRENT_SESSIONS`` agent runs execute at once; the rest
+wait in an admission queue with status ``queued``. The queue is ordered by
+priority class (``simple`` runs are short and go first) and FIFO within a
+class, so a burst of uploads is worked off at a steady rate instead of
+starting dozens of multi-agent workflows that all hit the LLM rate limits
+together.
+"""
+
+import asyncio
+import heapq
+import logging
+import os
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Awaitable, Callable, Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+MAX_CONCURRENT = int(os.getenv("MAX_CONCURRENT_SESSIONS", "4"))
+
+# Lower value is admitted first
+MODE_PRIORITY = {"simple": 0, "orchestrated": 1}
+
+
+@dataclass(order=True)
+class _Job:
+    priority: int
+    seq: int
+    session_id: str = field(compare=False)
+    factory: Callable[[], Awaitable[None]] = field(compare=False)
+
+
+class SessionScheduler:
+    """
+    Bounded runner for session coroutines.
+
+    ``on_start`` is called with the session ID when a queued run is admitted.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = MAX_CONCURRENT,
+        on_start: Optional[Callable[[str], None]] = None,
+    ):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.max_concurrent = max_concurrent
+        self.on_start = on_start
+        self._queue: List[_Job] = []
+        self._queued: Dict[str, _Job] = {}
+        self._seq = count()
+        self._running: Dict[str, asyncio.Task] = {}
+
+    @property
+    def running(self) -> int:
+        return len(self._running)
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    def stats(self) -> Dict[str, int]:
+        return {"running": self.running, "queued": self.queued, "max_concurrent": self.max_concurrent}
+
+    def submit(self, session_id: str, mode: str, factory: Callable[[], Awaitable[None]]) -> Optional[int]:
+        """
+        Queue a run; ``factory`` is called to create its coroutine once admitted.
+
+        Returns the 1-based queue position, or None if the run started immediately.
+        """
+        priority = MODE_PRIORITY.get(mode, len(MODE_PRIORITY))
+        job = _Job(priority, next(self._seq), session_id, factory)
+        heapq.heappush(self._queue, job)
+        self._queued[session_id] = job
+        self._dispatch()
+        return self.position(session_id)
+
+    def position(self, session_id: str) -> Optional[int]:
+        """1-based position in the admission queue, or None if not queued."""
+        job = self._queued.get(session_id)
+        if job is None:
+            return None
+        # Rank by counting the jobs ahead; the heap itself stays unsorted
+        return 1 + sum(1 for other in self._queue if other < job)
+
+    def task(self, session_id: str) -> Optional[asyncio.Task]:
+        """The task of a running session, if any."""
+        return self._running.get(session_id)
+
+    def discard(self, session_id: str) -> bool:
+        """Drop a queued run before it starts. Returns False if it was not queued."""
+        job = self._queued.pop(session_id, None)
+        if job is None:
+            return False
+        self._queue.remove(job)
+        heapq.heapify(self._queue)
+        return True
+
+    async def cancel(self, session_id: str, timeout: float) -> bool:
+        """
+        Cancel a running session and wait up to ``timeout`` seconds for it to unwind.
+
+        Returns True if the run has finished, False if it is still unwinding
+        (or was not running).
+        """
+        task = self._running.get(session_id)
+        if task is None:
+            return False
+        task.cancel()
+        done, _ = await asyncio.wait({task}, timeout=timeout)
+        return bool(done)
+
+    def _dispatch(self) -> None:
+        while self._queue and len(self._running) < self.max_concurrent:
+            job = heapq.heappop(self._queue)
+            del self._queued[job.session_id]
+            if self.on_start is not None:
+                self.on_start(job.session_id)
+            self._running[job.session_id] = asyncio.create_task(self._run(job))
+
+    async def _run(self, job: _Job) -> None:
+        try:
+            await job.factory()
+        except Exception:
+            logger.exception("Session %s failed outside the agent run", job.session_id)
+        finally:
+            self._running.pop(job.session_id, None)
+            self._dispatch()
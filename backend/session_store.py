@@ -1,14 +1,51 @@
 """
-Agentic Data Scientist — In-memory session store.
+Agentic Data Scientist — Session store.
+
+Session metadata is persisted through a pluggable backend (SQLite in WAL mode
+by default, or a plain in-memory dict). Live runtime state such as the event
+log stays on the in-process ``SessionRecord``; only metadata is written.
+
+All backend I/O runs on a single writer thread, so ``store.update()`` returns
+immediately and writes are applied in submission order. Reads that miss the
+in-process records wait for the writer thread; request handlers use the
+``*_async`` variants so that wait never blocks the event loop.
+
+Nothing is opened at import: the backend creates its ``SessionStore`` (and
+runs :meth:`SessionStore.recover_interrupted`) when the app starts.
 """
 
+import asyncio
+import base64
+import json
+import logging
 import os
-import uuid
-from dataclasses import dataclass, field
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
-from asyncio import Queue
+from typing import Dict, List, Optional, Tuple
+
+from backend.event_log import EventLog
+
+
+logger = logging.getLogger(__name__)
+
+# ── Configuration ─────────────────────────────────────────────────────────────
+STORE_BACKEND = os.getenv("SESSION_STORE_BACKEND", "sqlite")  # "sqlite" | "memory"
+STORE_PATH = Path(os.getenv("SESSION_STORE_PATH", str(Path(__file__).parent.parent / "agentic_output" / "sessions.db")))
+EVENT_LOG_DIR = Path(os.getenv("EVENT_LOG_DIR", str(STORE_PATH.parent / "event_logs")))
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# Finished sessions kept in memory (with their event log ring); evicted ones are
+# reloaded from the backend on demand and replay their events from disk
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "256"))
+SESSION_IDLE_SECONDS = float(os.getenv("SESSION_IDLE_SECONDS", "600"))
+TERMINAL_STATUSES = frozenset({"completed", "error", "cancelled"})
 
 
 @dataclass
@@ -16,55 +53,394 @@ class SessionRecord:
     session_id: str
     query: str
     mode: str  # "orchestrated" | "simple"
-    status: str  # "running" | "completed" | "error"
+    status: str  # "queued" | "running" | "completed" | "error" | "cancelled"
     created_at: str
     working_dir: str
     error: Optional[str] = None
     duration: Optional[float] = None
     files_created: List[str] = field(default_factory=list)
-    # Queue that the SSE endpoint reads from
-    event_queue: Optional[Queue] = field(default=None, repr=False)
+    # Uploaded inputs: [{"name", "path", "size", "sha256"}, ...]
+    uploads: List[Dict] = field(default_factory=list)
+    # Live event log that SSE subscribers follow (None once the run is gone)
+    event_log: Optional[EventLog] = field(default=None, repr=False)
 
 
-class SessionStore:
+# Fields that are persisted; everything else is runtime-only
+PERSISTED_FIELDS = tuple(f.name for f in fields(SessionRecord) if f.name != "event_log")
+# Persisted list fields, stored as JSON text
+JSON_FIELDS = ("files_created", "uploads")
+
+
+def encode_cursor(record: SessionRecord) -> str:
+    """Opaque keyset cursor pointing just past ``record`` in listing order."""
+    raw = json.dumps([record.created_at, record.session_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Inverse of :func:`encode_cursor`. Raises ValueError on malformed input."""
+    try:
+        created_at, session_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from None
+    return str(created_at), str(session_id)
+
+
+# ── Backends ──────────────────────────────────────────────────────────────────
+class SessionBackend(ABC):
+    """Persistence interface. Implementations are only called from the writer thread."""
+
+    @abstractmethod
+    def save(self, data: Dict) -> None:
+        """Insert or replace the metadata row for ``data['session_id']``."""
+
+    @abstractmethod
+    def load(self, session_id: str) -> Optional[Dict]:
+        """Return the metadata dict for a session, or None."""
+
+    @abstractmethod
+    def delete(self, session_id: str) -> bool:
+        """Remove a session; return True if it existed."""
+
+    @abstractmethod
+    def list_page(
+        self,
+        limit: Optional[int],
+        offset: int = 0,
+        after: Optional[Tuple[str, str]] = None,
+        status: Optional[str] = None,
+    ) -> List[Dict]:
+        """Return rows ordered by (created_at, session_id) descending."""
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryBackend(SessionBackend):
+    """Non-durable backend, useful for tests and throwaway deployments."""
+
     def __init__(self):
-        self._sessions: Dict[str, SessionRecord] = {}
+        self._rows: Dict[str, Dict] = {}
+
+    def save(self, data: Dict) -> None:
+        self._rows[data["session_id"]] = dict(data)
+
+    def load(self, session_id: str) -> Optional[Dict]:
+        row = self._rows.get(session_id)
+        return dict(row) if row else None
+
+    def delete(self, session_id: str) -> bool:
+        return self._rows.pop(session_id, None) is not None
+
+    def list_page(self, limit, offset=0, after=None, status=None) -> List[Dict]:
+        rows = sorted(self._rows.values(), key=lambda r: (r["created_at"], r["session_id"]), reverse=True)
+        if status:
+            rows = [r for r in rows if r["status"] == status]
+        if after:
+            rows = [r for r in rows if (r["created_at"], r["session_id"]) < after]
+        rows = rows[offset:]
+        if limit is not None:
+            rows = rows[:limit]
+        return [dict(r) for r in rows]
+
+
+class SQLiteBackend(SessionBackend):
+    """SQLite (WAL) backend with indexes on ``created_at`` and ``status``."""
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            session_id    TEXT PRIMARY KEY,
+            query         TEXT NOT NULL,
+            mode          TEXT NOT NULL,
+            status        TEXT NOT NULL,
+            created_at    TEXT NOT NULL,
+            working_dir   TEXT NOT NULL,
+            error         TEXT,
+            duration      REAL,
+            files_created TEXT NOT NULL DEFAULT '[]',
+            uploads       TEXT NOT NULL DEFAULT '[]'
+        );
+        CREATE INDEX IF NOT EXISTS idx_sessions_created ON sessions (created_at DESC, session_id DESC);
+        CREATE INDEX IF NOT EXISTS idx_sessions_status ON sessions (status, created_at DESC, session_id DESC);
+    """
+
+    def __init__(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # The connection is only ever used from the store's writer thread
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self._SCHEMA)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        """Add list columns introduced after a database was first created."""
+        existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(sessions)")}
+        for name in JSON_FIELDS:
+            if name not in existing:
+                self._conn.execute(f"ALTER TABLE sessions ADD COLUMN {name} TEXT NOT NULL DEFAULT '[]'")
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict:
+        data = dict(row)
+        for name in JSON_FIELDS:
+            data[name] = json.loads(data.get(name) or "[]")
+        return data
+
+    def save(self, data: Dict) -> None:
+        params = dict(data)
+        for name in JSON_FIELDS:
+            params[name] = json.dumps(params.get(name) or [])
+        columns = ", ".join(PERSISTED_FIELDS)
+        placeholders = ", ".join(f":{name}" for name in PERSISTED_FIELDS)
+        self._conn.execute(f"INSERT OR REPLACE INTO sessions ({columns}) VALUES ({placeholders})", params)
+
+    def load(self, session_id: str) -> Optional[Dict]:
+        row = self._conn.execute("SELECT * FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        return self._row_to_dict(row) if row else None
 
-    def create(self, session_id: str, query: str, mode: str, working_dir: str) -> SessionRecord:
+    def delete(self, session_id: str) -> bool:
+        cur = self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        return cur.rowcount > 0
+
+    def list_page(self, limit, offset=0, after=None, status=None) -> List[Dict]:
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if after:
+            clauses.append("(created_at, session_id) < (?, ?)")
+            params.extend(after)
+        sql = "SELECT * FROM sessions"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at DESC, session_id DESC LIMIT ? OFFSET ?"
+        params.extend([-1 if limit is None else limit, offset])
+        return [self._row_to_dict(row) for row in self._conn.execute(sql, params)]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def create_backend(kind: str = STORE_BACKEND, path: Path = STORE_PATH) -> SessionBackend:
+    if kind == "memory":
+        return MemoryBackend()
+    if kind == "sqlite":
+        return SQLiteBackend(path)
+    raise ValueError(f"Unknown session store backend: {kind!r}")
+
+
+# ── Store ─────────────────────────────────────────────────────────────────────
+class SessionStore:
+    def __init__(
+        self,
+        backend: Optional[SessionBackend] = None,
+        event_log_dir: Path = EVENT_LOG_DIR,
+        max_cached: int = SESSION_CACHE_SIZE,
+        idle_seconds: float = SESSION_IDLE_SECONDS,
+    ):
+        self._backend = backend if backend is not None else create_backend()
+        self._event_log_dir = Path(event_log_dir)
+        self.max_cached = max_cached
+        self.idle_seconds = idle_seconds
+        # Records touched by this process, least recently used first (live
+        # sessions keep their event log here)
+        self._sessions: "OrderedDict[str, SessionRecord]" = OrderedDict()
+        self._last_used: Dict[str, float] = {}
+        # Single worker == ordered writes and exclusive use of the backend connection
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-store")
+        self._lock = threading.Lock()
+
+    # -- writer thread plumbing ---------------------------------------------
+    def _submit(self, fn, *args, **kwargs) -> Future:
+        future = self._writer.submit(fn, *args, **kwargs)
+        future.add_done_callback(self._log_failure)
+        return future
+
+    @staticmethod
+    def _log_failure(future: Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logger.error("Session store write failed", exc_info=future.exception())
+
+    def _persist(self, record: SessionRecord) -> Future:
+        snapshot = {name: getattr(record, name) for name in PERSISTED_FIELDS}
+        for name in JSON_FIELDS:
+            snapshot[name] = list(snapshot[name] or [])
+        return self._submit(self._backend.save, snapshot)
+
+    def flush(self) -> None:
+        """Block until every queued write has been applied."""
+        self._writer.submit(lambda: None).result()
+
+    def recover_interrupted(self) -> None:
+        """
+        Mark sessions left 'queued' or 'running' by a previous process as errored;
+        they can never finish. Only the process serving the sessions may call this.
+        """
+
+        def _recover():
+            for status in ("queued", "running"):
+                for row in self._backend.list_page(None, status=status):
+                    row.update(status="error", error="Interrupted by backend restart")
+                    self._backend.save(row)
+
+        self._submit(_recover)
+
+    # -- in-process records ----------------------------------------------------
+    def _cached(self, session_id: str) -> Optional[SessionRecord]:
+        with self._lock:
+            record = self._sessions.get(session_id)
+            if record is not None:
+                self._sessions.move_to_end(session_id)
+                self._last_used[session_id] = time.monotonic()
+            return record
+
+    def _remember(self, record: SessionRecord) -> SessionRecord:
+        with self._lock:
+            record = self._sessions.setdefault(record.session_id, record)
+            self._sessions.move_to_end(record.session_id)
+            self._last_used[record.session_id] = time.monotonic()
+            self._evict_idle()
+        return record
+
+    def _evict_idle(self) -> None:
+        """Drop finished records beyond ``max_cached`` or idle for ``idle_seconds`` (lock held)."""
+        now = time.monotonic()
+        for session_id, record in list(self._sessions.items()):
+            if len(self._sessions) <= self.max_cached and now - self._last_used[session_id] <= self.idle_seconds:
+                break  # the rest were used more recently
+            log = record.event_log
+            if record.status in TERMINAL_STATUSES and (log is None or log.closed):
+                del self._sessions[session_id]
+                del self._last_used[session_id]
+
+    # -- public API ------------------------------------------------------------
+    def create(
+        self,
+        session_id: str,
+        query: str,
+        mode: str,
+        working_dir: str,
+        uploads: Optional[List[Dict]] = None,
+        status: str = "running",
+    ) -> SessionRecord:
         record = SessionRecord(
             session_id=session_id,
             query=query,
             mode=mode,
-            status="running",
+            status=status,
             created_at=datetime.utcnow().isoformat() + "Z",
             working_dir=working_dir,
-            event_queue=Queue(),
+            uploads=list(uploads or []),
+            event_log=EventLog(self.event_log_path(session_id)),
         )
-        self._sessions[session_id] = record
+        self._persist(self._remember(record))
         return record
 
+    def event_log_path(self, session_id: str) -> Path:
+        return self._event_log_dir / f"{session_id}.jsonl"
+
+    def _adopt(self, session_id: str, data: Optional[Dict]) -> Optional[SessionRecord]:
+        if data is None:
+            return None
+        return self._remember(SessionRecord(**data))
+
     def get(self, session_id: str) -> Optional[SessionRecord]:
-        return self._sessions.get(session_id)
+        record = self._cached(session_id)
+        if record is not None:
+            return record
+        return self._adopt(session_id, self._submit(self._backend.load, session_id).result())
 
-    def list_all(self) -> List[SessionRecord]:
-        return sorted(
-            self._sessions.values(),
-            key=lambda s: s.created_at,
-            reverse=True,
-        )
+    async def get_async(self, session_id: str) -> Optional[SessionRecord]:
+        record = self._cached(session_id)
+        if record is not None:
+            return record
+        data = await asyncio.wrap_future(self._submit(self._backend.load, session_id))
+        return self._adopt(session_id, data)
 
     def update(self, session_id: str, **kwargs) -> None:
         record = self._sessions.get(session_id)
-        if record:
-            for key, value in kwargs.items():
-                setattr(record, key, value)
+        if record is None:
+            # Historical session: load, patch and write back on the writer thread
+            def _patch():
+                data = self._backend.load(session_id)
+                if data is not None:
+                    data.update({k: v for k, v in kwargs.items() if k in PERSISTED_FIELDS})
+                    self._backend.save(data)
+
+            self._submit(_patch)
+            return
+        for key, value in kwargs.items():
+            setattr(record, key, value)
+        self._persist(record)
+
+    def _delete(self, session_id: str) -> Tuple[bool, Future]:
+        with self._lock:
+            record = self._sessions.pop(session_id, None)
+            self._last_used.pop(session_id, None)
+        if record is not None and record.event_log is not None:
+            record.event_log.close()
+
+        def _remove() -> bool:
+            self.event_log_path(session_id).unlink(missing_ok=True)
+            return self._backend.delete(session_id)
+
+        return record is not None, self._submit(_remove)
 
     def delete(self, session_id: str) -> bool:
-        if session_id in self._sessions:
-            del self._sessions[session_id]
-            return True
-        return False
+        live, removed = self._delete(session_id)
+        return removed.result() or live
+
+    async def delete_async(self, session_id: str) -> bool:
+        live, removed = self._delete(session_id)
+        return await asyncio.wrap_future(removed) or live
+
+    def list_page(
+        self,
+        limit: Optional[int] = DEFAULT_PAGE_SIZE,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> Tuple[List[SessionRecord], Optional[str]]:
+        """
+        Return one page of sessions, newest first, plus the cursor for the next page.
+
+        Either ``offset`` or ``cursor`` may be used; the cursor form is stable
+        while new sessions are being created.
+        """
+        return self._page(self._list_rows(limit, offset, cursor, status).result(), limit)
 
+    async def list_page_async(
+        self,
+        limit: Optional[int] = DEFAULT_PAGE_SIZE,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> Tuple[List[SessionRecord], Optional[str]]:
+        rows = await asyncio.wrap_future(self._list_rows(limit, offset, cursor, status))
+        return self._page(rows, limit)
+
+    def _list_rows(self, limit, offset, cursor, status) -> Future:
+        after = decode_cursor(cursor) if cursor else None
+        return self._submit(self._backend.list_page, limit, offset, after, status)
+
+    def _page(self, rows: List[Dict], limit: Optional[int]) -> Tuple[List[SessionRecord], Optional[str]]:
+        records = []
+        for row in rows:
+            # Prefer the live record so runtime-only state is shared
+            records.append(self._sessions.get(row["session_id"]) or SessionRecord(**row))
+        next_cursor = encode_cursor(records[-1]) if limit is not None and len(records) == limit else None
+        return records, next_cursor
+
+    def list_all(self) -> List[SessionRecord]:
+        records, _ = self.list_page(limit=None)
+        return records
 
-# Singleton
-store = SessionStore()
+    def close(self) -> None:
+        for record in list(self._sessions.values()):
+            if record.event_log is not None:
+                record.event_log.close()
+        self._writer.shutdown(wait=True)
+        self._backend.close()
@@ -0,0 +1,161 @@
+"""
+Agentic Data Scientist — Streaming upload handling.
+
+Uploaded files are copied to disk in fixed-size chunks on a worker thread,
+hashing incrementally as they go, so multi-GB datasets never sit in memory
+and never block the event loop. Several files of one request are copied
+concurrently while sharing a single per-session byte budget.
+
+When a :class:`~backend.blob_store.BlobStore` is supplied, each upload is
+streamed into the store first and then linked into ``user_data``, so a
+dataset that is already cached costs no extra disk space.
+"""
+
+import asyncio
+import hashlib
+import os
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import BinaryIO, List, Optional, Tuple
+
+from backend.blob_store import BlobStore
+
+
+CHUNK_SIZE = 1024 * 1024  # 1 MiB
+MAX_FILE_BYTES = int(os.getenv("MAX_UPLOAD_FILE_MB", "5120")) * 1024 * 1024
+MAX_SESSION_BYTES = int(os.getenv("MAX_UPLOAD_SESSION_MB", "10240")) * 1024 * 1024
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds the per-file or per-session limit."""
+
+
+@dataclass
+class UploadResult:
+    name: str
+    path: str
+    size: int
+    sha256: str
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class UploadBudget:
+    """Thread-safe byte budget shared by all files of one session."""
+
+    def __init__(self, limit: int = MAX_SESSION_BYTES):
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def consume(self, n: int) -> None:
+        with self._lock:
+            if self.used + n > self.limit:
+                raise UploadTooLarge(f"Session upload limit of {self.limit // (1024 * 1024)} MB exceeded")
+            self.used += n
+
+
+def safe_filename(filename: str) -> str:
+    """Strip any directory components a client may have sent."""
+    name = Path((filename or "").replace("\\", "/")).name
+    if name in ("", ".", ".."):
+        raise ValueError(f"Invalid upload filename: {filename!r}")
+    return name
+
+
+def copy_stream(
+    src: BinaryIO,
+    dest: Path,
+    budget: UploadBudget,
+    max_file_bytes: int = MAX_FILE_BYTES,
+    chunk_size: int = CHUNK_SIZE,
+) -> Tuple[int, str]:
+    """
+    Copy ``src`` to ``dest`` chunk by chunk. Returns ``(size, sha256)``.
+
+    Blocking; run it on a worker thread. A partially written file is removed
+    if a limit is exceeded.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(dest, "wb") as out:
+            while True:
+                chunk = src.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_file_bytes:
+                    raise UploadTooLarge(
+                        f"'{dest.name}' exceeds the per-file limit of {max_file_bytes // (1024 * 1024)} MB"
+                    )
+                budget.consume(len(chunk))
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        dest.unlink(missing_ok=True)
+        raise
+    return size, digest.hexdigest()
+
+
+def _save_one(
+    src: BinaryIO,
+    dest: Path,
+    budget: UploadBudget,
+    blobs: Optional[BlobStore],
+    session_id: str,
+) -> Tuple[int, str]:
+    if blobs is None:
+        return copy_stream(src, dest, budget)
+    tmp = blobs.tmp_path()
+    size, sha256 = copy_stream(src, tmp, budget)
+    blobs.ingest(tmp, sha256)
+    blobs.link(sha256, dest, session_id, dest.name)
+    return size, sha256
+
+
+async def save_uploads(
+    uploads: list,
+    dest_dir: Path,
+    budget: UploadBudget,
+    blobs: Optional[BlobStore] = None,
+    session_id: str = "",
+) -> List[UploadResult]:
+    """Stream every ``UploadFile`` in ``uploads`` into ``dest_dir`` concurrently."""
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    names = [safe_filename(upload.filename) for upload in uploads]
+    if len(set(names)) != len(names):
+        raise ValueError("Duplicate upload filenames in one request")
+
+    async def _save(upload, name: str) -> UploadResult:
+        dest = dest_dir / name
+        size, sha256 = await asyncio.to_thread(_save_one, upload.file, dest, budget, blobs, session_id)
+        return UploadResult(name=name, path=str(dest), size=size, sha256=sha256)
+
+    # Let every copy finish (or fail) before reporting, so no thread is still writing
+    results = await asyncio.gather(*(_save(u, n) for u, n in zip(uploads, names)), return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
+
+
+async def attach_blobs(
+    refs: List[dict],
+    dest_dir: Path,
+    blobs: BlobStore,
+    session_id: str,
+) -> List[UploadResult]:
+    """Link already-cached datasets (``{"name", "sha256"}``) into ``dest_dir`` without re-uploading."""
+    dest_dir.mkdir(parents=True, exist_ok=True)
+
+    def _attach(ref: dict) -> UploadResult:
+        name = safe_filename(ref.get("name", ""))
+        sha256 = ref.get("sha256", "")
+        dest = dest_dir / name
+        blobs.link(sha256, dest, session_id, name)
+        return UploadResult(name=name, path=str(dest), size=dest.stat().st_size, sha256=sha256)
+
+    return [await asyncio.to_thread(_attach, ref) for ref in refs]
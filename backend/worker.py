@@ -0,0 +1,145 @@
+"""
+Agentic Data Scientist — Out-of-process agent worker.
+
+With ``EXECUTION_MODE=process`` every agent run executes in its own Python
+process instead of the API's event loop, so CPU-heavy callbacks and
+blocking filesystem work cannot stall ``/health`` or file downloads, and a
+crashing or runaway run cannot take the API down with it.
+
+The parent writes a JSON job to the worker's stdin and reads events back as
+JSON lines from its stdout. The worker moves its own stdout to stderr before
+importing the agent stack, so stray prints (from libraries or from child
+processes it spawns) can never corrupt the event stream. Each worker gets its
+own process group, and optionally a data-segment cap
+(``WORKER_MEMORY_MB``), so it can be contained and killed as a unit.
+
+Run directly as ``python -m backend.worker < job.json``.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import signal
+import sys
+from pathlib import Path
+from typing import AsyncIterator, Dict
+
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+EXECUTION_MODE = os.getenv("EXECUTION_MODE", "inprocess")  # "inprocess" | "process"
+MEMORY_LIMIT_MB = int(os.getenv("WORKER_MEMORY_MB", "0"))  # 0 = unlimited
+# Largest single event line accepted from a worker
+MAX_EVENT_BYTES = 64 * 1024 * 1024
+
+
+class WorkerCrashed(Exception):
+    """Raised when a worker process exits abnormally."""
+
+
+# ── Parent side ───────────────────────────────────────────────────────────────
+
+
+def _kill_group(proc: asyncio.subprocess.Process) -> None:
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            # Windows has no process groups here (start_new_session is ignored); kill the worker itself
+            proc.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def run_in_worker(job: Dict) -> AsyncIterator[Dict]:
+    """
+    Run a job in a fresh worker process and yield its events.
+
+    ``job`` holds ``query``, ``agent_type``, ``working_dir`` and ``files``
+    (``[[name, path], ...]``). Raises :class:`WorkerCrashed` if the worker
+    exits with a non-zero status; the worker's process group is killed if the
+    consumer stops early.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "backend.worker",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        cwd=str(PROJECT_ROOT),
+        limit=MAX_EVENT_BYTES,
+        start_new_session=True,
+    )
+    try:
+        proc.stdin.write(json.dumps(job).encode("utf-8"))
+        await proc.stdin.drain()
+        proc.stdin.close()
+
+        async for line in proc.stdout:
+            if line.strip():
+                yield json.loads(line)
+
+        returncode = await proc.wait()
+        if returncode != 0:
+            reason = f"signal {-returncode}" if returncode < 0 else f"code {returncode}"
+            raise WorkerCrashed(f"Agent worker exited with {reason}")
+    finally:
+        if proc.returncode is None:
+            _kill_group(proc)
+            await proc.wait()
+
+
+# ── Worker side ───────────────────────────────────────────────────────────────
+
+
+def _limit_memory(megabytes: int) -> None:
+    if megabytes <= 0:
+        return
+    try:
+        import resource
+    except ImportError:  # Windows
+        logger.warning("WORKER_MEMORY_MB is not supported on this platform")
+        return
+    # RLIMIT_DATA rather than RLIMIT_AS: rlimits are inherited by the tools the
+    # agent spawns, and Node (the Claude Code CLI) reserves far more virtual
+    # address space than it ever touches. RLIMIT_DATA counts only committed
+    # private memory, so it caps a runaway worker without breaking those
+    # children, each of which gets the same cap independently.
+    limit = megabytes * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_DATA, (limit, limit))
+
+
+async def _run(job: Dict, out) -> None:
+    query, agent_type, working_dir = job["query"], job["agent_type"], job["working_dir"]
+    files = [(name, Path(path)) for name, path in job.get("files", [])]
+
+    from agentic_data_scientist import DataScientist
+
+    ds = DataScientist(agent_type=agent_type, working_dir=working_dir, auto_cleanup=False)
+    try:
+        async for event in await ds.run_async(query, files=files, stream=True):
+            out.write(json.dumps(event, default=str) + "\n")
+            out.flush()
+    finally:
+        await ds.close()
+
+
+def main() -> None:
+    # Keep a private handle on the real stdout for events; everything else printed goes to stderr
+    events = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+
+    sys.path.insert(0, str(PROJECT_ROOT / "src"))
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [worker] %(message)s")
+    _limit_memory(MEMORY_LIMIT_MB)
+
+    job = json.loads(sys.stdin.read())
+    asyncio.run(_run(job, events))
+    events.close()
+
+
+if __name__ == "__main__":
+    main()
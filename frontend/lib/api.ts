@@ -50,6 +50,12 @@ export async function getSession(id: string): Promise<SessionSummary> {
     return data;
 }
 
+export async function cancelSession(id: string): Promise<SessionSummary> {
+    const res = await fetch(`${BASE}/api/sessions/${id}/cancel`, { method: 'POST' });
+    if (!res.ok) throw new Error(`Failed to cancel session: ${await res.text()}`);
+    return res.json();
+}
+
 export async function deleteSession(id: string): Promise<void> {
     await fetch(`${BASE}/api/sessions/${id}`, { method: 'DELETE' });
 }
@@ -5,9 +5,11 @@ export type EventType =
     | 'function_call'
     | 'function_response'
     | 'file_created'
+    | 'file_modified'
     | 'usage'
     | 'keepalive'
     | 'error'
+    | 'cancelled'
     | 'completed';
 
 export interface BaseEvent {
@@ -38,8 +40,14 @@ export interface FunctionResponseEvent extends BaseEvent {
 
 export interface FileCreatedEvent extends BaseEvent {
     type: 'file_created';
-    path: string;
-    size?: number;
+    file_path: string;
+    file_size: number;
+}
+
+export interface FileModifiedEvent extends BaseEvent {
+    type: 'file_modified';
+    file_path: string;
+    file_size: number;
 }
 
 export interface UsageEvent extends BaseEvent {
@@ -58,6 +66,11 @@ export interface ErrorEvent extends BaseEvent {
     message: string;
 }
 
+export interface CancelledEvent extends BaseEvent {
+    type: 'cancelled';
+    message: string;
+}
+
 export interface CompletedEvent extends BaseEvent {
     type: 'completed';
     duration: number;
@@ -69,9 +82,11 @@ export type AgentEvent =
     | FunctionCallEvent
     | FunctionResponseEvent
     | FileCreatedEvent
+    | FileModifiedEvent
     | UsageEvent
     | KeepaliveEvent
     | ErrorEvent
+    | CancelledEvent
     | CompletedEvent;
 
 // Session types
@@ -79,11 +94,12 @@ export interface SessionSummary {
     session_id: string;
     query: string;
     mode: 'orchestrated' | 'simple';
-    status: 'running' | 'completed' | 'error';
+    status: 'queued' | 'running' | 'completed' | 'error' | 'cancelled';
     created_at: string;
     duration: number | null;
     files_created: string[];
     error: string | null;
+    queue_position?: number | null;
 }
 
 export interface FileNode {
@@ -5,8 +5,26 @@ Agentic Data Scientist provides a clean Python API and CLI for orchestrating com
 using Google's Agent Development Kit (ADK) and Claude Code CLI agents.
 """
 
-from agentic_data_scientist.core.api import DataScientist, Result, SessionConfig
+import importlib
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from agentic_data_scientist.core.api import DataScientist, Result, SessionConfig
 
 
 __version__ = "0.1.0"
 __all__ = ["DataScientist", "Result", "SessionConfig"]
+
+# The API pulls in google-adk, google-genai and litellm; import it on first use
+# so the CLI's --help and argument validation stay fast.
+_LAZY_ATTRS = {name: "agentic_data_scientist.core.api" for name in __all__}
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
@@ -27,12 +27,14 @@ from agentic_data_scientist.agents.adk.implementation_loop import make_implement
 from agentic_data_scientist.agents.adk.loop_detection import LoopDetectionAgent
 from agentic_data_scientist.agents.adk.review_confirmation import create_review_confirmation_agent
 from agentic_data_scientist.agents.adk.utils import (
-    DEFAULT_MODEL,
-    REVIEW_MODEL,
+    DEFAULT_MODEL_NAME,
+    REVIEW_MODEL_NAME,
     get_generate_content_config,
+    get_model,
     is_network_disabled,
 )
 from agentic_data_scientist.prompts import load_prompt
+from agentic_data_scientist.tools.file_ops import WORKING_DIR_STATE_KEY
 
 
 # Load environment variables
@@ -418,6 +420,16 @@ class NonEscalatingLoopAgent(LoopAgent):
         return
 
 
+def _default_working_dir_callback(working_dir: str):
+    """Create a callback that sets the session's working directory unless the caller already did."""
+
+    def callback(callback_context: CallbackContext):
+        if not callback_context.state.get(WORKING_DIR_STATE_KEY):
+            callback_context.state[WORKING_DIR_STATE_KEY] = working_dir
+
+    return callback
+
+
 def create_agent(
     working_dir: Optional[str] = None,
     mcp_servers: Optional[List[str]] = None,
@@ -425,10 +437,15 @@ def create_agent(
     """
     Factory function to create an Agentic Data Scientist ADK agent.
 
+    The file tools and coding agents work in the directory named by the
+    ``working_dir`` session state key, so the same agent can run sessions in
+    different directories; ``working_dir`` is only used when a session does
+    not set that key.
+
     Parameters
     ----------
     working_dir : str, optional
-        Working directory for the session
+        Default working directory for sessions
     mcp_servers : List[str], optional
         List of MCP servers to enable for tools
 
@@ -448,53 +465,10 @@ def create_agent(
 
     logger.info(f"[AgenticDS] Creating ADK agent with working_dir={working_dir}")
 
-    # Create local tools with working_dir bound via wrapper functions
-    from agentic_data_scientist.tools import (
-        directory_tree,
-        fetch_url,
-        get_file_info,
-        list_directory,
-        read_file,
-        read_media_file,
-        search_files,
-    )
-
-    # Bind working_dir using wrapper functions that completely hide the parameter
-    # This ensures ADK sees the correct signature without working_dir
-    working_dir_str = str(working_dir)
-
-    def read_file_bound(path: str, head: Optional[int] = None, tail: Optional[int] = None) -> str:
-        """Read file contents with optional head/tail line limits."""
-        return read_file(path, working_dir_str, head, tail)
-
-    def read_media_file_bound(path: str) -> str:
-        """Read binary/media files and return base64 encoded data."""
-        return read_media_file(path, working_dir_str)
-
-    def list_directory_bound(path: str = ".", show_sizes: bool = False, sort_by: str = "name") -> str:
-        """List directory contents with optional size display and sorting."""
-        return list_directory(path, working_dir_str, show_sizes, sort_by)
-
-    def directory_tree_bound(path: str = ".", exclude_patterns: Optional[list[str]] = None) -> str:
-        """Generate a recursive directory tree view."""
-        return directory_tree(path, working_dir_str, exclude_patterns)
-
-    def search_files_bound(pattern: str, path: str = ".", exclude_patterns: Optional[list[str]] = None) -> str:
-        """Search for files matching a pattern."""
-        return search_files(pattern, working_dir_str, path, exclude_patterns)
-
-    def get_file_info_bound(path: str) -> str:
-        """Get detailed metadata about a file."""
-        return get_file_info(path, working_dir_str)
+    # File tools resolve paths against the working directory in the session state
+    from agentic_data_scientist.tools import FILE_TOOLS, fetch_url
 
-    tools = [
-        read_file_bound,
-        read_media_file_bound,
-        list_directory_bound,
-        directory_tree_bound,
-        search_files_bound,
-        get_file_info_bound,
-    ]
+    tools = list(FILE_TOOLS)
 
     # Only add fetch_url if network access is not disabled
     if not is_network_disabled():
@@ -519,11 +493,11 @@ def create_agent(
     logger.info("[AgenticDS] Loading summary_agent prompt")
     summary_agent_instructions = load_prompt("summary")
 
-    logger.info(f"[AgenticDS] Creating summary_agent with model={DEFAULT_MODEL}")
+    logger.info(f"[AgenticDS] Creating summary_agent with model={DEFAULT_MODEL_NAME}")
 
     summary_agent = LoopDetectionAgent(
         name="summary_agent",
-        model=DEFAULT_MODEL,
+        model=get_model(DEFAULT_MODEL_NAME),
         description="Summarizes results into a comprehensive pure text report.",
         instruction=summary_agent_instructions,
         tools=tools,  # Needs tools to read files
@@ -541,13 +515,13 @@ def create_agent(
     logger.info("[AgenticDS] Loading plan maker agent prompt")
     plan_maker_instructions = load_prompt("plan_maker")
 
-    logger.info(f"[AgenticDS] Creating plan maker agent with model={DEFAULT_MODEL}")
+    logger.info(f"[AgenticDS] Creating plan maker agent with model={DEFAULT_MODEL_NAME}")
 
     plan_maker_compression = create_compression_callback(event_threshold=40, overlap_size=20)
 
     plan_maker_agent = LoopDetectionAgent(
         name="plan_maker_agent",
-        model=DEFAULT_MODEL,
+        model=get_model(DEFAULT_MODEL_NAME),
         description="Plan maker agent - creates high-level plans for complex tasks.",
         instruction=plan_maker_instructions,
         tools=tools,
@@ -565,13 +539,13 @@ def create_agent(
     logger.info("[AgenticDS] Loading plan reviewer agent prompt")
     plan_reviewer_instructions = load_prompt("plan_reviewer")
 
-    logger.info(f"[AgenticDS] Creating plan reviewer agent with model={REVIEW_MODEL}")
+    logger.info(f"[AgenticDS] Creating plan reviewer agent with model={REVIEW_MODEL_NAME}")
 
     plan_reviewer_compression = create_compression_callback(event_threshold=40, overlap_size=20)
 
     plan_reviewer_agent = LoopDetectionAgent(
         name="plan_reviewer_agent",
-        model=REVIEW_MODEL,
+        model=get_model(REVIEW_MODEL_NAME),
         description="Plan reviewer agent - reviews high-level plans for completeness and correctness.",
         instruction=plan_reviewer_instructions,
         tools=tools,
@@ -602,11 +576,11 @@ def create_agent(
     logger.info("[AgenticDS] Loading plan parser prompt")
     plan_parser_instructions = load_prompt("plan_parser")
 
-    logger.info(f"[AgenticDS] Creating plan parser agent with model={DEFAULT_MODEL}")
+    logger.info(f"[AgenticDS] Creating plan parser agent with model={DEFAULT_MODEL_NAME}")
 
     high_level_plan_parser = LoopDetectionAgent(
         name="high_level_plan_parser",
-        model=DEFAULT_MODEL,
+        model=get_model(DEFAULT_MODEL_NAME),
         description="Parses high-level plan into stages and success criteria.",
         instruction=plan_parser_instructions,
         tools=[],  # NO TOOLS - pure JSON parsing
@@ -621,7 +595,7 @@ def create_agent(
     logger.info("[AgenticDS] Loading criteria checker prompt")
     criteria_checker_instructions = load_prompt("criteria_checker")
 
-    logger.info(f"[AgenticDS] Creating criteria checker agent with model={REVIEW_MODEL}")
+    logger.info(f"[AgenticDS] Creating criteria checker agent with model={REVIEW_MODEL_NAME}")
 
     criteria_checker_compression = create_compression_callback(event_threshold=40, overlap_size=20)
 
@@ -636,7 +610,7 @@ def create_agent(
 
     success_criteria_checker = LoopDetectionAgent(
         name="success_criteria_checker",
-        model=REVIEW_MODEL,
+        model=get_model(REVIEW_MODEL_NAME),
         description="Checks which high-level success criteria have been met.",
         instruction=criteria_checker_instructions,
         tools=tools,  # NEEDS TOOLS to inspect files
@@ -651,7 +625,7 @@ def create_agent(
     logger.info("[AgenticDS] Loading stage reflector prompt")
     stage_reflector_instructions = load_prompt("stage_reflector")
 
-    logger.info(f"[AgenticDS] Creating stage reflector agent with model={DEFAULT_MODEL}")
+    logger.info(f"[AgenticDS] Creating stage reflector agent with model={DEFAULT_MODEL_NAME}")
 
     stage_reflector_compression = create_compression_callback(event_threshold=40, overlap_size=20)
 
@@ -666,7 +640,7 @@ def create_agent(
 
     stage_reflector = LoopDetectionAgent(
         name="stage_reflector",
-        model=DEFAULT_MODEL,
+        model=get_model(DEFAULT_MODEL_NAME),
         description="Reflects on and adapts remaining implementation stages.",
         instruction=stage_reflector_instructions,
         tools=tools,  # NEEDS TOOLS for context
@@ -703,6 +677,7 @@ def create_agent(
             stage_orchestrator,
             summary_agent,
         ],
+        before_agent_callback=_default_working_dir_callback(str(working_dir.resolve())),
     )
 
     logger.info("[AgenticDS] Agent creation complete")
@@ -12,11 +12,11 @@ from typing import Optional
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.events import Event, EventActions
 from google.adk.events.event_actions import EventCompaction
-from google.adk.models.lite_llm import LiteLlm
 from google.adk.models.llm_request import LlmRequest
 from google.genai import types as genai_types
 
 from agentic_data_scientist.agents.adk.utils import DEFAULT_MODEL_NAME, OPENROUTER_API_BASE, OPENROUTER_API_KEY
+from agentic_data_scientist.core.llm_clients import provider_for, registry as llm_clients
 
 
 logger = logging.getLogger(__name__)
@@ -153,13 +153,19 @@ Be detailed and specific - this summary replaces the original events, so preserv
 
     # Call LLM for summarization
     try:
-        # Create LiteLlm instance with the model NAME (string, not object!)
+        # Imported here so loading the agents does not pull in litellm
+        from google.adk.models.lite_llm import LiteLlm
+
+        # Create LiteLlm instance with the model NAME (string, not object!); it is
+        # a thin wrapper, the HTTP connections come from the shared provider pool
+        custom_llm_provider = "openrouter" if OPENROUTER_API_KEY else None
         llm = LiteLlm(
             model=model_name,
             num_retries=3,
             timeout=30,
             api_base=OPENROUTER_API_BASE if OPENROUTER_API_KEY else None,
-            custom_llm_provider="openrouter" if OPENROUTER_API_KEY else None,
+            custom_llm_provider=custom_llm_provider,
+            llm_client=llm_clients.client(provider_for(model_name, custom_llm_provider)),
         )
 
         # Create LlmRequest with proper structure
@@ -18,7 +18,7 @@ from google.genai import types
 from agentic_data_scientist.agents.adk.event_compression import create_compression_callback
 from agentic_data_scientist.agents.adk.loop_detection import LoopDetectionAgent
 from agentic_data_scientist.agents.adk.review_confirmation import create_review_confirmation_agent
-from agentic_data_scientist.agents.adk.utils import CODING_MODEL, CODING_MODEL_NAME, REVIEW_MODEL, get_generate_content_config
+from agentic_data_scientist.agents.adk.utils import CODING_MODEL_NAME, REVIEW_MODEL_NAME, get_generate_content_config, get_model
 from agentic_data_scientist.prompts import load_prompt
 
 
@@ -128,7 +128,7 @@ def make_implementation_agents(working_dir: str, tools: list):
             name="coding_agent",
             description="A coding agent that uses Gemini to implement plans.",
             instruction=coding_prompt,
-            model=CODING_MODEL,
+            model=get_model(CODING_MODEL_NAME),
             tools=tools,
             planner=BuiltInPlanner(
                 thinking_config=types.ThinkingConfig(
@@ -177,7 +177,7 @@ def make_implementation_agents(working_dir: str, tools: list):
         name="review_agent",
         description="Reviews implementation and provides feedback or approval.",
         instruction=review_prompt,
-        model=REVIEW_MODEL,
+        model=get_model(REVIEW_MODEL_NAME),
         tools=tools,
         planner=BuiltInPlanner(
             thinking_config=types.ThinkingConfig(
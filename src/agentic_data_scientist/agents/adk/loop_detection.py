@@ -5,9 +5,18 @@ This module provides a custom LlmAgent subclass that monitors streaming response
 for repetitive patterns and stops generation when loops are detected.
 """
 
+import asyncio
+import functools
+import hashlib
+import json
 import logging
+import os
 import re
-from typing import AsyncGenerator, Dict, List, Optional, Tuple
+import time
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Tuple
 
 from google.adk.agents import InvocationContext, LlmAgent
 from google.adk.events import Event
@@ -19,13 +28,400 @@ from typing_extensions import override
 logger = logging.getLogger(__name__)
 
 
+class TextWindow:
+    """
+    Ring buffer holding the last ``capacity`` characters of a stream.
+
+    Characters are stored as code points in a preallocated array and
+    addressed by their absolute position in the stream, so appends never
+    reallocate or copy the window.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.end = 0  # absolute position of the next character
+        self._codes = array("I", bytes(4 * capacity))
+
+    @property
+    def start(self) -> int:
+        """Absolute position of the oldest character held."""
+        return max(0, self.end - self.capacity)
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def append(self, code: int) -> None:
+        self._codes[self.end % self.capacity] = code
+        self.end += 1
+
+    def at(self, pos: int) -> int:
+        """Code point at absolute position ``pos``, or -1 outside the window."""
+        if pos < self.start or pos >= self.end:
+            return -1
+        return self._codes[pos % self.capacity]
+
+    def tail(self, length: int) -> str:
+        """The last ``length`` characters (at most the window) as a string."""
+        length = min(length, len(self))
+        first = (self.end - length) % self.capacity
+        if first + length <= self.capacity:
+            codes = self._codes[first : first + length]
+        else:
+            codes = self._codes[first:] + self._codes[: first + length - self.capacity]
+        return "".join(map(chr, codes))
+
+
+class RepetitionDetector:
+    """
+    Incremental detector of consecutively repeated text.
+
+    Reports a loop once the whitespace-normalized stream ends with
+    ``repetition_threshold`` consecutive copies of a pattern whose length is
+    between ``min_pattern_length`` and ``max_pattern_length``. Text is fed as
+    it arrives and each character is processed once, in amortized O(1):
+
+    * a Rabin-Karp hash of the last :attr:`BLOCK` characters is looked up
+      among the recent blocks; a hit at distance ``p`` makes ``p`` a candidate
+      period;
+    * for each candidate period (at most :attr:`MAX_CANDIDATES`) the number
+      of consecutive characters equal to the one ``p`` positions back is
+      tracked; ``repetition_threshold`` copies of a pattern of length ``L``
+      (a multiple of ``p``) need a run of ``repetition_threshold * L - p``.
+      A new candidate's run is measured by comparing backwards (up to that
+      length), so a period evicted from the candidates and found again
+      resumes where it left off;
+    * a qualifying run is verified by comparing the text directly, so hash
+      collisions never produce false positives.
+
+    Parameters
+    ----------
+    min_pattern_length, max_pattern_length : int
+        Bounds of the repeated pattern length
+    repetition_threshold : int
+        Consecutive copies that make a loop
+    window_size : int
+        Characters of history kept; loops longer than this are not reported
+
+    Attributes
+    ----------
+    scanned : int
+        Characters fed so far
+    """
+
+    BLOCK = 64
+    MAX_CANDIDATES = 16
+    _BASE = 1_000_003
+    _MOD = (1 << 61) - 1
+
+    def __init__(self, min_pattern_length: int, max_pattern_length: int, repetition_threshold: int, window_size: int):
+        self.min_pattern_length = min_pattern_length
+        self.max_pattern_length = max_pattern_length
+        self.repetition_threshold = repetition_threshold
+        self.window_size = window_size
+        self.block = min(self.BLOCK, min_pattern_length)
+        self.pattern: Optional[str] = None
+        self.scanned = 0
+        # Candidate periods look back up to max_pattern_length + block characters
+        self._window = TextWindow(max(window_size, max_pattern_length + self.block))
+        self._last_space = True  # drops leading whitespace
+        self._hash = 0
+        self._drop = pow(self._BASE, self.block - 1, self._MOD)
+        self._blocks: Dict[int, int] = {}
+        self._next_prune = max_pattern_length
+        self._runs: Dict[int, int] = {}
+
+    @property
+    def detected(self) -> bool:
+        return self.pattern is not None
+
+    def feed(self, text: str) -> Optional[str]:
+        """
+        Append streamed text.
+
+        Returns
+        -------
+        str or None
+            The first 100 characters of the repeated pattern once a loop is
+            found (and on every later call), else None
+        """
+        if self.pattern is not None:
+            return self.pattern
+        self.scanned += len(text)
+        for ch in text:
+            if ch.isspace():
+                if self._last_space:
+                    continue
+                ch = " "
+                self._last_space = True
+            else:
+                self._last_space = False
+            self._push(ord(ch))
+            if self.pattern is not None:
+                break
+        return self.pattern
+
+    def _push(self, code: int) -> None:
+        window = self._window
+        pos = window.end
+
+        # Extend or drop the runs of the candidate periods
+        for period, run in list(self._runs.items()):
+            if window.at(pos - period) == code:
+                self._runs[period] = run + 1
+            else:
+                del self._runs[period]
+
+        # Roll the hash of the last `block` characters
+        if pos >= self.block:
+            self._hash = (self._hash - window.at(pos - self.block) * self._drop) % self._MOD
+        self._hash = (self._hash * self._BASE + code) % self._MOD
+        window.append(code)
+
+        if pos + 1 >= self.block:
+            previous = self._blocks.get(self._hash)
+            self._blocks[self._hash] = pos
+            if previous is not None:
+                period = pos - previous
+                if period not in self._runs and self._pattern_length(period) <= self.max_pattern_length:
+                    if len(self._runs) >= self.MAX_CANDIDATES:
+                        del self._runs[min(self._runs, key=self._runs.get)]
+                    self._runs[period] = self._backward_run(period)
+
+        for period, run in list(self._runs.items()):
+            if self._check(period, run):
+                return
+
+        # Amortized housekeeping: forget blocks no period can reach
+        if pos >= self._next_prune:
+            horizon = pos - self.max_pattern_length
+            self._blocks = {h: p for h, p in self._blocks.items() if p >= horizon}
+            self._next_prune = pos + self.max_pattern_length
+
+    def _pattern_length(self, period: int) -> int:
+        """Shortest multiple of ``period`` that is a valid pattern length."""
+        return period if period >= self.min_pattern_length else -(-self.min_pattern_length // period) * period
+
+    def _backward_run(self, period: int) -> int:
+        """Characters ending the window equal to the one ``period`` back, up to the run a loop needs."""
+        window = self._window
+        last = window.end - 1
+        limit = self.repetition_threshold * self._pattern_length(period) - period
+        run = 0
+        while run < limit and window.at(last - run) == window.at(last - run - period) != -1:
+            run += 1
+        return run
+
+    def _check(self, period: int, run: int) -> bool:
+        """Record a loop if the run of ``period`` covers enough copies; verify it."""
+        length = self._pattern_length(period)
+        if length > self.max_pattern_length:
+            return False
+        span = self.repetition_threshold * length
+        if run < span - period or span > self.window_size or span > len(self._window):
+            return False
+        tail = self._window.tail(span)
+        unit = tail[-length:]
+        if tail != unit * self.repetition_threshold:
+            # Hash collision: the run was seeded by unequal blocks
+            del self._runs[period]
+            return False
+        self.pattern = unit[:100]
+        logger.warning(f"Loop detected: Pattern of length {length} repeated {self.repetition_threshold} times")
+        return True
+
+
+class DetectionTask:
+    """
+    Loop detection running beside an event stream.
+
+    Text is queued with :meth:`submit` and fed to ``feed`` by a background
+    task, which yields to the event loop every :attr:`CHUNK` characters, so
+    forwarding events never waits for detection. :attr:`pattern` is set once
+    a loop is found; the stream checks it before forwarding each event.
+
+    Parameters
+    ----------
+    feed : Callable[[str], Optional[str]]
+        Incremental detector; returns the repeated pattern once a loop is found
+    """
+
+    CHUNK = 2048
+
+    def __init__(self, feed: Callable[[str], Optional[str]]):
+        self.pattern: Optional[str] = None
+        self._feed = feed
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    def submit(self, text: str) -> None:
+        if self.pattern is None and not self._task.done():
+            self._queue.put_nowait(text)
+
+    async def _run(self) -> None:
+        try:
+            while self.pattern is None:
+                text = await self._queue.get()
+                try:
+                    for start in range(0, len(text), self.CHUNK):
+                        self.pattern = self._feed(text[start : start + self.CHUNK])
+                        if self.pattern is not None:
+                            break
+                        await asyncio.sleep(0)
+                finally:
+                    self._queue.task_done()
+        except Exception:
+            logger.exception("[LoopDetection] Detector task failed; loop detection disabled for this invocation")
+
+    async def drain(self) -> None:
+        """Wait until all submitted text is processed (or a loop is found)."""
+        join = asyncio.ensure_future(self._queue.join())
+        await asyncio.wait({join, self._task}, return_when=asyncio.FIRST_COMPLETED)
+        join.cancel()
+
+    async def aclose(self) -> None:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+def _normalize_args(args: Dict[str, Any]) -> str:
+    """Canonical JSON of tool arguments; paths are normalized (``./a/../b.csv`` is ``b.csv``)."""
+    normalized = {}
+    for name, value in args.items():
+        if isinstance(value, str):
+            value = value.strip()
+            if name == "path" and value:
+                value = os.path.normpath(value)
+        normalized[name] = value
+    return json.dumps(normalized, sort_keys=True, default=str)
+
+
+def _result_hash(result: Any) -> str:
+    return hashlib.sha256(json.dumps(result, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class _ToolCallRecord:
+    result_hash: str
+    result: Any
+    repeats: int = 1
+    # Last cached response handed out by `before`
+    served: Optional[Dict[str, Any]] = None
+
+
+class ToolCallTracker:
+    """
+    Detects an agent calling a tool over and over with the same outcome.
+
+    Calls are keyed by tool name and normalized arguments within one agent
+    invocation; a call's repeat count is the number of consecutive times it
+    returned the same result (a different result, e.g. after a file changed,
+    starts over). Once a call has repeated ``repeat_threshold`` times, further
+    calls are answered with the last result and a warning instead of running
+    the tool; at ``stop_threshold`` the invocation is marked stopped.
+
+    Parameters
+    ----------
+    repeat_threshold : int
+        Identical results after which calls are short-circuited
+    stop_threshold : int
+        Identical results (including short-circuited calls) after which the
+        agent is stopped
+    """
+
+    # Invocations tracked at once (state of finished ones is normally forgotten)
+    MAX_INVOCATIONS = 64
+
+    def __init__(self, repeat_threshold: int, stop_threshold: int):
+        self.repeat_threshold = repeat_threshold
+        self.stop_threshold = stop_threshold
+        self.short_circuited = 0
+        self.stops = 0
+        self._invocations: "OrderedDict[str, Dict[Tuple[str, str], _ToolCallRecord]]" = OrderedDict()
+        self._stopped: set = set()
+
+    def _calls(self, invocation_id: str) -> Dict[Tuple[str, str], _ToolCallRecord]:
+        calls = self._invocations.get(invocation_id)
+        if calls is None:
+            calls = self._invocations[invocation_id] = {}
+            while len(self._invocations) > self.MAX_INVOCATIONS:
+                evicted, _ = self._invocations.popitem(last=False)
+                self._stopped.discard(evicted)
+        return calls
+
+    def before(self, invocation_id: str, tool_name: str, args: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Check a call before it runs.
+
+        Returns
+        -------
+        dict or None
+            The cached result with a ``warning`` if the call is looping, else
+            None (run the tool)
+        """
+        record = self._calls(invocation_id).get((tool_name, _normalize_args(args)))
+        if record is None or record.repeats < self.repeat_threshold:
+            return None
+        record.repeats += 1
+        self.short_circuited += 1
+        warning = (
+            f"[TOOL LOOP] {tool_name} was called {record.repeats} times with the same arguments and returned "
+            "the same result each time; this is the cached result. Use it instead of calling the tool again."
+        )
+        if record.repeats >= self.stop_threshold and invocation_id not in self._stopped:
+            self._stopped.add(invocation_id)
+            self.stops += 1
+            warning += " The agent is being stopped."
+        logger.warning(f"[LoopDetection] Repeated tool call {tool_name}({_normalize_args(args)}) x{record.repeats}")
+        response = dict(record.result) if isinstance(record.result, dict) else {"result": record.result}
+        response["warning"] = warning
+        record.served = response
+        return response
+
+    def after(self, invocation_id: str, tool_name: str, args: Dict[str, Any], result: Any) -> None:
+        """
+        Record the result of a call.
+
+        ADK runs the after-tool callbacks on short-circuited calls too; the
+        response :meth:`before` served was already counted and is skipped.
+        """
+        calls = self._calls(invocation_id)
+        key = (tool_name, _normalize_args(args))
+        record = calls.get(key)
+        if record is not None and record.served is not None and result == record.served:
+            record.served = None
+            return
+        digest = _result_hash(result)
+        if record is not None and record.result_hash == digest:
+            record.repeats += 1
+        else:
+            calls[key] = _ToolCallRecord(result_hash=digest, result=result)
+
+    def stopped(self, invocation_id: str) -> bool:
+        return invocation_id in self._stopped
+
+    def forget(self, invocation_id: str) -> None:
+        self._invocations.pop(invocation_id, None)
+        self._stopped.discard(invocation_id)
+
+
 class LoopDetectionAgent(LlmAgent):
     """
     LlmAgent subclass with loop detection for streaming responses.
 
     Monitors partial events during streaming and detects repetitive patterns.
     When a loop is detected, it stops the current agent to prevent infinite generation,
-    but allows the workflow to continue with other agents.
+    but allows the workflow to continue with other agents. Detection runs in a
+    background :class:`DetectionTask`, so events are forwarded without waiting for it;
+    a loop stops the agent at the next event.
+
+    Tool calls are watched as well: a :class:`ToolCallTracker` answers a call that keeps
+    returning the same result from its cache with a warning, and stops the agent if the
+    calls continue.
 
     IMPORTANT: Loop detection only applies to content generated by THIS specific agent,
     not to events from sub-agents or tool agents that flow through this agent. This
@@ -57,21 +453,92 @@ class LoopDetectionAgent(LlmAgent):
         ge=100,
         description="Size of the sliding content window to analyze for loops",
     )
+    tool_repeat_threshold: int = Field(
+        default=3,
+        ge=1,
+        description="Identical results of a tool call after which repeated calls are answered from cache",
+    )
+    tool_stop_threshold: int = Field(
+        default=6,
+        ge=1,
+        description="Identical results of a tool call after which the agent is stopped",
+    )
 
-    # Internal state (private attrs are excluded from Pydantic field validation)
-    _content_buffer: str = PrivateAttr(default="")
-    _pattern_cache: Dict[str, int] = PrivateAttr(default_factory=dict)
-    _loop_detected: bool = PrivateAttr(default=False)
-    _event_count: int = PrivateAttr(default=0)
-    _partial_buffer: str = PrivateAttr(default="")
-
-    def _reset_detection_state(self):
-        """Reset the loop detection state for a new invocation."""
-        self._content_buffer = ""
-        self._pattern_cache = {}
-        self._loop_detected = False
-        self._event_count = 0
-        self._partial_buffer = ""
+    # Detection cost over the agent's lifetime (private attrs are excluded from Pydantic
+    # field validation). Per-invocation state lives in the run methods, so concurrent
+    # invocations of one agent don't share a detector.
+    _chars_scanned: int = PrivateAttr(default=0)
+    _detection_seconds: float = PrivateAttr(default=0.0)
+    _tool_calls: Optional[ToolCallTracker] = PrivateAttr(default=None)
+
+    def _new_detector(self) -> RepetitionDetector:
+        return RepetitionDetector(
+            min_pattern_length=self.min_pattern_length,
+            max_pattern_length=self.max_pattern_length,
+            repetition_threshold=self.repetition_threshold,
+            window_size=self.window_size,
+        )
+
+    def _detection_task(self) -> DetectionTask:
+        """Background detection over a fresh detector for one invocation."""
+        return DetectionTask(functools.partial(self._detect, self._new_detector()))
+
+    def _detect(self, detector: RepetitionDetector, text: str) -> Optional[str]:
+        """Feed newly streamed text to an invocation's detector; the repeated pattern once a loop is found."""
+        started = time.perf_counter()
+        pattern = detector.feed(text)
+        self._detection_seconds += time.perf_counter() - started
+        self._chars_scanned += len(text)
+        return pattern
+
+    def detection_stats(self) -> Dict[str, Any]:
+        """Characters scanned and time spent in loop detection by this agent, and tool loops caught."""
+        tracker = self.tool_call_tracker
+        return {
+            "chars_scanned": self._chars_scanned,
+            "detection_ms": round(self._detection_seconds * 1000, 3),
+            "tool_calls_short_circuited": tracker.short_circuited,
+            "tool_loop_stops": tracker.stops,
+        }
+
+    @property
+    def tool_call_tracker(self) -> ToolCallTracker:
+        if self._tool_calls is None:
+            self._tool_calls = ToolCallTracker(self.tool_repeat_threshold, self.tool_stop_threshold)
+        return self._tool_calls
+
+    def _before_tool_call(self, tool: Any, args: Dict[str, Any], tool_context: Any) -> Optional[Dict[str, Any]]:
+        return self.tool_call_tracker.before(tool_context.invocation_id, tool.name, args)
+
+    def _after_tool_call(self, tool: Any, args: Dict[str, Any], tool_context: Any, tool_response: Any) -> None:
+        self.tool_call_tracker.after(tool_context.invocation_id, tool.name, args, tool_response)
+
+    @property
+    def canonical_before_tool_callbacks(self) -> list:
+        # Ours first: a looping call is answered before user callbacks or the tool run
+        return [self._before_tool_call] + super().canonical_before_tool_callbacks
+
+    @property
+    def canonical_after_tool_callbacks(self) -> list:
+        # Returns None, so the callbacks after it still run
+        return [self._after_tool_call] + super().canonical_after_tool_callbacks
+
+    def _tool_loop_event(self, event_count: int) -> Event:
+        logger.error(f"🔄 Tool call loop detected in {self.name} after {event_count} total events")
+        return Event(
+            author=self.name,
+            content=types.Content(
+                role="model",
+                parts=[
+                    types.Part(
+                        text="\n\n[LOOP DETECTED] Stopping current agent execution due to repeated identical "
+                        "tool calls.\n\nThe workflow will continue with the next agent or step."
+                    )
+                ],
+            ),
+            partial=False,
+            turn_complete=True,
+        )
 
     def _maybe_save_output_to_state(self, event: Event) -> None:
         """
@@ -118,61 +585,16 @@ class LoopDetectionAgent(LlmAgent):
 
     def _detect_pattern_repetition(self, text: str) -> Tuple[bool, Optional[str]]:
         """
-        Optimized pattern detection - check smallest patterns first.
+        Check a complete text for a loop at its end.
 
-        Key insight: If a long pattern repeats N times, shorter patterns
-        repeat more times. So we check from smallest to largest and exit
-        as soon as we find ANY valid repetition.
-
-        Time complexity: O(N²) worst case, but O(N) best case when loops exist
+        Streaming code feeds the invocation's detector incrementally instead;
+        this runs a fresh :class:`RepetitionDetector` over ``text``.
 
         Returns:
             Tuple of (loop_detected, repeated_pattern)
         """
-        if len(text) < self.min_pattern_length * self.repetition_threshold:
-            return False, None
-
-        # Clean text for pattern detection (remove extra whitespace)
-        clean_text = re.sub(r'\s+', ' ', text).strip()
-        text_len = len(clean_text)
-
-        # Maximum feasible pattern length
-        max_pattern = min(text_len // self.repetition_threshold, self.max_pattern_length)
-
-        # CHECK FROM SMALLEST TO LARGEST - exit on first match!
-        # This is key: we don't need to find the "best" pattern, just ANY pattern
-        # SAFETY: Add iteration limit to prevent performance issues with pathological inputs
-        max_iterations = 10000
-        iterations = 0
-
-        for pattern_len in range(self.min_pattern_length, max_pattern + 1):
-            # For each length, scan through the text
-            # Use sliding window with optimization for large texts
-            step = 1 if text_len < 2000 else pattern_len // 4
-            step = max(1, step)
-
-            for start in range(0, text_len - pattern_len * self.repetition_threshold + 1, step):
-                iterations += 1
-                if iterations > max_iterations:
-                    logger.warning(f"[LoopDetection] Hit iteration limit ({max_iterations}), giving up on pattern detection")
-                    return False, None
-
-                pattern = clean_text[start : start + pattern_len]
-
-                # Count consecutive repetitions from this position
-                count = 0
-                pos = start
-
-                while pos + pattern_len <= text_len and clean_text[pos : pos + pattern_len] == pattern:
-                    count += 1
-                    pos += pattern_len
-
-                # Early exit on first valid pattern found!
-                if count >= self.repetition_threshold:
-                    logger.warning(f"Loop detected: Pattern of length {pattern_len} repeated {count} times")
-                    return True, pattern[:100]
-
-        return False, None
+        pattern = self._new_detector().feed(text)
+        return pattern is not None, pattern
 
     def _parse_unknown_tool_error(self, exc: Exception) -> Tuple[bool, Optional[str]]:
         """Detect if an exception indicates an unknown tool function call.
@@ -205,21 +627,16 @@ class LoopDetectionAgent(LlmAgent):
         gracefully, allowing the workflow to continue with other agents
         rather than ending the entire process.
         """
-        # Reset detection state for new invocation
-        self._reset_detection_state()
-
-        # Track if we're in streaming mode
-        is_streaming = False
-        accumulated_text = ""
+        detection = self._detection_task()
+        event_count = 0
+        streamed_partials = False
 
         try:
             async for event in self._llm_flow.run_async(ctx):
-                self._event_count += 1
+                event_count += 1
 
                 # Check if this is a partial event (streaming)
                 is_partial = getattr(event, 'partial', False)
-                if is_partial:
-                    is_streaming = True
 
                 # Only check for loops in events from THIS agent, not sub-agents
                 is_own_event = getattr(event, 'author', None) == self.name
@@ -228,62 +645,48 @@ class LoopDetectionAgent(LlmAgent):
                 event_text = self._extract_text_from_event(event)
 
                 if event_text and is_own_event:
-                    # Accumulate text for pattern detection
-                    if is_streaming and is_partial:
-                        # For partial events, accumulate in buffer
-                        self._partial_buffer += event_text
-                        # CRITICAL FIX: Prevent _partial_buffer from growing unbounded
-                        if len(self._partial_buffer) > self.window_size:
-                            self._partial_buffer = self._partial_buffer[-self.window_size:]
-                        accumulated_text = self._content_buffer + self._partial_buffer
+                    # The detector only sees new text. A complete event that follows
+                    # partials repeats their aggregate, which was already fed.
+                    if is_partial:
+                        streamed_partials = True
+                        detection.submit(event_text)
+                    elif streamed_partials:
+                        streamed_partials = False
                     else:
-                        # For complete events, add to main buffer
-                        self._content_buffer += event_text
-                        accumulated_text = self._content_buffer
-                        self._partial_buffer = ""  # Clear partial buffer
-
-                    # Only check for loops after accumulating enough content
-                    if len(accumulated_text) > self.min_pattern_length * 2:
-                        # Keep only recent content for analysis (sliding window)
-                        if len(accumulated_text) > self.window_size:
-                            accumulated_text = accumulated_text[-self.window_size :]
-                            # Update the main buffer to prevent memory leak
-                            self._content_buffer = accumulated_text
-
-                        # Detect repetition patterns
-                        loop_detected, pattern = self._detect_pattern_repetition(accumulated_text)
-
-                        if loop_detected and not self._loop_detected:
-                            self._loop_detected = True
-
-                            # Log the detection
-                            logger.error(f"🔄 Loop detected in {self.name} after {self._event_count} total events")
-                            logger.error(f"Pattern sample: {pattern[:100]}..." if pattern else "Unknown pattern")
-
-                            # Create a warning event to notify about the loop
-                            warning_event = Event(
-                                author=self.name,
-                                content=types.Content(
-                                    role="model",
-                                    parts=[
-                                        types.Part(
-                                            text="\n\n[LOOP DETECTED] Stopping current agent execution due to repetitive output pattern.\n\n"
-                                            "The current agent has been stopped to prevent infinite generation. "
-                                            "The workflow will continue with the next agent or step."
-                                        )
-                                    ],
-                                ),
-                                partial=False,  # This is a complete message
-                                turn_complete=True,  # Signal end of turn
-                            )
-
-                            # Save output if configured
-                            self._maybe_save_output_to_state(warning_event)
-                            yield warning_event
-
-                            # Stop processing this agent only - do NOT set ctx.end_invocation
-                            # This allows the workflow to continue with other agents
-                            return
+                        detection.submit(event_text)
+
+                    # Detection runs in the background: a loop found in earlier
+                    # text stops the agent before this event is forwarded
+                    pattern = detection.pattern
+                    if pattern is not None:
+                        # Log the detection
+                        logger.error(f"🔄 Loop detected in {self.name} after {event_count} total events")
+                        logger.error(f"Pattern sample: {pattern[:100]}..." if pattern else "Unknown pattern")
+
+                        # Create a warning event to notify about the loop
+                        warning_event = Event(
+                            author=self.name,
+                            content=types.Content(
+                                role="model",
+                                parts=[
+                                    types.Part(
+                                        text="\n\n[LOOP DETECTED] Stopping current agent execution due to repetitive output pattern.\n\n"
+                                        "The current agent has been stopped to prevent infinite generation. "
+                                        "The workflow will continue with the next agent or step."
+                                    )
+                                ],
+                            ),
+                            partial=False,  # This is a complete message
+                            turn_complete=True,  # Signal end of turn
+                        )
+
+                        # Save output if configured
+                        self._maybe_save_output_to_state(warning_event)
+                        yield warning_event
+
+                        # Stop processing this agent only - do NOT set ctx.end_invocation
+                        # This allows the workflow to continue with other agents
+                        return
 
                 # Process state saving for non-loop events
                 self._maybe_save_output_to_state(event)
@@ -291,14 +694,12 @@ class LoopDetectionAgent(LlmAgent):
                 # Yield the event upstream
                 yield event
 
-                # If this was a final event (not partial), update our main buffer
-                if is_streaming and not is_partial and self._partial_buffer:
-                    self._content_buffer += self._partial_buffer
-                    self._partial_buffer = ""
-
-                    # Trim buffer if too large
-                    if len(self._content_buffer) > self.window_size:
-                        self._content_buffer = self._content_buffer[-self.window_size :]
+                # A tool call loop stops the agent once the cached response is forwarded
+                if self.tool_call_tracker.stopped(ctx.invocation_id):
+                    warning_event = self._tool_loop_event(event_count)
+                    self._maybe_save_output_to_state(warning_event)
+                    yield warning_event
+                    return
         except Exception as e:
             is_unknown_tool, missing_tool = self._parse_unknown_tool_error(e)
             if not is_unknown_tool:
@@ -330,6 +731,9 @@ class LoopDetectionAgent(LlmAgent):
             self._maybe_save_output_to_state(warning_event)
             yield warning_event
             return
+        finally:
+            await detection.aclose()
+            self.tool_call_tracker.forget(ctx.invocation_id)
 
     @override
     async def _run_live_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
@@ -340,12 +744,12 @@ class LoopDetectionAgent(LlmAgent):
         The agent will terminate gracefully when a loop is detected,
         allowing the workflow to continue rather than ending the entire process.
         """
-        # Reset detection state for new invocation
-        self._reset_detection_state()
+        detection = self._detection_task()
+        event_count = 0
 
         try:
             async for event in self._llm_flow.run_live(ctx):
-                self._event_count += 1
+                event_count += 1
 
                 # Only check for loops in events from THIS agent, not sub-agents
                 is_own_event = getattr(event, 'author', None) == self.name
@@ -354,51 +758,46 @@ class LoopDetectionAgent(LlmAgent):
                 event_text = self._extract_text_from_event(event)
 
                 if event_text and is_own_event:
-                    self._content_buffer += event_text
-
-                    # Keep only recent content
-                    if len(self._content_buffer) > self.window_size:
-                        self._content_buffer = self._content_buffer[-self.window_size :]
-
-                    # Detect loops
-                    if len(self._content_buffer) > self.min_pattern_length * 2:
-                        loop_detected, pattern = self._detect_pattern_repetition(self._content_buffer)
-
-                        if loop_detected and not self._loop_detected:
-                            self._loop_detected = True
-
-                            logger.error(
-                                f"🔄 Loop detected in {self.name} (live mode) after {self._event_count} total events"
-                            )
-                            logger.error(f"Pattern sample: {pattern[:100]}..." if pattern else "Unknown pattern")
-
-                            # Create warning event
-                            warning_event = Event(
-                                author=self.name,
-                                content=types.Content(
-                                    role="model",
-                                    parts=[
-                                        types.Part(
-                                            text="\n\n[LOOP DETECTED] Stopping current agent execution due to repetitive output.\n\n"
-                                            "The current agent has been stopped to prevent infinite generation. "
-                                            "The workflow will continue with the next agent or step."
-                                        )
-                                    ],
-                                ),
-                                turn_complete=True,
-                            )
-
-                            self._maybe_save_output_to_state(warning_event)
-                            yield warning_event
-
-                            # Stop processing this agent only - do NOT set ctx.end_invocation
-                            # This allows the workflow to continue with other agents
-                            return
+                    # Detect loops in the new text in the background
+                    detection.submit(event_text)
+                    pattern = detection.pattern
+                    if pattern is not None:
+                        logger.error(f"🔄 Loop detected in {self.name} (live mode) after {event_count} total events")
+                        logger.error(f"Pattern sample: {pattern[:100]}..." if pattern else "Unknown pattern")
+
+                        # Create warning event
+                        warning_event = Event(
+                            author=self.name,
+                            content=types.Content(
+                                role="model",
+                                parts=[
+                                    types.Part(
+                                        text="\n\n[LOOP DETECTED] Stopping current agent execution due to repetitive output.\n\n"
+                                        "The current agent has been stopped to prevent infinite generation. "
+                                        "The workflow will continue with the next agent or step."
+                                    )
+                                ],
+                            ),
+                            turn_complete=True,
+                        )
+
+                        self._maybe_save_output_to_state(warning_event)
+                        yield warning_event
+
+                        # Stop processing this agent only - do NOT set ctx.end_invocation
+                        # This allows the workflow to continue with other agents
+                        return
 
                 # Process normally
                 self._maybe_save_output_to_state(event)
                 yield event
 
+                if self.tool_call_tracker.stopped(ctx.invocation_id):
+                    warning_event = self._tool_loop_event(event_count)
+                    self._maybe_save_output_to_state(warning_event)
+                    yield warning_event
+                    return
+
                 if ctx.end_invocation:
                     return
         except Exception as e:
@@ -430,3 +829,6 @@ class LoopDetectionAgent(LlmAgent):
             self._maybe_save_output_to_state(warning_event)
             yield warning_event
             return
+        finally:
+            await detection.aclose()
+            self.tool_call_tracker.forget(ctx.invocation_id)
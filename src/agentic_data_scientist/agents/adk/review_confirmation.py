@@ -14,7 +14,7 @@ from google.genai import types
 from pydantic import BaseModel, Field
 
 from agentic_data_scientist.agents.adk.loop_detection import LoopDetectionAgent
-from agentic_data_scientist.agents.adk.utils import REVIEW_MODEL, get_generate_content_config
+from agentic_data_scientist.agents.adk.utils import REVIEW_MODEL_NAME, get_generate_content_config, get_model
 from agentic_data_scientist.prompts import load_prompt
 
 
@@ -211,7 +211,7 @@ def create_review_confirmation_agent(
 
     agent = LoopDetectionAgent(
         name=f"{prompt_name}_agent",
-        model=REVIEW_MODEL,
+        model=get_model(REVIEW_MODEL_NAME),
         description="Determines whether to exit the review loop based on implementation status.",
         instruction=instruction,
         tools=[],  # No tools - structured output only
@@ -5,15 +5,20 @@ This module provides model configuration, helper functions, and shared settings
 for the ADK agent system.
 """
 
+import functools
 import logging
 import os
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from dotenv import load_dotenv
-from google.adk.models.lite_llm import LiteLlm
 from google.adk.tools.tool_context import ToolContext
 from google.genai import types
 
+from agentic_data_scientist.core.llm_clients import provider_for, registry as llm_clients
+
+
+if TYPE_CHECKING:
+    from google.adk.models.lite_llm import LiteLlm
 
 load_dotenv()
 
@@ -41,13 +46,15 @@ __all__ = [
     'DEFAULT_MODEL_NAME',
     'REVIEW_MODEL_NAME',
     'CODING_MODEL_NAME',  # Export model name strings
-    'DEFAULT_MODEL',
-    'REVIEW_MODEL',
-    'CODING_MODEL',
+    # Model instances are created on first access by the module __getattr__ below
+    'DEFAULT_MODEL',  # noqa: F822
+    'REVIEW_MODEL',  # noqa: F822
+    'CODING_MODEL',  # noqa: F822
     'OPENROUTER_API_KEY',
     'OPENROUTER_API_BASE',
     'GEMINI_API_KEY',  # Export for direct Gemini API access
     'OR_APP_NAME',  # Export for OpenRouter app name
+    'get_model',
     'get_generate_content_config',
     'exit_loop_simple',
     'is_network_disabled',
@@ -64,25 +71,60 @@ if GEMINI_API_KEY:
     logger.info("[AgenticDS] Gemini API key configured")
 
 # Create LiteLLM model instances
-def create_model(model_name: str) -> LiteLlm:
+def create_model(model_name: str) -> "LiteLlm":
     """Create a LiteLlm instance configured for OpenRouter or direct Gemini."""
+    # litellm is slow to import; load it only once a model is needed
+    from google.adk.models.lite_llm import LiteLlm
+
     logger.info(f"[AgenticDS] Initializing model: {model_name}")
     # If the model name starts with gemini/ or google/ or gemini-, and we have GEMINI_API_KEY,
     # we can use direct AI Studio instead of OpenRouter.
     is_gemini = model_name.startswith(("gemini/", "google/", "gemini-"))
     use_openrouter = OPENROUTER_API_KEY is not None and not (is_gemini and GEMINI_API_KEY)
+    custom_llm_provider = "openrouter" if use_openrouter else None
 
     return LiteLlm(
         model=model_name,
         num_retries=10,
         timeout=60,
         api_base=OPENROUTER_API_BASE if use_openrouter else None,
-        custom_llm_provider="openrouter" if use_openrouter else None,
+        custom_llm_provider=custom_llm_provider,
+        # Shared connection pool and concurrency limit of the provider
+        llm_client=llm_clients.client(provider_for(model_name, custom_llm_provider)),
     )
 
-DEFAULT_MODEL = create_model(DEFAULT_MODEL_NAME)
-REVIEW_MODEL = create_model(REVIEW_MODEL_NAME)
-CODING_MODEL = create_model(CODING_MODEL_NAME)
+
+@functools.lru_cache(maxsize=None)
+def get_model(model_name: str) -> "LiteLlm":
+    """
+    Shared LiteLlm instance for a model, created on first use.
+
+    Parameters
+    ----------
+    model_name : str
+        Model identifier (e.g. ``DEFAULT_MODEL_NAME``)
+
+    Returns
+    -------
+    LiteLlm
+        The model instance used by every agent configured with ``model_name``
+    """
+    return create_model(model_name)
+
+
+# DEFAULT_MODEL, REVIEW_MODEL and CODING_MODEL are built on first access
+_MODEL_ATTRS = {
+    'DEFAULT_MODEL': DEFAULT_MODEL_NAME,
+    'REVIEW_MODEL': REVIEW_MODEL_NAME,
+    'CODING_MODEL': CODING_MODEL_NAME,
+}
+
+
+def __getattr__(name: str):
+    if name in _MODEL_ATTRS:
+        return get_model(_MODEL_ATTRS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Language requirement (empty for English-only models)
 LANGUAGE_REQUIREMENT = ""
@@ -153,9 +195,11 @@ def get_generate_content_config(temperature: float = 0.0, output_tokens: Optiona
         top_p=0.95,
         seed=42,
         max_output_tokens=output_tokens,
+        # Only used by native google-genai models; LiteLlm models retry through
+        # the shared rate limiter (see core.llm_clients)
         http_options=types.HttpOptions(
             retry_options=types.HttpRetryOptions(
-                attempts=50,
+                attempts=5,
                 initial_delay=1.0,
                 max_delay=30,
                 exp_base=1.5,
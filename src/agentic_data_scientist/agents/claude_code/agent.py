@@ -22,6 +22,7 @@ from agentic_data_scientist.agents.claude_code.templates import (
     get_claude_instructions,
     get_minimal_pyproject,
 )
+from agentic_data_scientist.tools.file_ops import WORKING_DIR_STATE_KEY
 
 
 try:
@@ -256,15 +257,15 @@ class ClaudeCodeAgent(Agent):
     async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
         """Execute Claude Agent with the implementation plan."""
         try:
-            # Get working directory
-            working_dir = self._working_dir
+            # Get state
+            state = ctx.session.state
+
+            # Get working directory: the session's, falling back to the one this agent was created with
+            working_dir = state.get(WORKING_DIR_STATE_KEY) or self._working_dir
             if not working_dir:
                 import tempfile
 
                 working_dir = tempfile.mkdtemp(prefix="claude_session_")
-
-            # Get state
-            state = ctx.session.state
             current_stage = state.get("current_stage")
 
             # Format stage information for the prompt
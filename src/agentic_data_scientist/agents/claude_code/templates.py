@@ -12,6 +12,46 @@ from typing import Any, Dict
 
 logger = logging.getLogger(__name__)
 
+# Used when the coding_base prompt is missing
+_FALLBACK_TEMPLATE = Template(
+    """You are a coding assistant. Implement the given task completely and thoroughly.
+
+Working directory: $working_dir
+
+Task: $implementation_task
+
+Plan: $implementation_plan
+
+Requirements:
+1. Complete ALL steps in the plan
+2. Save all outputs with descriptive filenames
+3. Print progress updates after each step
+4. Generate comprehensive documentation
+5. Create final execution summary when done"""
+)
+
+FILE_HANDLING_CONSTRAINTS = """
+
+CRITICAL FILE HANDLING CONSTRAINTS:
+=====================================
+Claude Agent SDK has a 1MB buffer limit for tool responses. To prevent buffer overflow errors:
+
+1. DO NOT read files larger than 1MB directly using the Read tool
+2. For large CSV/data files:
+   - Use command-line tools (ls -lh, wc -l, head, tail) to inspect first
+   - Use pandas with nrows parameter to load only portions: pd.read_csv('file.csv', nrows=1000)
+   - Process files in chunks using pandas chunksize parameter
+3. Check file sizes before reading:
+   - Use bash: ls -lh filename.csv
+   - Only read files under 1MB directly
+4. For files >1MB:
+   - Sample the data (head/tail commands)
+   - Load incrementally with pandas
+   - Use streaming/iterative processing
+
+Violating these constraints will cause "JSON message exceeded maximum buffer size" errors.
+"""
+
 
 def get_claude_instructions(state: Dict[str, Any], working_dir: str) -> str:
     """
@@ -32,27 +72,13 @@ def get_claude_instructions(state: Dict[str, Any], working_dir: str) -> str:
     str
         The complete system instructions with substituted variables.
     """
-    # Load the coding base prompt
+    # Load the coding base prompt (read and compiled once by the prompt registry)
     try:
-        from agentic_data_scientist.prompts import load_prompt
+        from agentic_data_scientist.prompts import load_template
 
-        base_content = load_prompt("coding_base")
+        template = load_template("coding_base")
     except FileNotFoundError:
-        # Fallback to a simple default
-        base_content = """You are a coding assistant. Implement the given task completely and thoroughly.
-
-Working directory: $working_dir
-
-Task: $implementation_task
-
-Plan: $implementation_plan
-
-Requirements:
-1. Complete ALL steps in the plan
-2. Save all outputs with descriptive filenames
-3. Print progress updates after each step
-4. Generate comprehensive documentation
-5. Create final execution summary when done"""
+        template = _FALLBACK_TEMPLATE
 
     # Create substitutions dictionary
     substitutions = {'working_dir': working_dir}
@@ -71,36 +97,8 @@ Requirements:
         else:
             substitutions[key] = value
 
-    # Substitute variables
-    template = Template(base_content)
-    result = template.safe_substitute(**substitutions)
-
-    # Append critical file handling constraints
-    file_handling_constraints = """
-
-CRITICAL FILE HANDLING CONSTRAINTS:
-=====================================
-Claude Agent SDK has a 1MB buffer limit for tool responses. To prevent buffer overflow errors:
-
-1. DO NOT read files larger than 1MB directly using the Read tool
-2. For large CSV/data files:
-   - Use command-line tools (ls -lh, wc -l, head, tail) to inspect first
-   - Use pandas with nrows parameter to load only portions: pd.read_csv('file.csv', nrows=1000)
-   - Process files in chunks using pandas chunksize parameter
-3. Check file sizes before reading:
-   - Use bash: ls -lh filename.csv
-   - Only read files under 1MB directly
-4. For files >1MB:
-   - Sample the data (head/tail commands)
-   - Load incrementally with pandas
-   - Use streaming/iterative processing
-
-Violating these constraints will cause "JSON message exceeded maximum buffer size" errors.
-"""
-
-    result += file_handling_constraints
-
-    return result
+    # Substitute variables and append critical file handling constraints
+    return template.safe_substitute(**substitutions) + FILE_HANDLING_CONSTRAINTS
 
 
 def get_claude_context(
@@ -12,7 +12,7 @@ from typing import Optional
 
 import click
 
-from agentic_data_scientist import DataScientist
+from agentic_data_scientist.cli.startup_profile import profile_startup
 
 
 # Suppress third-party library console output early, before importing our modules
@@ -25,21 +25,20 @@ for lib_name in ['LiteLLM', 'litellm', 'httpx', 'httpcore', 'openai', 'anthropic
 
 os.environ['LITELLM_LOG'] = 'ERROR'  # Only show errors from LiteLLM
 
-# Try to suppress LiteLLM's verbose output if the module is available
-try:
-    import litellm
-
-    litellm.suppress_debug_info = True
-    litellm.drop_params = True
-    litellm.turn_off_message_logging = True
-except (ImportError, AttributeError):
-    # LiteLLM not installed yet or attributes don't exist, will be configured later
-    pass
+# The agent runtime (ADK, google-genai, LiteLLM) is imported only once a query
+# is about to run, so --help and argument validation return immediately.
 
 
 logger = logging.getLogger(__name__)
 
 
+def _profile_startup(ctx: click.Context, param: click.Parameter, value: bool) -> None:
+    if not value or ctx.resilient_parsing:
+        return
+    click.echo(profile_startup())
+    ctx.exit()
+
+
 @click.command()
 @click.argument('query', required=False)
 @click.option(
@@ -76,6 +75,14 @@ logger = logging.getLogger(__name__)
     type=click.Path(),
     help='Path to log file (default: .agentic_ds.log in working directory)',
 )
+@click.option(
+    '--profile-startup',
+    is_flag=True,
+    is_eager=True,
+    expose_value=False,
+    callback=_profile_startup,
+    help='Report where import time goes for the CLI and the agent runtime, then exit',
+)
 def main(
     query: Optional[str],
     files: tuple,
@@ -191,6 +198,8 @@ def main(
 
     # Create core instance
     try:
+        from agentic_data_scientist import DataScientist
+
         core = DataScientist(
             agent_type=agent_type,
             working_dir=working_dir_to_use,
@@ -239,7 +248,7 @@ def main(
             lib_logger.handlers.clear()  # Remove any console handlers
             lib_logger.propagate = True  # Send to root logger (file only)
 
-        # Re-apply LiteLLM suppression settings in case it was imported
+        # Apply LiteLLM suppression settings if it is installed
         try:
             import litellm
 
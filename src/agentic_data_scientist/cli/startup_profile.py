@@ -0,0 +1,173 @@
+"""
+Startup profiling for the Agentic Data Scientist CLI.
+
+``agentic-data-scientist --profile-startup`` imports each entry point in a
+fresh interpreter under ``python -X importtime`` and summarizes the output:
+total import time against the startup budget, the packages that account for
+most of it and the slowest individual modules.
+"""
+
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Tuple
+
+
+# Entry points profiled, in report order
+PROFILE_TARGETS: List[Tuple[str, str]] = [
+    ("cli", "agentic_data_scientist.cli.main"),
+    ("agent runtime", "agentic_data_scientist.core.api"),
+    ("backend", "backend.main"),
+]
+
+# Target for the CLI's --help and validation paths
+STARTUP_BUDGET_MS = 200
+
+
+@dataclass
+class ImportTiming:
+    """One line of ``-X importtime`` output."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    """
+    Parse the stderr of ``python -X importtime``.
+
+    Parameters
+    ----------
+    output : str
+        Raw interpreter stderr; lines that are not import timings are skipped
+
+    Returns
+    -------
+    List[ImportTiming]
+        Timings in the order the imports finished
+    """
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line
+        name = parts[2].rstrip()
+        # One leading space, then two spaces per nesting level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        timings.append(ImportTiming(name.strip(), int(parts[0]), int(parts[1]), depth))
+    return timings
+
+
+def profile_import(module: str, env: Optional[Mapping[str, str]] = None) -> List[ImportTiming]:
+    """
+    Import ``module`` in a fresh interpreter and collect its import timings.
+
+    Parameters
+    ----------
+    module : str
+        Dotted module name
+    env : Mapping[str, str], optional
+        Environment of the child interpreter (default: inherited)
+
+    Raises
+    ------
+    RuntimeError
+        If the import fails
+    """
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            env=env,
+            check=True,
+        )
+    except subprocess.CalledProcessError as e:
+        last = e.stderr.strip().splitlines()[-1:] or [f"exit status {e.returncode}"]
+        raise RuntimeError(f"import {module} failed: {last[0]}") from e
+    return parse_importtime(proc.stderr)
+
+
+def _scratch_env(scratch: Path) -> Dict[str, str]:
+    """Environment that keeps the backend's on-disk stores out of the real output directory."""
+    return {
+        **os.environ,
+        "SESSION_STORE_PATH": str(scratch / "sessions.db"),
+        "EVENT_LOG_DIR": str(scratch / "event_logs"),
+        "DATASET_CACHE": "false",
+    }
+
+
+def summarize(timings: List[ImportTiming], top: int = 8) -> Dict[str, object]:
+    """
+    Summarize import timings.
+
+    Returns
+    -------
+    dict
+        ``total_ms``, ``packages`` (top-level package, ms) and ``modules``
+        (module, self ms), the latter two sorted slowest first
+    """
+    total_us = sum(t.cumulative_us for t in timings if t.depth == 0)
+    by_package: Dict[str, int] = defaultdict(int)
+    for t in timings:
+        by_package[t.module.split(".")[0]] += t.self_us
+    packages = sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]
+    modules = sorted(timings, key=lambda t: t.self_us, reverse=True)[:top]
+    return {
+        "total_ms": total_us / 1000,
+        "packages": [(name, us / 1000) for name, us in packages],
+        "modules": [(t.module, t.self_us / 1000) for t in modules],
+    }
+
+
+def format_summary(label: str, module: str, summary: Dict[str, object], budget_ms: Optional[float] = None) -> str:
+    total = summary["total_ms"]
+    header = f"{label} (import {module}): {total:.1f} ms"
+    if budget_ms is not None:
+        header += f" [{'within' if total <= budget_ms else 'OVER'} {budget_ms:.0f} ms budget]"
+    lines = [header, "  by package:"]
+    lines += [f"    {ms:9.1f} ms  {name}" for name, ms in summary["packages"]]
+    lines.append("  slowest modules (self time):")
+    lines += [f"    {ms:9.1f} ms  {name}" for name, ms in summary["modules"]]
+    return "\n".join(lines)
+
+
+def profile_startup(top: int = 8) -> str:
+    """
+    Profile every entry point in :data:`PROFILE_TARGETS`.
+
+    Entry points that are not installed (e.g. the backend outside a source
+    checkout) are skipped. Each import runs with the backend's session store,
+    event logs and dataset cache redirected to a temporary directory, so
+    profiling leaves no state behind.
+
+    Returns
+    -------
+    str
+        Human-readable report
+    """
+    sections = []
+    with tempfile.TemporaryDirectory(prefix="ads-startup-") as scratch:
+        env = _scratch_env(Path(scratch))
+        for label, module in PROFILE_TARGETS:
+            if importlib.util.find_spec(module.split(".")[0]) is None:
+                sections.append(f"{label} (import {module}): not installed")
+                continue
+            try:
+                summary = summarize(profile_import(module, env=env), top=top)
+            except RuntimeError as e:
+                sections.append(f"{label}: {e}")
+                continue
+            budget = STARTUP_BUDGET_MS if label == "cli" else None
+            sections.append(format_summary(label, module, summary, budget))
+    return "\n\n".join(sections)
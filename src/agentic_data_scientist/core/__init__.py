@@ -1,19 +1,26 @@
 """Core API and session management for Agentic Data Scientist."""
 
-from agentic_data_scientist.core.api import DataScientist, FileInfo, Result, SessionConfig
-from agentic_data_scientist.core.events import (
-    CompletedEvent,
-    ErrorEvent,
-    FunctionCallEvent,
-    FunctionResponseEvent,
-    MessageEvent,
-    UsageEvent,
-    event_to_dict,
-)
+import importlib
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from agentic_data_scientist.core.agent_pool import AgentPool
+    from agentic_data_scientist.core.api import DataScientist, FileInfo, Result, SessionConfig
+    from agentic_data_scientist.core.events import (
+        CompletedEvent,
+        ErrorEvent,
+        FunctionCallEvent,
+        FunctionResponseEvent,
+        MessageEvent,
+        UsageEvent,
+        event_to_dict,
+    )
 
 
 __all__ = [
     "DataScientist",
+    "AgentPool",
     "Result",
     "SessionConfig",
     "FileInfo",
@@ -25,3 +32,28 @@ __all__ = [
     "UsageEvent",
     "event_to_dict",
 ]
+
+# Submodules are imported on first attribute access (see the package __init__)
+_LAZY_ATTRS = {
+    "DataScientist": "agentic_data_scientist.core.api",
+    "Result": "agentic_data_scientist.core.api",
+    "SessionConfig": "agentic_data_scientist.core.api",
+    "FileInfo": "agentic_data_scientist.core.api",
+    "AgentPool": "agentic_data_scientist.core.agent_pool",
+    "MessageEvent": "agentic_data_scientist.core.events",
+    "FunctionCallEvent": "agentic_data_scientist.core.events",
+    "FunctionResponseEvent": "agentic_data_scientist.core.events",
+    "CompletedEvent": "agentic_data_scientist.core.events",
+    "ErrorEvent": "agentic_data_scientist.core.events",
+    "UsageEvent": "agentic_data_scientist.core.events",
+    "event_to_dict": "agentic_data_scientist.core.events",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,153 @@
+"""
+Shared, pre-built agent graph for Agentic Data Scientist.
+
+Building the orchestrated ADK graph (``create_app``) loads every prompt and
+instantiates a dozen agents, which dominates the time from the start of a
+session to its first event. An :class:`AgentPool` builds the graph once, ahead
+of time, and hands the same graph and :class:`~google.adk.runners.Runner` to
+every session. Graphs are not tied to a directory (the tools read the
+session's ``working_dir`` from its state) and keep no per-run state on their
+agents (loop detection is per invocation), so concurrent sessions can share
+them; each session only adds its own entry to the shared session service.
+Sessions hand the graph back with :meth:`AgentPool.release` when they close.
+
+ADK is imported when the graph is built, so creating a pool (e.g. at backend
+import) stays cheap.
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+
+if TYPE_CHECKING:
+    from google.adk.apps import App
+    from google.adk.runners import Runner
+    from google.adk.sessions import InMemorySessionService
+
+
+logger = logging.getLogger(__name__)
+
+POOL_ENABLED = os.getenv("AGENT_POOL", "true").lower() in ("true", "1")
+
+
+@dataclass
+class PooledApp:
+    """A pre-built ADK app with its runner."""
+
+    app: "App"
+    runner: "Runner"
+
+
+class AgentPool:
+    """
+    Orchestrated agent graph shared by all sessions, behind one runner.
+
+    Parameters
+    ----------
+    mcp_servers : List[str], optional
+        MCP servers the shared graph is built with
+    """
+
+    def __init__(self, mcp_servers: Optional[List[str]] = None):
+        self.mcp_servers = mcp_servers
+        self.hits = 0
+        self.misses = 0
+        self.builds = 0
+        self.in_use = 0
+        self._pooled: Optional[PooledApp] = None
+        self._building: Optional[asyncio.Task] = None
+        self._session_service: Optional["InMemorySessionService"] = None
+        self._lock = threading.Lock()
+        # Default working directory of the graph; sessions always set their own
+        self._placeholder = tempfile.mkdtemp(prefix="agentic_ds_pool_")
+
+    @property
+    def session_service(self) -> "InMemorySessionService":
+        """Session service of the shared runner."""
+        # The graph is built in a worker thread; create the service exactly once
+        with self._lock:
+            if self._session_service is None:
+                from google.adk.sessions import InMemorySessionService
+
+                self._session_service = InMemorySessionService()
+            return self._session_service
+
+    def _build(self) -> PooledApp:
+        """Build the graph (blocking)."""
+        from google.adk.runners import Runner
+
+        from agentic_data_scientist.agents.adk import create_app
+
+        app = create_app(working_dir=self._placeholder, mcp_servers=self.mcp_servers)
+        return PooledApp(app=app, runner=Runner(app=app, session_service=self.session_service))
+
+    def _built(self, task: asyncio.Task) -> None:
+        self._building = None
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            logger.warning(f"Failed to build agent graph: {task.exception()}")
+            return
+        self._pooled = task.result()
+        self.builds += 1
+
+    def fill(self) -> None:
+        """Start building the graph in the background unless it is built or in progress."""
+        if self._pooled is None and self._building is None:
+            self._building = asyncio.create_task(asyncio.to_thread(self._build))
+            self._building.add_done_callback(self._built)
+
+    async def warm(self) -> None:
+        """Build the graph if needed and wait until it is ready."""
+        self.fill()
+        if self._building is not None:
+            await asyncio.gather(self._building, return_exceptions=True)
+
+    async def acquire(self) -> PooledApp:
+        """
+        Take the shared graph, waiting for its build if it is not ready.
+
+        Returns
+        -------
+        PooledApp
+            Graph and runner shared with other sessions; hand it back with
+            :meth:`release`
+        """
+        pooled = self._pooled
+        if pooled is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.fill()
+            # Concurrent first sessions wait for the same build; a failed build is
+            # raised here and retried by the next session
+            pooled = await asyncio.shield(self._building)
+        self.in_use += 1
+        return pooled
+
+    def release(self, pooled: PooledApp) -> None:
+        """Hand back a graph from :meth:`acquire` once its session is closed."""
+        self.in_use -= 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "ready": int(self._pooled is not None),
+            "building": int(self._building is not None),
+            "in_use": self.in_use,
+            "builds": self.builds,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    async def close(self) -> None:
+        """Wait for a pending build and drop the graph."""
+        if self._building is not None:
+            await asyncio.gather(self._building, return_exceptions=True)
+        self._pooled = None
+        shutil.rmtree(self._placeholder, ignore_errors=True)
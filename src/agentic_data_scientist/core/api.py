@@ -8,6 +8,7 @@ with optional conversation context and file handling.
 import asyncio
 import logging
 import os
+import shutil
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -21,15 +22,20 @@ from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types
 
+from agentic_data_scientist.core.agent_pool import AgentPool
 from agentic_data_scientist.core.events import (
     CompletedEvent,
     ErrorEvent,
+    FileCreatedEvent,
+    FileModifiedEvent,
     FunctionCallEvent,
     FunctionResponseEvent,
     MessageEvent,
     UsageEvent,
     event_to_dict,
 )
+from agentic_data_scientist.core.workspace import ManifestEntry, WorkspaceWatcher, build_manifest
+from agentic_data_scientist.tools.file_ops import WORKING_DIR_STATE_KEY, forget_session_cache
 
 
 # Load environment variables
@@ -71,6 +77,7 @@ class Result:
     files_created: List[str] = field(default_factory=list)
     duration: Optional[float] = None
     events_count: int = 0
+    manifest: List[ManifestEntry] = field(default_factory=list)
 
 
 class DataScientist:
@@ -92,6 +99,10 @@ class DataScientist:
     auto_cleanup : bool, optional
         Whether to automatically cleanup the working directory after completion.
         Defaults to False (files are preserved)
+    pool : AgentPool, optional
+        Pool holding the shared, pre-built ADK agent graph. Its runner and
+        session service are shared, so call :meth:`close` when the session is
+        done
     """
 
     def __init__(
@@ -100,6 +111,7 @@ class DataScientist:
         mcp_servers: Optional[List[str]] = None,
         working_dir: Optional[str] = None,
         auto_cleanup: Optional[bool] = None,
+        pool: Optional[AgentPool] = None,
     ):
         """Initialize Agentic Data Scientist core with configuration."""
         # Generate session ID
@@ -134,6 +146,11 @@ class DataScientist:
         self.app = None  # Will store App instance for ADK agents
         self.session_service = None
         self.runner = None
+        self._pool = pool
+        self._pooled = None
+
+        # Last artifact manifest by path; unchanged files keep their hash across runs
+        self._manifest: Dict[str, ManifestEntry] = {}
 
         logger.info(f"Initialized Agentic Data Scientist session: {self.session_id}")
         logger.info(f"Working directory: {self.working_dir}")
@@ -148,7 +165,12 @@ class DataScientist:
             from agentic_data_scientist.agents.adk import create_app
 
             # Create App only if not already present
-            if not self.app:
+            if not self.app and self._pool is not None and self._pool.mcp_servers == self.config.mcp_servers:
+                # Shared pre-built graph; the working directory reaches it through the session state
+                self._pooled = await self._pool.acquire()
+                self.app, self.runner = self._pooled.app, self._pooled.runner
+                self.session_service = self._pool.session_service
+            elif not self.app:
                 # Use to_thread for create_app as it does heavy prompt loading and directory creation
                 self.app = await asyncio.to_thread(
                     create_app,
@@ -161,7 +183,7 @@ class DataScientist:
             # (Claude code setup remains mostly the same but could benefit from similar pooling)
             # For simplicity, we keep it as is but ensure it's idempotent
             if not self.agent:
-                from agentic_data_scientist.agents.adk.utils import CODING_MODEL, CODING_MODEL_NAME
+                from agentic_data_scientist.agents.adk.utils import CODING_MODEL_NAME, get_model
                 from agentic_data_scientist.prompts import load_prompt
 
                 is_gemini_coding = CODING_MODEL_NAME.startswith(("gemini/", "google/", "gemini-"))
@@ -170,37 +192,20 @@ class DataScientist:
                     from google.adk.planners import BuiltInPlanner
                     from agentic_data_scientist.agents.adk.loop_detection import LoopDetectionAgent
                     from agentic_data_scientist.agents.adk.utils import get_generate_content_config, is_network_disabled
-                    from agentic_data_scientist.tools import (
-                        directory_tree, fetch_url, get_file_info,
-                        list_directory, read_file, read_media_file, search_files,
-                    )
+                    from agentic_data_scientist.tools import FILE_TOOLS, fetch_url
 
                     logger.info(f"[AgenticDS] Using Gemini-based simple agent for 'claude_code' mode: {CODING_MODEL_NAME}")
                     coding_prompt = await asyncio.to_thread(load_prompt, "coding_base")
-                    working_dir_str = str(self.working_dir)
-
-                    # Re-using bound methods logic...
-                    def read_file_bound(path: str, head: int = None, tail: int = None) -> str:
-                        return read_file(path, working_dir_str, head, tail)
-                    def read_media_file_bound(path: str) -> str:
-                        return read_media_file(path, working_dir_str)
-                    def list_directory_bound(path: str = ".", show_sizes: bool = False, sort_by: str = "name") -> str:
-                        return list_directory(path, working_dir_str, show_sizes, sort_by)
-                    def directory_tree_bound(path: str = ".", exclude_patterns: list = None) -> str:
-                        return directory_tree(path, working_dir_str, exclude_patterns)
-                    def search_files_bound(pattern: str, path: str = ".", exclude_patterns: list = None) -> str:
-                        return search_files(pattern, working_dir_str, path, exclude_patterns)
-                    def get_file_info_bound(path: str) -> str:
-                        return get_file_info(path, working_dir_str)
-
-                    tools = [read_file_bound, read_media_file_bound, list_directory_bound, directory_tree_bound, search_files_bound, get_file_info_bound]
+
+                    # The file tools read the working directory from the session state
+                    tools = list(FILE_TOOLS)
                     if not is_network_disabled(): tools.append(fetch_url)
 
                     self.agent = LoopDetectionAgent(
                         name="gemini_coding_agent",
                         description="A coding agent that uses Gemini to implement requests.",
                         instruction=coding_prompt,
-                        model=CODING_MODEL,
+                        model=get_model(CODING_MODEL_NAME),
                         tools=tools,
                         planner=BuiltInPlanner(thinking_config=types.ThinkingConfig(include_thoughts=True, thinking_budget=-1)),
                         generate_content_config=get_generate_content_config(temperature=0.0),
@@ -220,10 +225,12 @@ class DataScientist:
 
         app_name = self.app.name if self.app else "agentic_data_scientist"
         
-        # Only create session if it doesn't exist
+        # Only create session if it doesn't exist (get_session returns None for unknown IDs)
         try:
             self.session = await self.session_service.get_session(app_name=app_name, user_id="default_user", session_id=self.session_id)
-        except:
+        except Exception:
+            self.session = None
+        if self.session is None:
             self.session = await self.session_service.create_session(app_name=app_name, user_id="default_user", session_id=self.session_id)
 
         if not self.runner:
@@ -260,7 +267,10 @@ class DataScientist:
                 source_path = Path(content)
                 if not source_path.exists():
                     raise FileNotFoundError(f"Source file not found: {source_path}")
-                file_path.write_bytes(source_path.read_bytes())
+                # Files already streamed into user_data (e.g. by the backend) are used in place;
+                # anything else is copied in chunks rather than read into memory
+                if not (file_path.exists() and file_path.samefile(source_path)):
+                    shutil.copyfile(source_path, file_path)
                 size_kb = source_path.stat().st_size / 1024
             else:
                 raise TypeError(f"Invalid content type for {filename}: {type(content)}")
@@ -341,22 +351,20 @@ class DataScientist:
             # Set up agent if not already done
             await self._setup_agent()
 
-            # Initialize session state EARLY before any agent execution
-            # Get the session from session_service to ensure we're modifying the right instance
-            app_name = self.app.name if self.app else "agentic_data_scientist"
-            session = await self.session_service.get_session(
-                app_name=app_name, user_id="default_user", session_id=self.session_id
-            )
-
-            # Set state variables (state is mutable, changes persist automatically)
-            session.state["original_user_input"] = message
-            session.state["latest_user_input"] = message
+            # Initial session state, applied by the runner together with the user message
+            # before any agent runs (get_session returns a copy, so it cannot be edited in place)
+            state = {
+                "original_user_input": message,
+                "latest_user_input": message,
+                # Sandbox root for the file tools and coding agents
+                WORKING_DIR_STATE_KEY: str(self.working_dir.resolve()),
+            }
             # For Claude Code agent, also set implementation_task
             if self.config.agent_type == "claude_code":
-                session.state["implementation_task"] = message
+                state["implementation_task"] = message
 
-            logger.info(f"[API] Set session state keys: {list(session.state.keys())}")
-            logger.info(f"[API] implementation_task = {session.state.get('implementation_task', 'NOT SET')[:50]}...")
+            logger.info(f"[API] Set session state keys: {list(state.keys())}")
+            logger.info(f"[API] implementation_task = {state.get('implementation_task', 'NOT SET')[:50]}...")
 
             # Save files if provided
             file_info = self.save_files(files) if files else None
@@ -365,9 +373,9 @@ class DataScientist:
             full_prompt = self.prepare_prompt(message, file_info)
 
             if stream:
-                return self._stream_responses(full_prompt, start_time)
+                return self._stream_responses(full_prompt, start_time, state)
             else:
-                return await self._collect_responses(full_prompt, start_time)
+                return await self._collect_responses(full_prompt, start_time, state)
 
         except Exception as e:
             logger.error(f"Error in run_async: {e}", exc_info=True)
@@ -381,19 +389,90 @@ class DataScientist:
             else:
                 raise
 
-    async def _stream_responses(self, prompt: str, start_time: datetime) -> AsyncGenerator[Dict[str, Any], None]:
+    async def _build_manifest(self, stats: Optional[Dict[str, tuple]] = None) -> List[ManifestEntry]:
+        """Build the artifact manifest off the event loop, reusing hashes of unchanged files."""
+        manifest = await asyncio.to_thread(build_manifest, self.working_dir, stats, self._manifest)
+        self._manifest = {entry.path: entry for entry in manifest}
+        return manifest
+
+    async def _run_with_workspace_events(
+        self, prompt: str, watcher: WorkspaceWatcher, state: Optional[Dict[str, Any]] = None
+    ) -> AsyncGenerator[Any, None]:
+        """
+        Yield ADK events from the runner interleaved with the watcher's file events.
+
+        The runner is driven by a single task so its context stays consistent
+        across steps; it only advances once the previous event has been
+        consumed, so a slow consumer still slows the agent down.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+
+        async def pump():
+            try:
+                async for event in self.runner.run_async(
+                    user_id="default_user",
+                    session_id=self.session_id,
+                    new_message=types.Content(role="user", parts=[types.Part(text=prompt)]),
+                    state_delta=state,
+                ):
+                    consumed = loop.create_future()
+                    queue.put_nowait((event, consumed))
+                    await consumed
+            except Exception as e:
+                queue.put_nowait((e, None))
+            else:
+                queue.put_nowait((None, None))
+
+        async def on_file_event(event):
+            queue.put_nowait((event, None))
+
+        watcher.on_event = on_file_event
+        await watcher.start()
+        runner_task = asyncio.create_task(pump())
+        try:
+            while True:
+                item, consumed = await queue.get()
+                if isinstance(item, Exception):
+                    raise item
+                if item is None:
+                    break
+                yield item
+                if consumed is not None:
+                    consumed.set_result(None)
+
+            # Report whatever the watcher had not flushed yet, then anything written in the last debounce window
+            while not queue.empty():
+                item, _ = queue.get_nowait()
+                if isinstance(item, (FileCreatedEvent, FileModifiedEvent)):
+                    yield item
+            for item in await watcher.stop():
+                yield item
+        finally:
+            # Wait for the runner to unwind so agent subprocesses are shut down before we return
+            runner_task.cancel()
+            await asyncio.gather(runner_task, return_exceptions=True)
+            if watcher.running:
+                await watcher.stop()
+
+    async def _stream_responses(
+        self, prompt: str, start_time: datetime, state: Optional[Dict[str, Any]] = None
+    ) -> AsyncGenerator[Dict[str, Any], None]:
         """Stream responses from the agent."""
         event_count = 0
         message_event_number = 0
         responses = []
+        watcher = WorkspaceWatcher(self.working_dir)
 
         try:
-            # The initial state is already set in run_async before calling this method.
-            async for event in self.runner.run_async(
-                user_id="default_user",
-                session_id=self.session_id,
-                new_message=types.Content(role="user", parts=[types.Part(text=prompt)]),
-            ):
+            async for event in self._run_with_workspace_events(prompt, watcher, state):
+                # Artifacts reported by the workspace watcher
+                if isinstance(event, (FileCreatedEvent, FileModifiedEvent)):
+                    message_event_number += 1
+                    event.event_number = message_event_number
+                    yield event_to_dict(event)
+                    continue
+
                 event_count += 1
 
                 # Process event content
@@ -470,15 +549,9 @@ class DataScientist:
             # Calculate duration
             duration = (datetime.now() - start_time).total_seconds()
 
-            # Find created files (exclude hidden directories like .venv, .claude)
-            files_created = []
-            if self.working_dir.exists():
-                for file_path in self.working_dir.rglob('*'):
-                    if file_path.is_file() and 'user_data' not in file_path.parts:
-                        # Exclude hidden directories (starting with .)
-                        if not any(part.startswith('.') for part in file_path.parts):
-                            relative_path = file_path.relative_to(self.working_dir)
-                            files_created.append(str(relative_path))
+            # The watcher already knows every artifact (hidden dirs and user_data excluded)
+            manifest = await self._build_manifest(watcher.stats)
+            files_created = [entry.path for entry in manifest]
 
             # Final completed event
             completed_event = CompletedEvent(
@@ -487,6 +560,7 @@ class DataScientist:
                 total_events=message_event_number,
                 files_created=files_created,
                 files_count=len(files_created),
+                manifest=[entry.to_dict() for entry in manifest],
                 timestamp=datetime.now().strftime("%H:%M:%S.%f")[:-3],
             )
             yield event_to_dict(completed_event)
@@ -496,17 +570,19 @@ class DataScientist:
             error_event = ErrorEvent(content=str(e), timestamp=datetime.now().strftime("%H:%M:%S.%f")[:-3])
             yield event_to_dict(error_event)
 
-    async def _collect_responses(self, prompt: str, start_time: datetime) -> Result:
+    async def _collect_responses(
+        self, prompt: str, start_time: datetime, state: Optional[Dict[str, Any]] = None
+    ) -> Result:
         """Collect all responses and return a complete result."""
         responses = []
         event_count = 0
 
         try:
-            # The initial state is already set in run_async before calling this method.
             async for event in self.runner.run_async(
                 user_id="default_user",
                 session_id=self.session_id,
                 new_message=types.Content(role="user", parts=[types.Part(text=prompt)]),
+                state_delta=state,
             ):
                 event_count += 1
 
@@ -523,23 +599,17 @@ class DataScientist:
             # Calculate duration
             duration = (datetime.now() - start_time).total_seconds()
 
-            # Find created files (exclude hidden directories like .venv, .claude)
-            files_created = []
-            if self.working_dir.exists():
-                for file_path in self.working_dir.rglob('*'):
-                    if file_path.is_file() and 'user_data' not in file_path.parts:
-                        # Exclude hidden directories (starting with .)
-                        if not any(part.startswith('.') for part in file_path.parts):
-                            relative_path = file_path.relative_to(self.working_dir)
-                            files_created.append(str(relative_path))
+            # Single pruned pass over the workspace (hidden dirs and user_data excluded)
+            manifest = await self._build_manifest()
 
             return Result(
                 session_id=self.session_id,
                 status="completed",
                 response="\n".join(responses),
-                files_created=files_created,
+                files_created=[entry.path for entry in manifest],
                 duration=duration,
                 events_count=event_count,
+                manifest=manifest,
             )
 
         except Exception as e:
@@ -571,6 +641,22 @@ class DataScientist:
         """
         return asyncio.run(self.run_async(message, files, stream=False, **kwargs))
 
+    async def close(self):
+        """Delete this session from the session service, return a shared graph and drop the tool cache."""
+        forget_session_cache(self.session_id)
+        if self.session_service is not None:
+            app_name = self.app.name if self.app else "agentic_data_scientist"
+            try:
+                await self.session_service.delete_session(
+                    app_name=app_name, user_id="default_user", session_id=self.session_id
+                )
+            except Exception as e:
+                logger.warning(f"Failed to delete session {self.session_id}: {e}")
+        if self._pooled is not None:
+            self._pool.release(self._pooled)
+            self._pooled = None
+        self.agent = self.app = self.runner = self.session_service = None
+
     def cleanup(self):
         """Clean up working directory if auto_cleanup is enabled."""
         if not self.auto_cleanup:
@@ -578,8 +664,6 @@ class DataScientist:
             return
 
         if self.working_dir and self.working_dir.exists():
-            import shutil
-
             try:
                 shutil.rmtree(self.working_dir)
                 logger.info(f"Cleaned up working directory: {self.working_dir}")
@@ -600,4 +684,5 @@ class DataScientist:
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
+        await self.close()
         self.cleanup()
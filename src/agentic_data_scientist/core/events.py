@@ -61,6 +61,16 @@ class FileCreatedEvent(BaseEvent):
     event_number: Optional[int] = None
 
 
+@dataclass
+class FileModifiedEvent(BaseEvent):
+    """File modification notification event."""
+
+    type: Literal["file_modified"] = "file_modified"
+    file_path: str = ""
+    file_size: int = 0
+    event_number: Optional[int] = None
+
+
 @dataclass
 class UsageEvent(BaseEvent):
     """Token usage metadata event."""
@@ -98,6 +108,7 @@ class CompletedEvent(BaseEvent):
     total_events: int = 0
     files_created: List[str] = field(default_factory=list)
     files_count: int = 0
+    manifest: List[Dict[str, Any]] = field(default_factory=list)
 
 
 # Type union for all event types
@@ -106,6 +117,7 @@ StreamingEvent = (
     | FunctionCallEvent
     | FunctionResponseEvent
     | FileCreatedEvent
+    | FileModifiedEvent
     | UsageEvent
     | KeepaliveEvent
     | ErrorEvent
@@ -119,6 +131,7 @@ EVENT_TYPE_MAP = {
     "function_call": FunctionCallEvent,
     "function_response": FunctionResponseEvent,
     "file_created": FileCreatedEvent,
+    "file_modified": FileModifiedEvent,
     "usage": UsageEvent,
     "keepalive": KeepaliveEvent,
     "error": ErrorEvent,
@@ -0,0 +1,344 @@
+"""
+Shared LLM HTTP clients for Agentic Data Scientist.
+
+Every ``LiteLlm`` model and the event-compression summarizer send their
+requests through a :class:`ProviderPool`, one per provider (``openrouter``,
+``gemini``, ...). A pool keeps one persistent HTTP/2 connection pool per
+event loop, so requests reuse open TLS connections instead of setting up a
+client per call, and bounds the number of requests in flight to the provider
+with a semaphore (per event loop, i.e. per backend or CLI process). Providers
+LiteLLM serves through its own httpx handler
+(:data:`SHARED_CONNECTION_PROVIDERS`) get the shared connections; others
+(e.g. ``openai``, which uses the OpenAI SDK client) get the concurrency limit
+only. LiteLLM is imported only when a client is first requested.
+
+Non-streamed requests can be answered from the
+:class:`~agentic_data_scientist.core.response_cache.ResponseCache` (``LLM_CACHE``).
+Requests are also admitted by the :class:`~agentic_data_scientist.core.rate_limit.RateLimiter`
+of their ``(provider, model)``. Retries (``num_retries``) are done here rather
+than inside LiteLLM, so every attempt passes the limiter again and a 429
+backs off all callers of the model together.
+"""
+
+import asyncio
+import functools
+import importlib.util
+import os
+import random
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from agentic_data_scientist.core.rate_limit import DEFAULT_RPM, DEFAULT_TPM, RateLimiter, provider_limit
+from agentic_data_scientist.core.response_cache import ResponseCache, ResponseCacheMiss, request_key
+
+
+MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+DEFAULT_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+# HTTP/2 needs the optional ``h2`` package; fall back to pooled HTTP/1.1 without it
+HTTP2 = os.getenv("LLM_HTTP2", "1").lower() in ("1", "true", "yes") and importlib.util.find_spec("h2") is not None
+KEEPALIVE_SECONDS = 60.0
+
+MAX_BACKOFF_SECONDS = 30.0
+
+# LiteLLM providers that accept an ``AsyncHTTPHandler`` as ``client``
+SHARED_CONNECTION_PROVIDERS = frozenset({"openrouter", "gemini", "anthropic"})
+
+
+def provider_concurrency(provider: str) -> int:
+    """Concurrency limit for a provider: ``LLM_MAX_CONCURRENCY_<PROVIDER>`` or the default."""
+    return provider_limit("LLM_MAX_CONCURRENCY", provider, DEFAULT_CONCURRENCY)
+
+
+def estimate_tokens(messages: Any) -> int:
+    """Rough prompt size (4 characters per token) for the TPM budget."""
+    return sum(len(str(message)) for message in messages or ()) // 4 + 1
+
+
+def _total_tokens(response: Any) -> Optional[int]:
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", None)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None) or getattr(
+        error, "litellm_response_headers", None
+    )
+    try:
+        return float(headers.get("retry-after")) if headers else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff(attempt: int) -> float:
+    return min(MAX_BACKOFF_SECONDS, 2.0**attempt) * random.uniform(0.5, 1.0)
+
+
+def provider_for(model_name: str, custom_llm_provider: Optional[str] = None) -> str:
+    """Provider key of a model: the explicit LiteLLM provider or the one LiteLLM infers."""
+    if custom_llm_provider:
+        return custom_llm_provider
+    if "/" in model_name:
+        # LiteLLM's "<provider>/<model>" convention
+        return model_name.split("/", 1)[0]
+    import litellm
+
+    try:
+        return litellm.get_llm_provider(model_name)[1]
+    except Exception:
+        return "default"
+
+
+def _transport() -> Any:
+    import httpx
+
+    return httpx.AsyncHTTPTransport(
+        http2=HTTP2,
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_SECONDS,
+        ),
+        proxy=os.getenv("HTTPS_PROXY") or os.getenv("https_proxy") or None,
+    )
+
+
+@dataclass
+class _LoopState:
+    handler: Any  # litellm AsyncHTTPHandler
+    semaphore: asyncio.Semaphore
+
+
+class ProviderPool:
+    """
+    Connection pool and concurrency limit for one LLM provider.
+
+    httpx connections and asyncio semaphores belong to the event loop that
+    created them, so each loop the pool is used from gets its own client;
+    the statistics cover all of them.
+
+    Parameters
+    ----------
+    provider : str
+        Provider key (e.g. ``"openrouter"``)
+    max_concurrency : int
+        Requests allowed in flight at once
+    """
+
+    def __init__(self, provider: str, max_concurrency: int):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.provider = provider
+        self.max_concurrency = max_concurrency
+        self.requests = 0
+        self.active = 0
+        self.waiting = 0
+        self.peak_active = 0
+        self.clients_created = 0
+        self.retries = 0
+        self._loops: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(loop)
+        if state is None:
+            from litellm.llms.custom_httpx.http_handler import AsyncHTTPHandler
+
+            handler = AsyncHTTPHandler(transport=_transport(), client_alias=f"agentic_ds_{self.provider}")
+            state = _LoopState(handler=handler, semaphore=asyncio.Semaphore(self.max_concurrency))
+            self._loops[loop] = state
+            self.clients_created += 1
+        return state
+
+    def handler(self) -> Any:
+        """LiteLLM HTTP handler for the running event loop."""
+        return self._state().handler
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one of the provider's concurrency slots."""
+        semaphore = self._state().semaphore
+        self.waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.requests += 1
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+        try:
+            yield
+        finally:
+            self.active -= 1
+            semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "active": self.active,
+            "waiting": self.waiting,
+            "peak_active": self.peak_active,
+            "requests": self.requests,
+            "retries": self.retries,
+            "clients": len(self._loops),
+            "clients_created": self.clients_created,
+            "http2": HTTP2,
+        }
+
+    async def aclose(self) -> None:
+        """Close the client of the running event loop."""
+        state = self._loops.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            await state.handler.close()
+
+
+@functools.lru_cache(maxsize=None)
+def _pooled_client_class() -> type:
+    """ADK ``LiteLLMClient`` subclass routing calls through a provider pool (imports litellm)."""
+    import litellm
+    from google.adk.models.lite_llm import LiteLLMClient
+
+    retryable = (
+        litellm.RateLimitError,
+        litellm.Timeout,
+        litellm.APIConnectionError,
+        litellm.InternalServerError,
+        litellm.ServiceUnavailableError,
+    )
+
+    class PooledLiteLLMClient(LiteLLMClient):
+        def __init__(self, registry: "ClientRegistry", provider: str):
+            self.registry = registry
+            self.pool = registry.pool(provider)
+
+        async def acompletion(self, model, messages, tools, **kwargs):
+            retries = kwargs.pop("num_retries", None) or 0
+            cache = self.registry.cache
+            key = None
+            if cache.enabled:
+                if kwargs.get("stream"):
+                    if cache.mode == "replay":
+                        raise ResponseCacheMiss("Streamed LLM requests are not recorded and cannot be replayed")
+                elif cache.reads(kwargs) or cache.stores(kwargs):
+                    key = request_key(model, messages, tools, kwargs)
+                    cached = await asyncio.to_thread(cache.get, key) if cache.reads(kwargs) else None
+                    if cached is not None:
+                        return litellm.ModelResponse(**cached)
+
+            if self.pool.provider in SHARED_CONNECTION_PROVIDERS:
+                kwargs.setdefault("client", self.pool.handler())
+            limiter = self.registry.limiter(self.pool.provider, model)
+            estimate = estimate_tokens(messages)
+            if kwargs.get("stream"):
+                return self._stream(limiter, estimate, retries, model, messages, tools, kwargs)
+
+            for attempt in range(retries + 1):
+                async with limiter.admit(estimate) as admission, self.pool.slot():
+                    try:
+                        response = await super().acompletion(model, messages, tools, **kwargs)
+                    except retryable as e:
+                        if attempt == retries:
+                            raise
+                        delay = self._on_error(admission, e, attempt)
+                    else:
+                        admission.succeeded(_total_tokens(response))
+                        break
+                # Back off outside the slot so other requests can use it
+                await asyncio.sleep(delay)
+
+            if key is not None and cache.stores(kwargs):
+                await asyncio.to_thread(cache.put, key, response.model_dump())
+            return response
+
+        async def _stream(self, limiter, estimate, retries, model, messages, tools, kwargs):
+            # A streamed request holds its admission until the stream is consumed;
+            # it is retried only if it fails before the first chunk
+            for attempt in range(retries + 1):
+                async with limiter.admit(estimate) as admission, self.pool.slot():
+                    try:
+                        stream = await super().acompletion(model, messages, tools, **kwargs)
+                    except retryable as e:
+                        if attempt == retries:
+                            raise
+                        delay = self._on_error(admission, e, attempt)
+                    else:
+                        tokens = None
+                        async for chunk in stream:
+                            tokens = _total_tokens(chunk) or tokens
+                            yield chunk
+                        admission.succeeded(tokens)
+                        return
+                await asyncio.sleep(delay)
+
+        def _on_error(self, admission, error, attempt) -> float:
+            self.pool.retries += 1
+            if isinstance(error, litellm.RateLimitError):
+                return admission.rate_limited(_retry_after(error))
+            return _backoff(attempt)
+
+    return PooledLiteLLMClient
+
+
+class ClientRegistry:
+    """Process-wide provider pools and the ADK clients bound to them."""
+
+    def __init__(self):
+        self._pools: Dict[str, ProviderPool] = {}
+        self._clients: Dict[str, Any] = {}
+        self._limiters: Dict[Tuple[str, str], RateLimiter] = {}
+        self._cache: Optional[ResponseCache] = None
+
+    @property
+    def cache(self) -> ResponseCache:
+        """LLM response cache, configured from the environment on first use."""
+        if self._cache is None:
+            self._cache = ResponseCache()
+        return self._cache
+
+    @cache.setter
+    def cache(self, cache: ResponseCache) -> None:
+        self._cache = cache
+
+    def pool(self, provider: str) -> ProviderPool:
+        if provider not in self._pools:
+            self._pools[provider] = ProviderPool(provider, provider_concurrency(provider))
+        return self._pools[provider]
+
+    def client(self, provider: str) -> Any:
+        """
+        ADK ``LiteLLMClient`` for a provider, for ``LiteLlm(..., llm_client=...)``.
+
+        Parameters
+        ----------
+        provider : str
+            Provider key (e.g. ``"openrouter"``, ``"gemini"``)
+
+        Returns
+        -------
+        LiteLLMClient
+            Client shared by every model of the provider
+        """
+        if provider not in self._clients:
+            self._clients[provider] = _pooled_client_class()(self, provider)
+        return self._clients[provider]
+
+    def limiter(self, provider: str, model: str) -> RateLimiter:
+        """Rate limiter shared by all calls to ``model`` through ``provider``."""
+        key = (provider, model)
+        if key not in self._limiters:
+            self._limiters[key] = RateLimiter(
+                max_concurrency=provider_concurrency(provider),
+                rpm=provider_limit("LLM_RPM", provider, DEFAULT_RPM),
+                tpm=provider_limit("LLM_TPM", provider, DEFAULT_TPM),
+            )
+        return self._limiters[key]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        stats = {provider: pool.stats() for provider, pool in self._pools.items()}
+        for (provider, model), limiter in self._limiters.items():
+            stats.setdefault(provider, {}).setdefault("models", {})[model] = limiter.stats()
+        return stats
+
+
+registry = ClientRegistry()
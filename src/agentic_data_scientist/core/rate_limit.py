@@ -0,0 +1,223 @@
+"""
+Process-wide rate limiting for LLM calls.
+
+Every LLM request is admitted by the :class:`RateLimiter` of its
+``(provider, model)``, which combines
+
+* token buckets for requests per minute and tokens per minute
+  (``LLM_RPM`` / ``LLM_TPM``, overridable per provider as
+  ``LLM_RPM_<PROVIDER>`` / ``LLM_TPM_<PROVIDER>``; 0 disables a bucket), and
+* an AIMD concurrency window: each success grows the window by ``1/window``,
+  a 429 halves it and pauses admissions for the server's ``Retry-After``, and
+  a latency far above the running average shrinks it by a quarter.
+
+Sessions calling the same model therefore back off together after a 429
+instead of each retrying on its own schedule.
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+
+DEFAULT_RPM = int(os.getenv("LLM_RPM", "0"))
+DEFAULT_TPM = int(os.getenv("LLM_TPM", "0"))
+# Pause applied after a 429 without a Retry-After header
+RATE_LIMIT_PAUSE_SECONDS = 5.0
+# A response slower than this multiple of the average latency counts as congestion
+LATENCY_FACTOR = 3.0
+LATENCY_ALPHA = 0.2
+MIN_LATENCY_SAMPLES = 5
+
+
+def provider_limit(name: str, provider: str, default: int) -> int:
+    """Per-provider override ``<name>_<PROVIDER>`` of a limit, or ``default``."""
+    return int(os.getenv(f"{name}_{provider.upper()}", default))
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at ``per_minute / 60`` tokens a second.
+
+    ``take`` may overdraw the bucket by a single large request (so requests
+    bigger than the capacity still run); ``adjust`` settles the difference
+    between an estimate and the actual cost afterwards.
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens can be taken."""
+        self._refill()
+        needed = min(amount, self.capacity) - self.tokens
+        return max(0.0, needed / self.rate)
+
+    async def take(self, amount: float) -> None:
+        while (wait := self.delay(amount)) > 0:
+            await asyncio.sleep(wait)
+        self.tokens -= amount
+
+    def adjust(self, amount: float) -> None:
+        """Charge (positive) or refund (negative) tokens; the balance may go negative."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class RateLimiter:
+    """
+    Admission control for one ``(provider, model)``.
+
+    Parameters
+    ----------
+    max_concurrency : int
+        Upper bound of the adaptive concurrency window
+    rpm : int, optional
+        Requests per minute (0: unlimited)
+    tpm : int, optional
+        Tokens per minute (0: unlimited)
+    """
+
+    def __init__(self, max_concurrency: int, rpm: int = 0, tpm: int = 0):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.window = float(max_concurrency)
+        self.requests = TokenBucket(rpm) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm) if tpm > 0 else None
+        self.active = 0
+        self.admitted = 0
+        self.rate_limited = 0
+        self.latency: Optional[float] = None
+        self._samples = 0
+        self._paused_until = 0.0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def limit(self) -> int:
+        return max(1, int(self.window))
+
+    def _wake(self) -> None:
+        free = self.limit - self.active
+        while self._waiters and free > 0:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # Waiters may belong to another event loop (e.g. one per CLI run)
+                waiter.get_loop().call_soon_threadsafe(_resolve, waiter)
+                free -= 1
+
+    async def _acquire(self) -> None:
+        while self.active >= self.limit or self._waiters:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                self._wake()
+                raise
+            if self.active < self.limit:
+                break
+        self.active += 1
+
+    def _release(self) -> None:
+        self.active -= 1
+        self._wake()
+
+    @asynccontextmanager
+    async def admit(self, estimated_tokens: int = 0) -> AsyncIterator["Admission"]:
+        """
+        Wait for a concurrency slot and rate budget; release the slot on exit.
+
+        Parameters
+        ----------
+        estimated_tokens : int, optional
+            Expected token cost, charged to the TPM bucket up front and
+            corrected with :meth:`Admission.succeeded`
+        """
+        await self._acquire()
+        try:
+            while (pause := self._paused_until - time.monotonic()) > 0:
+                await asyncio.sleep(pause)
+            if self.requests is not None:
+                await self.requests.take(1)
+            if self.tokens is not None and estimated_tokens:
+                await self.tokens.take(estimated_tokens)
+            self.admitted += 1
+            yield Admission(self, estimated_tokens)
+        finally:
+            self._release()
+
+    def on_success(self, latency: float) -> None:
+        """Additive increase, or decrease if ``latency`` signals congestion."""
+        congested = (
+            self.latency is not None
+            and self._samples >= MIN_LATENCY_SAMPLES
+            and latency > LATENCY_FACTOR * self.latency
+        )
+        self.latency = latency if self.latency is None else (1 - LATENCY_ALPHA) * self.latency + LATENCY_ALPHA * latency
+        self._samples += 1
+        if congested:
+            self.window = max(1.0, self.window * 0.75)
+        else:
+            self.window = min(float(self.max_concurrency), self.window + 1.0 / self.window)
+        self._wake()
+
+    def on_rate_limited(self, retry_after: Optional[float] = None) -> float:
+        """
+        Multiplicative decrease and a pause for all admissions.
+
+        Returns
+        -------
+        float
+            Seconds until admissions resume
+        """
+        self.rate_limited += 1
+        self.window = max(1.0, self.window / 2)
+        pause = retry_after if retry_after is not None else RATE_LIMIT_PAUSE_SECONDS
+        self._paused_until = max(self._paused_until, time.monotonic() + pause)
+        return pause
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "window": round(self.window, 2),
+            "active": self.active,
+            "waiting": len(self._waiters),
+            "admitted": self.admitted,
+            "rate_limited": self.rate_limited,
+            "latency_ms": round(self.latency * 1000) if self.latency is not None else None,
+            "paused_for": round(max(0.0, self._paused_until - time.monotonic()), 2),
+        }
+
+
+class Admission:
+    """One admitted request; report its outcome so the limiter can adapt."""
+
+    def __init__(self, limiter: RateLimiter, estimated_tokens: int):
+        self.limiter = limiter
+        self.estimated_tokens = estimated_tokens
+        self.started = time.monotonic()
+
+    def succeeded(self, tokens_used: Optional[int] = None) -> None:
+        self.limiter.on_success(time.monotonic() - self.started)
+        if self.limiter.tokens is not None and tokens_used is not None:
+            self.limiter.tokens.adjust(tokens_used - self.estimated_tokens)
+
+    def rate_limited(self, retry_after: Optional[float] = None) -> float:
+        return self.limiter.on_rate_limited(retry_after)
+
+
+def _resolve(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
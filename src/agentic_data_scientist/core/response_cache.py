@@ -0,0 +1,185 @@
+"""
+Content-addressed cache of LLM responses.
+
+A response is stored under the SHA-256 of its request: model, messages,
+tools, response format and generation parameters (credentials, clients and
+retry settings are left out). Entries are JSON files on disk, so they are
+shared by processes and survive restarts; entries older than the TTL are
+dropped on read and the least recently used ones are evicted beyond the
+size limit.
+
+``LLM_CACHE`` selects the mode:
+
+``off`` (default)
+    No caching.
+``on``
+    Serve and store deterministic requests (``temperature`` 0).
+``record``
+    Call the model for every request and store every response.
+``replay``
+    Serve every request from the cache; a miss raises
+    :class:`ResponseCacheMiss`. Together with ``record`` this runs the whole
+    workflow offline, e.g. to benchmark ``create_app`` without API cost.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+MODES = ("off", "on", "record", "replay")
+CACHE_MODE = os.getenv("LLM_CACHE", "off").lower()
+CACHE_DIR = Path(os.getenv("LLM_CACHE_DIR", str(Path.home() / ".cache" / "agentic-data-scientist" / "llm")))
+CACHE_TTL = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+
+# Request arguments that do not change the response
+_UNKEYED = frozenset(
+    {"client", "api_key", "num_retries", "timeout", "stream", "stream_options", "metadata", "drop_params"}
+)
+
+
+class ResponseCacheMiss(RuntimeError):
+    """Raised in replay mode for a request that was never recorded."""
+
+
+def _jsonable(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        return value.model_dump(exclude_none=True)
+    return str(value)
+
+
+def request_key(model: str, messages: Any, tools: Any, params: Dict[str, Any]) -> str:
+    """SHA-256 of the canonical JSON of a completion request."""
+    request = {
+        "model": model,
+        "messages": messages,
+        "tools": tools,
+        "params": {k: v for k, v in params.items() if k not in _UNKEYED},
+    }
+    canonical = json.dumps(request, sort_keys=True, default=_jsonable, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Disk-backed LLM response cache.
+
+    Parameters
+    ----------
+    directory : Path, optional
+        Where entries are stored (default: ``LLM_CACHE_DIR``)
+    mode : str, optional
+        One of :data:`MODES` (default: ``LLM_CACHE``)
+    ttl : float, optional
+        Seconds an entry stays valid; 0 keeps entries forever
+    max_entries : int, optional
+        Entries kept before the least recently used are evicted
+    """
+
+    def __init__(
+        self,
+        directory: Path = CACHE_DIR,
+        mode: str = CACHE_MODE,
+        ttl: float = CACHE_TTL,
+        max_entries: int = CACHE_MAX_ENTRIES,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"LLM cache mode must be one of {', '.join(MODES)}, got {mode!r}")
+        self.directory = Path(directory)
+        self.mode = mode
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._entries: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def reads(self, params: Dict[str, Any]) -> bool:
+        """Whether a request with these generation parameters is served from the cache."""
+        if self.mode == "replay":
+            return True
+        return self.mode == "on" and params.get("temperature") == 0
+
+    def stores(self, params: Dict[str, Any]) -> bool:
+        """Whether the response to a request with these parameters is stored."""
+        return self.mode == "record" or (self.mode == "on" and self.reads(params))
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached response for ``key``, or None (raises in replay mode)."""
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            entry = None
+        # Recordings replayed for benchmarks do not expire
+        expires = self.ttl and self.mode != "replay"
+        if entry is not None and expires and time.time() - entry["created"] > self.ttl:
+            path.unlink(missing_ok=True)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            if self.mode == "replay":
+                raise ResponseCacheMiss(f"No recorded LLM response for request {key[:12]} in {self.directory}")
+            return None
+        self.hits += 1
+        # The file's mtime is its last use, for LRU eviction
+        os.utime(path)
+        return entry["response"]
+
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps({"created": time.time(), "response": response}, default=str), encoding="utf-8")
+        existed = path.exists()
+        os.replace(tmp, path)
+        self.writes += 1
+        with self._lock:
+            if self._entries is None:
+                self._entries = sum(1 for _ in self.directory.glob("*/*.json"))
+            elif not existed:
+                self._entries += 1
+            if self._entries > self.max_entries:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries down to 90% of ``max_entries``."""
+        entries = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+        entries.sort()
+        excess = len(entries) - int(self.max_entries * 0.9)
+        for _, path in entries[: max(0, excess)]:
+            path.unlink(missing_ok=True)
+            self.evictions += 1
+        self._entries = len(entries) - max(0, excess)
+        logger.info(f"[LLMCache] Evicted {max(0, excess)} entries from {self.directory}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,264 @@
+"""
+Workspace watcher for Agentic Data Scientist.
+
+Watches a session's working directory while an agent runs and reports
+artifacts as they appear, so clients receive ``file_created`` and
+``file_modified`` events instead of polling for new files. Also builds the
+end-of-run artifact manifest (path, size, mtime, SHA-256).
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import watchfiles
+
+from agentic_data_scientist.core.events import FileCreatedEvent, FileModifiedEvent
+
+
+logger = logging.getLogger(__name__)
+
+# Changes are batched for this long; a file written in several chunks yields one event per window
+DEBOUNCE_MS = int(os.getenv("WORKSPACE_WATCH_DEBOUNCE_MS", "500"))
+HASH_CHUNK_SIZE = 1024 * 1024
+
+FileEvent = FileCreatedEvent | FileModifiedEvent
+
+
+def is_artifact(rel_parts: Tuple[str, ...]) -> bool:
+    """Whether a workspace-relative path is an agent output (not user data, not hidden)."""
+    return bool(rel_parts) and "user_data" not in rel_parts and not any(p.startswith(".") for p in rel_parts)
+
+
+@dataclass
+class ManifestEntry:
+    """One artifact in a workspace manifest."""
+
+    path: str
+    size: int
+    mtime: float
+    sha256: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def scan_artifacts(root: Path, base: Optional[Path] = None) -> Dict[str, Tuple[int, float]]:
+    """
+    Single ``os.scandir`` pass over the artifacts under ``root``.
+
+    Hidden directories (``.venv``, ``.claude``, ...) and ``user_data`` are
+    pruned before descending, so their contents are never listed or stat'ed.
+
+    Parameters
+    ----------
+    root : Path
+        Directory to scan
+    base : Path, optional
+        Directory the returned paths are relative to (default: ``root``)
+
+    Returns
+    -------
+    Dict[str, Tuple[int, float]]
+        POSIX relative path -> ``(size, mtime)``
+    """
+    base = base or root
+    found = {}
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.name.startswith(".") or entry.name == "user_data":
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(Path(entry.path))
+                        elif entry.is_file():
+                            st = entry.stat()
+                            found[Path(entry.path).relative_to(base).as_posix()] = (st.st_size, st.st_mtime)
+                    except OSError:
+                        continue
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+    return found
+
+
+def _sha256(path: Path) -> Optional[str]:
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def build_manifest(
+    working_dir: Path,
+    stats: Optional[Dict[str, Tuple[int, float]]] = None,
+    previous: Optional[Dict[str, ManifestEntry]] = None,
+) -> List[ManifestEntry]:
+    """
+    Build the artifact manifest of a workspace.
+
+    Parameters
+    ----------
+    working_dir : Path
+        Workspace root
+    stats : Dict[str, Tuple[int, float]], optional
+        Result of a :func:`scan_artifacts` pass already made (e.g. by a
+        :class:`WorkspaceWatcher`); the directory is scanned if omitted
+    previous : Dict[str, ManifestEntry], optional
+        Earlier manifest entries by path; hashes are reused for files whose
+        size and mtime are unchanged
+
+    Returns
+    -------
+    List[ManifestEntry]
+        Entries sorted by path
+    """
+    working_dir = Path(working_dir)
+    if stats is None:
+        stats = scan_artifacts(working_dir)
+    previous = previous or {}
+    manifest = []
+    for rel in sorted(stats):
+        size, mtime = stats[rel]
+        known = previous.get(rel)
+        if known is not None and (known.size, known.mtime) == (size, mtime) and known.sha256:
+            sha256 = known.sha256
+        else:
+            sha256 = _sha256(working_dir / rel)
+        manifest.append(ManifestEntry(path=rel, size=size, mtime=mtime, sha256=sha256))
+    return manifest
+
+
+class WorkspaceWatcher:
+    """
+    Track the artifacts in a working directory during an agent run.
+
+    Parameters
+    ----------
+    working_dir : Path
+        Directory to watch (recursively)
+    on_event : Callable[[FileEvent], Awaitable[None]], optional
+        Called for every file created or modified while the watcher runs
+    debounce_ms : int, optional
+        Window in which filesystem changes are grouped into one batch
+    """
+
+    def __init__(
+        self,
+        working_dir: Path,
+        on_event: Optional[Callable[[FileEvent], Awaitable[None]]] = None,
+        debounce_ms: int = DEBOUNCE_MS,
+    ):
+        self.working_dir = Path(working_dir).absolute()
+        self.on_event = on_event
+        self.debounce_ms = debounce_ms
+        self._files: Dict[str, Tuple[int, float]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    @property
+    def files(self) -> List[str]:
+        """Relative paths of all artifacts currently in the workspace."""
+        return sorted(self._files)
+
+    @property
+    def stats(self) -> Dict[str, Tuple[int, float]]:
+        """``(size, mtime)`` of every artifact, for :func:`build_manifest`."""
+        return dict(self._files)
+
+    async def start(self) -> None:
+        """Record the existing artifacts and start watching for new ones."""
+        self._stop = asyncio.Event()
+        self._task = asyncio.create_task(self._watch())
+        snapshot = await asyncio.to_thread(scan_artifacts, self.working_dir)
+        # Changes the watcher already reported win over the snapshot
+        self._files = {**snapshot, **self._files}
+
+    async def stop(self) -> List[FileEvent]:
+        """
+        Stop watching.
+
+        Returns events for changes made in the final debounce window, which
+        the watcher had not reported yet.
+        """
+        if self._task is None:
+            return []
+        self._stop.set()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        current = await asyncio.to_thread(scan_artifacts, self.working_dir)
+        return self._diff(current, full=True)
+
+    def _diff(self, stats: Dict[str, Optional[Tuple[int, float]]], full: bool = False) -> List[FileEvent]:
+        """Apply new ``(size, mtime)`` stats (None = gone) and return the resulting events."""
+        events = []
+        if full:
+            for rel in set(self._files) - set(stats):
+                stats[rel] = None
+        for rel, stat in sorted(stats.items(), key=lambda item: item[0]):
+            previous = self._files.get(rel)
+            if stat is None:
+                self._files.pop(rel, None)
+            elif previous is None:
+                self._files[rel] = stat
+                events.append(FileCreatedEvent(file_path=rel, file_size=stat[0]))
+            elif previous != stat:
+                self._files[rel] = stat
+                events.append(FileModifiedEvent(file_path=rel, file_size=stat[0]))
+        return events
+
+    def _stat_changes(self, paths: List[str]) -> Dict[str, Optional[Tuple[int, float]]]:
+        stats: Dict[str, Optional[Tuple[int, float]]] = {}
+        for path in paths:
+            full = Path(path)
+            rel = full.relative_to(self.working_dir).as_posix()
+            try:
+                st = full.stat()
+            except OSError:
+                stats[rel] = None
+                # A removed directory takes its files with it
+                stats.update(dict.fromkeys((f for f in self._files if f.startswith(rel + "/")), None))
+                continue
+            if full.is_dir():
+                # A directory moved in reports only itself
+                stats.update(scan_artifacts(full, self.working_dir))
+            else:
+                stats[rel] = (st.st_size, st.st_mtime)
+        return stats
+
+    def _accept(self, change: watchfiles.Change, path: str) -> bool:
+        try:
+            return is_artifact(Path(path).relative_to(self.working_dir).parts)
+        except ValueError:
+            return False
+
+    async def _watch(self) -> None:
+        try:
+            async for changes in watchfiles.awatch(
+                self.working_dir,
+                watch_filter=self._accept,
+                debounce=self.debounce_ms,
+                stop_event=self._stop,
+            ):
+                stats = await asyncio.to_thread(self._stat_changes, sorted({path for _, path in changes}))
+                for event in self._diff(stats):
+                    if self.on_event is not None:
+                        await self.on_event(event)
+        except Exception as e:
+            # The final reconcile in stop() still reports everything the run produced
+            logger.warning(f"Workspace watcher for {self.working_dir} stopped: {e}")
@@ -1,7 +1,117 @@
 """Prompt templates and loading utilities."""
 
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from string import Template
+from typing import Dict, Optional, Tuple
+
+
+PROMPTS_DIR = Path(__file__).parent
+CACHE_SIZE = int(os.getenv("PROMPT_CACHE_SIZE", "128"))
+# Development mode: re-stat prompt files on every load and pick up edits without a restart
+HOT_RELOAD = os.getenv("PROMPT_HOT_RELOAD", "").lower() in ("1", "true", "yes")
+
+
+@dataclass
+class _Prompt:
+    path: Path
+    mtime_ns: int
+    text: str
+    template: Template
+
+
+class PromptRegistry:
+    """
+    In-process cache of prompt files and their compiled templates.
+
+    A prompt requested for a domain resolves to ``domain/<domain>/<name>.md``
+    if that overlay exists and to ``base/<name>.md`` otherwise. Files are read
+    once and kept in an LRU; with ``hot_reload`` the resolution and the file's
+    mtime are checked on every load, so edited prompts are re-read.
+
+    Parameters
+    ----------
+    root : Path, optional
+        Directory holding ``base/`` and ``domain/`` (default: this package)
+    max_entries : int, optional
+        Number of prompts kept in memory (default: ``PROMPT_CACHE_SIZE`` or 128)
+    hot_reload : bool, optional
+        Check files for changes on every load (default: ``PROMPT_HOT_RELOAD``)
+    """
+
+    def __init__(self, root: Path = PROMPTS_DIR, max_entries: int = CACHE_SIZE, hot_reload: bool = HOT_RELOAD):
+        self.root = Path(root)
+        self.max_entries = max_entries
+        self.hot_reload = hot_reload
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, Optional[str]], _Prompt]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def resolve(self, name: str, domain: Optional[str] = None) -> Path:
+        """
+        Path of the file a prompt resolves to.
+
+        Raises
+        ------
+        FileNotFoundError
+            If neither the domain overlay nor the base prompt exists
+        """
+        candidates = [self.root / "base" / f"{name}.md"]
+        if domain:
+            candidates.insert(0, self.root / "domain" / domain / f"{name}.md")
+        for path in candidates:
+            if path.is_file():
+                return path
+        raise FileNotFoundError(f"Prompt not found: {' or '.join(str(p) for p in candidates)}")
+
+    def _load(self, name: str, domain: Optional[str]) -> _Prompt:
+        key = (name, domain)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.hot_reload:
+                try:
+                    stale = self.resolve(name, domain) != entry.path or entry.path.stat().st_mtime_ns != entry.mtime_ns
+                except FileNotFoundError:
+                    stale = True
+                if stale:
+                    del self._entries[key]
+                    entry = None
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry
+
+            self.misses += 1
+            path = self.resolve(name, domain)
+            mtime_ns = path.stat().st_mtime_ns
+            text = path.read_text(encoding="utf-8")
+            entry = _Prompt(path=path, mtime_ns=mtime_ns, text=text, template=Template(text))
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return entry
+
+    def get(self, name: str, domain: Optional[str] = None) -> str:
+        """Prompt text."""
+        return self._load(name, domain).text
+
+    def template(self, name: str, domain: Optional[str] = None) -> Template:
+        """Prompt as a compiled ``string.Template`` (shared; do not modify)."""
+        return self._load(name, domain).template
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+registry = PromptRegistry()
 
 
 def load_prompt(name: str, domain: Optional[str] = None) -> str:
@@ -13,7 +123,8 @@ def load_prompt(name: str, domain: Optional[str] = None) -> str:
     name : str
         Prompt name (e.g., 'plan_generator', 'coding_review')
     domain : str, optional
-        Optional domain namespace (e.g., 'bioinformatics')
+        Optional domain namespace (e.g., 'bioinformatics'); prompts the
+        domain does not override come from the base set
 
     Returns
     -------
@@ -25,17 +136,31 @@ def load_prompt(name: str, domain: Optional[str] = None) -> str:
     FileNotFoundError
         If the prompt file doesn't exist
     """
-    prompts_dir = Path(__file__).parent
+    return registry.get(name, domain)
 
-    if domain:
-        prompt_path = prompts_dir / "domain" / domain / f"{name}.md"
-    else:
-        prompt_path = prompts_dir / "base" / f"{name}.md"
 
-    if not prompt_path.exists():
-        raise FileNotFoundError(f"Prompt not found: {prompt_path}")
+def load_template(name: str, domain: Optional[str] = None) -> Template:
+    """
+    Load a prompt as a compiled ``string.Template``.
 
-    return prompt_path.read_text(encoding="utf-8")
+    Parameters
+    ----------
+    name : str
+        Prompt name (e.g., 'coding_base')
+    domain : str, optional
+        Optional domain namespace (e.g., 'bioinformatics')
+
+    Returns
+    -------
+    Template
+        Cached template; use ``substitute``/``safe_substitute`` on it
+
+    Raises
+    ------
+    FileNotFoundError
+        If the prompt file doesn't exist
+    """
+    return registry.template(name, domain)
 
 
-__all__ = ["load_prompt"]
+__all__ = ["load_prompt", "load_template", "PromptRegistry", "registry"]
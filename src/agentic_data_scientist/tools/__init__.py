@@ -6,6 +6,8 @@ All file operations are read-only and enforce working_dir sandboxing.
 """
 
 from agentic_data_scientist.tools.file_ops import (
+    FILE_TOOLS,
+    WORKING_DIR_STATE_KEY,
     directory_tree,
     get_file_info,
     list_directory,
@@ -23,5 +25,7 @@ __all__ = [
     "directory_tree",
     "search_files",
     "get_file_info",
+    "FILE_TOOLS",
+    "WORKING_DIR_STATE_KEY",
     "fetch_url",
 ]
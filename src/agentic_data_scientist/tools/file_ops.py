@@ -3,6 +3,12 @@ File operation tools for ADK agents.
 
 All file operations are read-only and enforce working_dir sandboxing.
 Paths are validated to prevent access outside the working directory.
+
+The agent-facing tools memoize the results of ``read_file``,
+``list_directory`` and ``directory_tree`` per session; a cached result is
+served only while the files it was computed from still have the same
+(mtime_ns, size, inode). All sessions' caches share one memory budget, and a
+session's cache is dropped when its run closes.
 """
 
 from __future__ import annotations
@@ -11,9 +17,16 @@ import base64
 import json
 import logging
 import mimetypes
+import os
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from google.adk.tools.tool_context import ToolContext
 
 
 logger = logging.getLogger(__name__)
@@ -711,3 +724,331 @@ def get_file_info(path: str, working_dir: str) -> str:
         return f"Error: {e}"
     except Exception as e:
         return f"Error getting file info: {e}"
+
+
+# ---------------------------------------------------------------------------
+# Agent-facing tools
+# ---------------------------------------------------------------------------
+# The functions above take the sandbox root as an argument. The tools below are
+# what agents are given: ADK injects the ToolContext and the root is read from
+# the session state, so one agent graph can serve sessions in any directory.
+
+# Session state key holding the absolute working directory of the session
+WORKING_DIR_STATE_KEY = "working_dir"
+
+_NO_WORKING_DIR = "Error: No working directory is set for this session"
+
+# Memory for cached tool results, per session and across all sessions
+TOOL_CACHE_MAX_BYTES = int(os.getenv("TOOL_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+TOOL_CACHE_TOTAL_BYTES = int(os.getenv("TOOL_CACHE_TOTAL_BYTES", str(128 * 1024 * 1024)))
+TOOL_CACHE_MAX_ENTRIES = int(os.getenv("TOOL_CACHE_MAX_ENTRIES", "1024"))
+# Sessions with a cache at once; the least recently used session's cache is dropped
+TOOL_CACHE_SESSIONS = int(os.getenv("TOOL_CACHE_SESSIONS", "32"))
+
+
+def _signature(paths: Tuple[str, ...]) -> Optional[Tuple[Tuple[int, int, int], ...]]:
+    """(mtime_ns, size, inode) of each path, or None if one cannot be stat'ed."""
+    try:
+        return tuple((st.st_mtime_ns, st.st_size, st.st_ino) for st in map(os.stat, paths))
+    except OSError:
+        return None
+
+
+@dataclass
+class _CachedResult:
+    result: str
+    paths: Tuple[str, ...]
+    signature: Tuple[Tuple[int, int, int], ...]
+    size: int
+
+
+class ToolResultCache:
+    """
+    LRU cache of file tool results for one session.
+
+    Parameters
+    ----------
+    max_bytes : int
+        Memory budget for cached results
+    max_entries : int
+        Maximum number of cached results
+    """
+
+    def __init__(self, max_bytes: int = TOOL_CACHE_MAX_BYTES, max_entries: int = TOOL_CACHE_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Tuple[Any, ...], _CachedResult]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[str]:
+        """Cached result for ``key`` if the files it depends on are unchanged."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and _signature(entry.paths) != entry.signature:
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    self._drop(key)
+                self.invalidations += 1
+            entry = None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry.result
+
+    def put(
+        self, key: Tuple[Any, ...], result: str, paths: Tuple[str, ...], signature: Tuple[Tuple[int, int, int], ...]
+    ) -> None:
+        """
+        Store a result computed from ``paths``.
+
+        ``signature`` must be taken before the result was computed, so a file
+        changing during the computation invalidates the entry.
+        """
+        size = sys.getsizeof(result)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = _CachedResult(result, paths, signature, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def evict(self, nbytes: int) -> int:
+        """Drop least recently used results until ``nbytes`` are freed (or none are left); the bytes freed."""
+        freed = 0
+        with self._lock:
+            while freed < nbytes and self._entries:
+                key = next(iter(self._entries))
+                freed += self._entries[key].size
+                self._drop(key)
+                self.evictions += 1
+        return freed
+
+    def _drop(self, key: Tuple[Any, ...]) -> None:
+        self.bytes -= self._entries.pop(key).size
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+        }
+
+
+_session_caches: "OrderedDict[str, ToolResultCache]" = OrderedDict()
+_session_caches_lock = threading.Lock()
+
+
+def session_tool_cache(tool_context: ToolContext) -> Optional[ToolResultCache]:
+    """Tool result cache of the session a tool is called in (None outside a session)."""
+    session = getattr(tool_context, "session", None)
+    if session is None:
+        return None
+    with _session_caches_lock:
+        cache = _session_caches.get(session.id)
+        if cache is None:
+            cache = _session_caches[session.id] = ToolResultCache()
+            while len(_session_caches) > TOOL_CACHE_SESSIONS:
+                _session_caches.popitem(last=False)
+        else:
+            _session_caches.move_to_end(session.id)
+        return cache
+
+
+def forget_session_cache(session_id: str) -> None:
+    """Drop the tool result cache of a session whose run has ended."""
+    with _session_caches_lock:
+        _session_caches.pop(session_id, None)
+
+
+def _enforce_total_budget() -> None:
+    """Evict results of the least recently used sessions until all caches fit ``TOOL_CACHE_TOTAL_BYTES``."""
+    with _session_caches_lock:
+        excess = sum(cache.bytes for cache in _session_caches.values()) - TOOL_CACHE_TOTAL_BYTES
+        for cache in list(_session_caches.values()):
+            if excess <= 0:
+                break
+            excess -= cache.evict(excess)
+
+
+def tool_cache_stats() -> Dict[str, Any]:
+    """Hit and miss counters of the tool result caches, in total and per session."""
+    with _session_caches_lock:
+        sessions = {session_id: cache.stats() for session_id, cache in _session_caches.items()}
+    totals = {"entries": 0, "bytes": 0, "hits": 0, "misses": 0, "invalidations": 0, "evictions": 0}
+    for stats in sessions.values():
+        for name in totals:
+            totals[name] += stats[name]
+    return {**totals, "sessions": sessions}
+
+
+def _tree_directories(root: Path, result: str) -> Optional[List[str]]:
+    """Directories shown in a ``directory_tree`` result (None if it was truncated)."""
+    try:
+        entries = json.loads(result)
+    except ValueError:
+        return None
+    directories = []
+    stack = [(root, entries)]
+    while stack:
+        parent, children = stack.pop()
+        for entry in children:
+            if entry["type"] == "directory":
+                path = parent / entry["name"]
+                directories.append(str(path))
+                stack.append((path, entry.get("children", [])))
+    return directories
+
+
+def _cached(
+    tool_context: ToolContext,
+    tool: str,
+    path: str,
+    working_dir: str,
+    args: Tuple[Any, ...],
+    compute: Callable[[], str],
+    dependencies: Optional[Callable[[Path, str], Optional[List[str]]]] = None,
+) -> str:
+    """
+    Result of a read-only file tool, from the session's cache when still valid.
+
+    The entry depends on the resolved path and, if given, the further paths
+    ``dependencies`` derives from the result (None: do not cache). Errors are
+    not cached.
+    """
+    cache = session_tool_cache(tool_context)
+    if cache is None:
+        return compute()
+    try:
+        resolved = _validate_path(path, working_dir)
+    except ValueError:
+        return compute()  # the tool reports the error
+    key = (tool, str(resolved), args)
+    result = cache.get(key)
+    if result is not None:
+        logger.info(f"[Tool:{tool}] '{path}' served from cache")
+        return result
+
+    signature = _signature((str(resolved),))
+    result = compute()
+    if signature is None or result.startswith("Error"):
+        return result
+    paths: Tuple[str, ...] = (str(resolved),)
+    if dependencies is not None:
+        extra = dependencies(resolved, result)
+        extra_signature = _signature(tuple(extra)) if extra is not None else None
+        if extra_signature is None:
+            return result
+        paths += tuple(extra)
+        signature += extra_signature
+    cache.put(key, result, paths, signature)
+    _enforce_total_budget()
+    return result
+
+
+def session_working_dir(tool_context: ToolContext) -> Optional[str]:
+    """
+    Working directory of the session a tool is called in.
+
+    Parameters
+    ----------
+    tool_context : ToolContext
+        Context ADK passes to the tool
+
+    Returns
+    -------
+    Optional[str]
+        The session's working directory, or None if the state does not name one
+    """
+    return tool_context.state.get(WORKING_DIR_STATE_KEY) or None
+
+
+def read_file_bound(
+    path: str, tool_context: ToolContext, head: Optional[int] = None, tail: Optional[int] = None
+) -> str:
+    """Read file contents with optional head/tail line limits."""
+    working_dir = session_working_dir(tool_context)
+    if not working_dir:
+        return _NO_WORKING_DIR
+    return _cached(
+        tool_context, "read_file", path, working_dir, (head, tail), lambda: read_file(path, working_dir, head, tail)
+    )
+
+
+def read_media_file_bound(path: str, tool_context: ToolContext) -> str:
+    """Read binary/media files and return base64 encoded data."""
+    working_dir = session_working_dir(tool_context)
+    return read_media_file(path, working_dir) if working_dir else _NO_WORKING_DIR
+
+
+def list_directory_bound(
+    tool_context: ToolContext, path: str = ".", show_sizes: bool = False, sort_by: str = "name"
+) -> str:
+    """List directory contents with optional size display and sorting."""
+    working_dir = session_working_dir(tool_context)
+    if not working_dir:
+        return _NO_WORKING_DIR
+    if show_sizes or sort_by == "size":
+        # File sizes can change without changing the directory's own stat
+        return list_directory(path, working_dir, show_sizes, sort_by)
+    return _cached(
+        tool_context, "list_directory", path, working_dir, (sort_by,), lambda: list_directory(path, working_dir)
+    )
+
+
+def directory_tree_bound(
+    tool_context: ToolContext, path: str = ".", exclude_patterns: Optional[list[str]] = None
+) -> str:
+    """Generate a recursive directory tree view."""
+    working_dir = session_working_dir(tool_context)
+    if not working_dir:
+        return _NO_WORKING_DIR
+    return _cached(
+        tool_context,
+        "directory_tree",
+        path,
+        working_dir,
+        tuple(exclude_patterns or ()),
+        lambda: directory_tree(path, working_dir, exclude_patterns),
+        dependencies=_tree_directories,
+    )
+
+
+def search_files_bound(
+    pattern: str, tool_context: ToolContext, path: str = ".", exclude_patterns: Optional[list[str]] = None
+) -> str:
+    """Search for files matching a pattern."""
+    working_dir = session_working_dir(tool_context)
+    return search_files(pattern, working_dir, path, exclude_patterns) if working_dir else _NO_WORKING_DIR
+
+
+def get_file_info_bound(path: str, tool_context: ToolContext) -> str:
+    """Get detailed metadata about a file."""
+    # Not cached: one stat is as cheap as validating a cache entry, and the access time goes stale
+    working_dir = session_working_dir(tool_context)
+    return get_file_info(path, working_dir) if working_dir else _NO_WORKING_DIR
+
+
+# Read-only file tools for agents, in the order they are offered to the model
+FILE_TOOLS = [
+    read_file_bound,
+    read_media_file_bound,
+    list_directory_bound,
+    directory_tree_bound,
+    search_files_bound,
+    get_file_info_bound,
+]
@@ -1,5 +1,6 @@
 """Pytest configuration and fixtures."""
 
+import os
 import shutil
 import tempfile
 from pathlib import Path
@@ -7,6 +8,11 @@ from pathlib import Path
 import pytest
 
 
+# Use LiteLLM's bundled model cost map: without network access its remote fetch
+# keeps retrying in a background thread that races test-time imports of litellm.
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+
 @pytest.fixture
 def tmp_working_dir():
     """Create a temporary working directory for tests."""
@@ -0,0 +1,62 @@
+"""Unit tests for the pre-built agent graph pool."""
+
+import asyncio
+
+from agentic_data_scientist import DataScientist
+from agentic_data_scientist.core.agent_pool import AgentPool
+
+
+class TestAgentPool:
+    """Test the graph is pre-built once and shared by sessions."""
+
+    async def test_graph_is_shared(self):
+        """Test every session gets the same graph and runner without a rebuild."""
+        pool = AgentPool()
+        try:
+            await pool.warm()
+            assert pool.stats()["ready"] == 1
+
+            first = await pool.acquire()
+            second = await pool.acquire()
+            assert second.app is first.app and second.runner is first.runner
+            assert pool.hits == 2 and pool.misses == 0
+            assert pool.stats()["in_use"] == 2
+
+            pool.release(first)
+            pool.release(second)
+            assert (await pool.acquire()) is first
+            assert pool.builds == 1
+        finally:
+            await pool.close()
+
+    async def test_concurrent_cold_acquire(self):
+        """Test sessions arriving before the graph is built wait for one build."""
+        pool = AgentPool()
+        try:
+            first, second = await asyncio.gather(pool.acquire(), pool.acquire())
+            assert first is second
+            assert pool.misses == 2 and pool.builds == 1
+        finally:
+            await pool.close()
+
+    async def test_data_scientist_uses_pool(self, tmp_path):
+        """Test DataScientist takes its app from the pool and removes its session on close."""
+        pool = AgentPool()
+        try:
+            await pool.warm()
+            ds = DataScientist(working_dir=str(tmp_path), pool=pool)
+            await ds._setup_agent()
+
+            assert ds.session_service is pool.session_service
+            assert pool.hits == 1
+            sessions = await pool.session_service.list_sessions(app_name=ds.app.name, user_id="default_user")
+            assert [s.id for s in sessions.sessions] == [ds.session_id]
+
+            await ds.close()
+            sessions = await pool.session_service.list_sessions(
+                app_name="agentic-data-scientist", user_id="default_user"
+            )
+            assert sessions.sessions == []
+            assert pool.stats()["in_use"] == 0 and pool.stats()["ready"] == 1
+        finally:
+            await pool.close()
@@ -0,0 +1,81 @@
+"""Unit tests for the content-addressed dataset cache."""
+
+import hashlib
+import io
+from types import SimpleNamespace
+
+import pytest
+
+from backend.blob_store import BlobStore
+from backend.uploads import UploadBudget, attach_blobs, save_uploads
+
+
+@pytest.fixture
+def blobs(tmp_path):
+    store = BlobStore(tmp_path / ".blobs")
+    yield store
+    store.close()
+
+
+def _upload(name: str, data: bytes):
+    return SimpleNamespace(filename=name, file=io.BytesIO(data))
+
+
+class TestBlobStore:
+    """Test deduplication, reference counting and garbage collection."""
+
+    async def test_same_dataset_stored_once(self, blobs, tmp_path):
+        """Test two sessions uploading identical bytes share one blob."""
+        data = b"id,value\n1,2\n"
+        sha = hashlib.sha256(data).hexdigest()
+        for session in ("s1", "s2"):
+            await save_uploads([_upload("data.csv", data)], tmp_path / session, UploadBudget(), blobs, session)
+
+        assert (tmp_path / "s1" / "data.csv").read_bytes() == data
+        assert (tmp_path / "s2" / "data.csv").read_bytes() == data
+        assert blobs.stat(sha)["refcount"] == 2
+        assert len(list(blobs.objects_dir.rglob("*"))) == 2  # one shard dir + one object
+        assert list(blobs.tmp_dir.iterdir()) == []
+
+    async def test_release_collects_unreferenced_blobs(self, blobs, tmp_path):
+        """Test blobs are deleted only when the last session releases them."""
+        data = b"payload"
+        sha = hashlib.sha256(data).hexdigest()
+        for session in ("s1", "s2"):
+            await save_uploads([_upload("d.bin", data)], tmp_path / session, UploadBudget(), blobs, session)
+
+        assert blobs.release_session("s1") == []
+        assert blobs.stat(sha)["refcount"] == 1
+        assert blobs.release_session("s2") == [sha]
+        assert blobs.stat(sha) is None
+
+    async def test_attach_cached_dataset(self, blobs, tmp_path):
+        """Test a cached dataset can be linked into a new session by hash."""
+        data = b"cached"
+        sha = hashlib.sha256(data).hexdigest()
+        await save_uploads([_upload("a.csv", data)], tmp_path / "s1", UploadBudget(), blobs, "s1")
+
+        results = await attach_blobs([{"name": "b.csv", "sha256": sha}], tmp_path / "s2", blobs, "s2")
+        assert results[0].size == len(data)
+        assert (tmp_path / "s2" / "b.csv").read_bytes() == data
+
+        with pytest.raises(FileNotFoundError):
+            await attach_blobs([{"name": "c.csv", "sha256": "0" * 64}], tmp_path / "s3", blobs, "s3")
+
+    async def test_session_copy_is_independent(self, blobs, tmp_path):
+        """Test writing a session's dataset in place leaves the cached object intact."""
+        data = b"original"
+        sha = hashlib.sha256(data).hexdigest()
+        for session in ("s1", "s2"):
+            await save_uploads([_upload("d.csv", data)], tmp_path / session, UploadBudget(), blobs, session)
+
+        target = tmp_path / "s1" / "d.csv"
+        assert target.stat().st_ino != blobs.object_path(sha).stat().st_ino
+        target.write_bytes(b"tampered")
+        assert blobs.object_path(sha).read_bytes() == data
+        assert (tmp_path / "s2" / "d.csv").read_bytes() == data
+
+    def test_invalid_digest_rejected(self, blobs):
+        """Test digests are validated before touching the filesystem."""
+        with pytest.raises(ValueError):
+            blobs.object_path("../../etc/passwd")
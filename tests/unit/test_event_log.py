@@ -0,0 +1,121 @@
+"""Unit tests for the replayable session event log."""
+
+import asyncio
+import json
+
+from backend.event_log import EventLog, replay
+
+
+async def _collect(iterator):
+    return [(event_id, json.loads(payload)) async for event_id, payload in iterator]
+
+
+class TestEventLog:
+    """Test EventLog append, fan-out and resume."""
+
+    async def test_ids_are_monotonic(self, tmp_path):
+        """Test each appended event receives the next ID."""
+        log = EventLog(tmp_path / "s.jsonl")
+        ids = [await log.append({"type": "message", "n": i}) for i in range(3)]
+        log.close()
+        assert ids == [1, 2, 3]
+        assert log.last_id == 3
+
+    async def test_multiple_subscribers_see_all_events(self, tmp_path):
+        """Test concurrent subscribers each receive the full stream."""
+        log = EventLog(tmp_path / "s.jsonl")
+        consumers = [asyncio.create_task(_collect(log.subscribe())) for _ in range(3)]
+        await asyncio.sleep(0)
+        for i in range(5):
+            await log.append({"n": i})
+            await asyncio.sleep(0)
+        log.close()
+
+        results = await asyncio.gather(*consumers)
+        for events in results:
+            assert [e["n"] for _, e in events] == [0, 1, 2, 3, 4]
+
+    async def test_resume_from_last_event_id(self, tmp_path):
+        """Test a subscriber can resume after a given ID."""
+        log = EventLog(tmp_path / "s.jsonl")
+        for i in range(5):
+            await log.append({"n": i})
+        log.close()
+
+        events = await _collect(log.subscribe(last_event_id=3))
+        assert [event_id for event_id, _ in events] == [4, 5]
+
+    async def test_evicted_events_replayed_from_disk(self, tmp_path):
+        """Test events that fell out of the ring buffer are read back from the file."""
+        log = EventLog(tmp_path / "s.jsonl", ring_size=2)
+        for i in range(6):
+            await log.append({"n": i})
+        log.close()
+
+        events = await _collect(log.subscribe(last_event_id=1))
+        assert [e["n"] for _, e in events] == [1, 2, 3, 4, 5]
+
+    async def test_replay_finished_log(self, tmp_path):
+        """Test replaying a closed log from disk only."""
+        path = tmp_path / "s.jsonl"
+        log = EventLog(path)
+        for i in range(3):
+            await log.append({"n": i})
+        log.close()
+
+        events = await _collect(replay(path, last_event_id=1))
+        assert [event_id for event_id, _ in events] == [2, 3]
+        assert await _collect(replay(tmp_path / "missing.jsonl")) == []
+
+
+class TestBackpressure:
+    """Test coalescing and blocking policies."""
+
+    async def test_partial_messages_are_coalesced(self, tmp_path):
+        """Test consecutive partial messages from one author become a single event."""
+        log = EventLog(tmp_path / "s.jsonl", policy="coalesce", coalesce_interval=60)
+        for chunk in ("Hel", "lo ", "world"):
+            assert await log.append({"type": "message", "author": "a", "is_partial": True, "content": chunk}) is None
+        await log.append({"type": "message", "author": "b", "is_partial": True, "content": "other"})
+        await log.append({"type": "usage", "usage": {}})
+        log.close()
+
+        events = [e for _, e in await _collect(log.subscribe())]
+        assert [e.get("content") for e in events] == ["Hello world", "other", None]
+        assert log.coalesced_count == 2
+
+    async def test_pending_partial_flushed_after_interval(self, tmp_path):
+        """Test a buffered partial message is emitted once the interval elapses."""
+        log = EventLog(tmp_path / "s.jsonl", policy="coalesce", coalesce_interval=0.01)
+        await log.append({"type": "message", "author": "a", "is_partial": True, "content": "x"})
+        assert log.last_id == 0
+        await asyncio.sleep(0.05)
+        assert log.last_id == 1
+        log.close()
+
+    async def test_block_policy_waits_for_slow_subscriber(self, tmp_path):
+        """Test the producer blocks while a subscriber lags a full ring behind."""
+        log = EventLog(tmp_path / "s.jsonl", ring_size=2, policy="block")
+        subscription = log.subscribe()
+        first = asyncio.create_task(subscription.__anext__())
+        await log.append({"n": 0})
+        assert (await first)[0] == 1
+
+        # Event 1 is only acknowledged once the subscriber asks for the next one
+        await log.append({"n": 1})
+        blocked = asyncio.create_task(log.append({"n": 2}))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+
+        assert (await subscription.__anext__())[0] == 2
+        assert await asyncio.wait_for(blocked, timeout=1) == 3
+        await subscription.aclose()
+        log.close()
+
+    async def test_block_policy_without_subscribers(self, tmp_path):
+        """Test the producer never blocks when nobody is listening."""
+        log = EventLog(tmp_path / "s.jsonl", ring_size=2, policy="block")
+        for i in range(10):
+            await log.append({"n": i})
+        assert log.last_id == 10
+        log.close()
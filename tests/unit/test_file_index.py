@@ -0,0 +1,124 @@
+"""Unit tests for the incremental file index."""
+
+import asyncio
+
+import pytest
+
+from backend.file_index import FileIndex, FileIndexCache, watchfiles
+
+
+def _paths(tree):
+    for node in tree:
+        yield node["path"]
+        yield from _paths(node.get("children", []))
+
+
+class TestFileIndex:
+    """Test scanning, incremental updates and change journals."""
+
+    def test_tree_shape(self, tmp_path):
+        """Test the tree lists directories first with sizes for files."""
+        (tmp_path / "b.txt").write_text("hello")
+        (tmp_path / "A").mkdir()
+        (tmp_path / "A" / "c.csv").write_text("1,2")
+        index = FileIndex(tmp_path)
+        index.rescan()
+
+        tree = index.tree()
+        assert [n["name"] for n in tree] == ["A", "b.txt"]
+        assert tree[0]["children"][0]["path"] == "A/c.csv"
+        assert tree[1]["size"] == 5
+
+    def test_apply_only_changed_paths(self, tmp_path):
+        """Test nested changes are picked up without a rescan."""
+        index = FileIndex(tmp_path)
+        index.rescan()
+        nested = tmp_path / "a" / "b"
+        nested.mkdir(parents=True)
+        (nested / "f.txt").write_text("x")
+
+        assert index.apply([str(nested / "f.txt")]) == 3  # a, a/b, a/b/f.txt
+        assert list(_paths(index.tree())) == ["a", "a/b", "a/b/f.txt"]
+
+        (nested / "f.txt").unlink()
+        (nested / "g").mkdir()
+        (nested / "g" / "h.txt").write_text("y")
+        index.apply([str(nested / "f.txt"), str(nested / "g")])
+        assert list(_paths(index.tree())) == ["a", "a/b", "a/b/g", "a/b/g/h.txt"]
+
+    def test_hidden_paths_skipped(self, tmp_path):
+        """Test hidden files and directories are left out of scans and updates."""
+        (tmp_path / ".venv" / "lib").mkdir(parents=True)
+        (tmp_path / ".env").write_text("KEY=1")
+        (tmp_path / "a.txt").write_text("x")
+        index = FileIndex(tmp_path)
+        index.rescan()
+        assert list(_paths(index.tree())) == ["a.txt"]
+        assert index.apply([str(tmp_path / ".venv" / "lib")]) == 0
+        assert not index.accepts(str(tmp_path / ".venv" / "lib" / "x.py"))
+        assert index.accepts(str(tmp_path / "a.txt"))
+
+    def test_changes_since(self, tmp_path):
+        """Test deltas, subtree deletes and journal overflow."""
+        index = FileIndex(tmp_path, journal_size=3)
+        index.rescan()
+        start = index.version
+        (tmp_path / "d").mkdir()
+        (tmp_path / "d" / "x").write_text("1")
+        index.apply([str(tmp_path / "d")])
+
+        changes = index.changes_since(start)
+        assert [(c["op"], c["path"]) for c in changes] == [("upsert", "d"), ("upsert", "d/x")]
+        assert index.changes_since(index.version) == []
+
+        after_add = index.version
+        (tmp_path / "d" / "x").unlink()
+        (tmp_path / "d").rmdir()
+        index.rescan()
+        assert index.changes_since(after_add) == [{"op": "delete", "path": "d"}]
+        assert index.tree() == []
+
+        for name in ("p", "q", "r"):
+            (tmp_path / name).write_text(name)
+        index.rescan()
+        assert index.changes_since(start) is None
+
+
+class TestFileIndexCache:
+    """Test LRU eviction and the polling fallback."""
+
+    async def test_lru_eviction(self, tmp_path):
+        """Test the least recently used session is evicted."""
+        cache = FileIndexCache(max_sessions=2, watch=False)
+        for name in ("s1", "s2"):
+            (tmp_path / name).mkdir()
+            await cache.get(name, tmp_path / name)
+        await cache.get("s1", tmp_path / "s1")
+        (tmp_path / "s3").mkdir()
+        await cache.get("s3", tmp_path / "s3")
+        assert list(cache._indexes) == ["s1", "s3"]
+        await cache.close()
+
+    async def test_polling_fallback(self, tmp_path):
+        """Test unwatched indexes rescan once the poll interval has elapsed."""
+        cache = FileIndexCache(watch=False, poll_interval=0)
+        index = await cache.get("s1", tmp_path)
+        (tmp_path / "new.txt").write_text("x")
+        index = await cache.get("s1", tmp_path)
+        assert list(_paths(index.tree())) == ["new.txt"]
+        await cache.close()
+
+    @pytest.mark.skipif(watchfiles is None, reason="watchfiles not installed")
+    async def test_watcher_updates_index(self, tmp_path):
+        """Test filesystem notifications reach the index without polling."""
+        cache = FileIndexCache(watch=True, poll_interval=3600)
+        index = await cache.get("s1", tmp_path)
+        assert index.watching  # watches are in place once get() returns
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "out.png").write_bytes(b"png")
+        for _ in range(50):
+            if "sub/out.png" in _paths(index.tree()):
+                break
+            await asyncio.sleep(0.1)
+        assert list(_paths(index.tree())) == ["sub", "sub/out.png"]
+        await cache.close()
@@ -0,0 +1,87 @@
+"""Unit tests for conditional and compressed file serving."""
+
+import gzip
+import hashlib
+
+import pytest
+
+from backend.file_serving import (
+    ContentHashCache,
+    choose_encoding,
+    compressed_stream,
+    is_compressible,
+    is_not_modified,
+    make_etag,
+    zstandard,
+)
+
+
+class TestValidators:
+    """Test ETags and conditional request evaluation."""
+
+    def test_strong_etag_from_content(self, tmp_path):
+        """Test the ETag is the content hash, varied per encoding."""
+        path = tmp_path / "a.csv"
+        path.write_text("x,y\n")
+        st = path.stat()
+        sha = ContentHashCache().get(path, st)
+        assert sha == hashlib.sha256(b"x,y\n").hexdigest()
+        assert make_etag(st, sha) == f'"{sha}"'
+        assert make_etag(st, sha, "gzip") == f'"{sha}-gzip"'
+        assert make_etag(st, None).startswith('W/"')
+
+    def test_large_files_use_manifest_hash(self, tmp_path):
+        """Test oversized files are only served with a hash primed from the manifest."""
+        path = tmp_path / "big.bin"
+        path.write_bytes(b"0" * 100)
+        st = path.stat()
+        cache = ContentHashCache()
+        assert cache.get(path, st, max_bytes=10) is None
+        cache.prime(tmp_path, [{"path": "big.bin", "size": st.st_size, "mtime": st.st_mtime, "sha256": "abc"}])
+        assert cache.get(path.resolve(), st, max_bytes=10) == "abc"
+
+    def test_is_not_modified(self):
+        """Test If-None-Match takes precedence over If-Modified-Since."""
+        etag = '"abc"'
+        assert is_not_modified({"if-none-match": '"zzz", W/"abc"'}, etag, 0)
+        future = "Thu, 01 Jan 2099 00:00:00 GMT"
+        assert not is_not_modified({"if-none-match": '"zzz"', "if-modified-since": future}, etag, 0)
+        assert is_not_modified({"if-modified-since": future}, etag, 1000.0)
+        assert not is_not_modified({"if-modified-since": "Thu, 01 Jan 1970 00:00:00 GMT"}, etag, 1000.0)
+        assert not is_not_modified({}, etag, 1000.0)
+
+
+class TestCompression:
+    """Test encoding negotiation and streaming compression."""
+
+    def test_choose_encoding(self):
+        """Test q-values and unsupported encodings are honoured."""
+        assert choose_encoding("gzip, deflate") == "gzip"
+        assert choose_encoding("gzip;q=0, br") is None
+        assert choose_encoding(None) is None
+        assert choose_encoding("*") in ("zstd", "gzip")
+
+    def test_is_compressible(self):
+        """Test only text-like media types are compressed."""
+        assert is_compressible("text/csv")
+        assert is_compressible("application/json")
+        assert not is_compressible("image/png")
+
+    async def test_gzip_roundtrip(self, tmp_path):
+        """Test the compressed stream decodes to the original file."""
+        data = b"col_a,col_b\n" + b"1,2\n" * 100_000
+        path = tmp_path / "t.csv"
+        path.write_bytes(data)
+        body = b"".join([chunk async for chunk in compressed_stream(path, "gzip")])
+        assert gzip.decompress(body) == data
+        assert len(body) < len(data) // 10
+
+    @pytest.mark.skipif(zstandard is None, reason="zstandard not installed")
+    async def test_zstd_roundtrip(self, tmp_path):
+        """Test zstd is preferred when available and decodes correctly."""
+        data = b"x" * 50_000
+        path = tmp_path / "t.txt"
+        path.write_bytes(data)
+        assert choose_encoding("gzip, zstd") == "zstd"
+        body = b"".join([chunk async for chunk in compressed_stream(path, "zstd")])
+        assert zstandard.ZstdDecompressor().decompressobj().decompress(body) == data
@@ -0,0 +1,98 @@
+"""Unit tests for the shared LLM client registry."""
+
+import asyncio
+
+import httpx
+from google.adk.models.lite_llm import LiteLlm
+from google.adk.models.llm_request import LlmRequest
+from google.genai import types
+
+from agentic_data_scientist.core import llm_clients
+from agentic_data_scientist.core.llm_clients import ClientRegistry, ProviderPool, provider_for
+
+
+ANTHROPIC_RESPONSE = {
+    "id": "msg",
+    "type": "message",
+    "role": "assistant",
+    "model": "claude-sonnet-4-5-20250929",
+    "content": [{"type": "text", "text": "done"}],
+    "stop_reason": "end_turn",
+    "usage": {"input_tokens": 1, "output_tokens": 1},
+}
+
+
+class TestProviderPool:
+    """Test concurrency limits and statistics."""
+
+    async def test_concurrency_limit(self):
+        """Test no more than max_concurrency requests hold a slot at once."""
+        pool = ProviderPool("test", max_concurrency=2)
+
+        async def request():
+            async with pool.slot():
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(request() for _ in range(5)))
+
+        stats = pool.stats()
+        assert stats["requests"] == 5
+        assert stats["peak_active"] == 2
+        assert stats["active"] == 0 and stats["waiting"] == 0
+
+    def test_provider_for(self):
+        """Test explicit providers win and LiteLLM infers the rest."""
+        assert provider_for("google/gemini-2.5-pro", "openrouter") == "openrouter"
+        assert provider_for("gemini/gemini-2.5-pro") == "gemini"
+        assert provider_for("claude-sonnet-4-5-20250929") == "anthropic"
+
+
+class TestClientRegistry:
+    """Test models of one provider share a client and its connections."""
+
+    async def test_shared_connections(self, monkeypatch):
+        """Test requests from two models go through one pooled HTTP client."""
+        requests = []
+
+        def handle(request):
+            requests.append(request.url.path)
+            return httpx.Response(200, json=ANTHROPIC_RESPONSE)
+
+        monkeypatch.setattr(llm_clients, "_transport", lambda: httpx.MockTransport(handle))
+        registry = ClientRegistry()
+        client = registry.client("anthropic")
+        assert registry.client("anthropic") is client
+
+        for _ in range(2):
+            llm = LiteLlm(model="claude-sonnet-4-5-20250929", api_key="test", llm_client=client)
+            request = LlmRequest(contents=[types.Content(role="user", parts=[types.Part(text="hi")])])
+            responses = [r async for r in llm.generate_content_async(request)]
+            assert responses[-1].content.parts[0].text == "done"
+
+        assert requests == ["/v1/messages", "/v1/messages"]
+        stats = registry.stats()["anthropic"]
+        assert stats["requests"] == 2
+        assert stats["clients_created"] == 1
+        await registry.pool("anthropic").aclose()
+
+    async def test_rate_limited_retry(self, monkeypatch):
+        """Test a 429 is retried after Retry-After and shrinks the model's window."""
+        rate_limited = {"type": "error", "error": {"type": "rate_limit_error", "message": "slow down"}}
+        responses = [
+            httpx.Response(429, headers={"retry-after": "0.05"}, json=rate_limited),
+            httpx.Response(200, json=ANTHROPIC_RESPONSE),
+        ]
+        monkeypatch.setattr(llm_clients, "_transport", lambda: httpx.MockTransport(lambda request: responses.pop(0)))
+        registry = ClientRegistry()
+
+        client = registry.client("anthropic")
+        llm = LiteLlm(model="claude-sonnet-4-5-20250929", api_key="test", num_retries=2, llm_client=client)
+        request = LlmRequest(contents=[types.Content(role="user", parts=[types.Part(text="hi")])])
+        responses_seen = [r async for r in llm.generate_content_async(request)]
+
+        assert responses_seen[-1].content.parts[0].text == "done"
+        stats = registry.stats()["anthropic"]
+        assert stats["retries"] == 1
+        model_stats = stats["models"]["claude-sonnet-4-5-20250929"]
+        assert model_stats["rate_limited"] == 1 and model_stats["admitted"] == 2
+        await registry.pool("anthropic").aclose()
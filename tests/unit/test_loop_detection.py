@@ -0,0 +1,301 @@
+"""Unit tests for incremental loop detection."""
+
+import asyncio
+import random
+import string
+from types import SimpleNamespace
+
+from google.adk.events import Event
+from google.genai import types
+
+from agentic_data_scientist.agents.adk.loop_detection import (
+    DetectionTask,
+    LoopDetectionAgent,
+    RepetitionDetector,
+    TextWindow,
+    ToolCallTracker,
+)
+
+
+def _detector(**overrides):
+    config = dict(min_pattern_length=200, max_pattern_length=1000, repetition_threshold=5, window_size=5000)
+    config.update(overrides)
+    return RepetitionDetector(**config)
+
+
+def _prose(length, seed=0):
+    rng = random.Random(seed)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9))) for _ in range(length // 4)]
+    return " ".join(words)[:length]
+
+
+class TestTextWindow:
+    """Test the ring buffer behind the detector."""
+
+    def test_wraps_around(self):
+        """Test the window keeps the newest characters addressed by stream position."""
+        window = TextWindow(4)
+        for ch in "abcdef":
+            window.append(ord(ch))
+        assert (window.start, window.end, len(window)) == (2, 6, 4)
+        assert window.at(1) == -1 and window.at(2) == ord("c") and window.at(6) == -1
+        assert window.tail(3) == "def"
+        assert window.tail(10) == "cdef"
+
+    def test_no_reallocation(self):
+        """Test appends reuse the preallocated storage."""
+        window = TextWindow(8)
+        storage = window._codes
+        for code in range(100):
+            window.append(code)
+        assert window._codes is storage and len(storage) == 8
+
+
+class TestRepetitionDetector:
+    """Test the streaming repetition detector."""
+
+    def test_detects_loop(self):
+        """Test five copies of a 250 character pattern are a loop."""
+        pattern = _prose(250, seed=1)
+        detector = _detector()
+        found = detector.feed(_prose(700) + " " + pattern * 5)
+        # Reported as the repeated unit ending the stream, i.e. a rotation of the pattern
+        assert found is not None and found in pattern * 2
+        assert detector.detected
+
+    def test_streamed_in_chunks(self):
+        """Test the loop is found when text arrives a few characters at a time."""
+        pattern = _prose(300, seed=2)
+        text = _prose(1000) + " " + pattern * 6
+        detector = _detector()
+        found = [detector.feed(text[i : i + 7]) for i in range(0, len(text), 7)]
+        assert any(found)
+
+    def test_too_few_copies(self):
+        """Test four copies are below the threshold."""
+        pattern = _prose(250, seed=3)
+        assert _detector().feed(pattern * 4) is None
+
+    def test_no_false_positive(self):
+        """Test varied text with short repeated phrases is not a loop."""
+        text = "".join(f"Processing file data/part_{i}.csv ... done\n" + _prose(120, seed=i) for i in range(200))
+        assert _detector().feed(text) is None
+
+    def test_short_period(self):
+        """Test a short repeated unit is reported as a pattern of at least the minimum length."""
+        detector = _detector(min_pattern_length=20, repetition_threshold=3)
+        pattern = detector.feed(_prose(100) + " " + "ab" * 50)
+        assert pattern is not None and len(pattern) == 20
+
+    def test_rediscovered_period_keeps_run(self):
+        """Test a candidate dropped mid-loop is not delayed when its period is found again."""
+        pattern = _prose(250, seed=9)
+        detector = _detector()
+        assert detector.feed(pattern * 4 + pattern[:100]) is None
+        detector._runs.clear()  # as if evicted by other candidates
+        assert detector.feed(pattern[100:]) is not None
+
+    def test_whitespace_normalized(self):
+        """Test copies differing only in whitespace count as repetitions."""
+        pattern = _prose(250, seed=4)
+        text = "".join(pattern.replace(" ", "\n  " if i % 2 else " ") + " " for i in range(6))
+        assert _detector().feed(text) is not None
+
+    def test_large_input(self):
+        """Test a loop after a long prefix is still found (no iteration cap)."""
+        pattern = _prose(900, seed=5)
+        detector = _detector()
+        for i in range(100):
+            assert detector.feed(_prose(2000, seed=100 + i)) is None
+        assert detector.feed(pattern * 5) is not None
+
+
+class TestDetectionTask:
+    """Test detection in a background task."""
+
+    async def test_detects_in_background(self):
+        """Test submitted text is scanned by the task and the loop reported."""
+        pattern = _prose(250, seed=7)
+        detection = DetectionTask(_detector().feed)
+        detection.submit(_prose(5000))
+        assert detection.pattern is None  # submit does not scan
+        detection.submit(pattern * 5)
+        await detection.drain()
+        assert detection.pattern is not None
+        await detection.aclose()
+
+    async def test_yields_between_chunks(self):
+        """Test a large submission does not block other coroutines."""
+        detection = DetectionTask(_detector().feed)
+        detection.submit(_prose(20 * DetectionTask.CHUNK))
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(ticker())
+        await detection.drain()
+        task.cancel()
+        assert ticks >= 10
+        await detection.aclose()
+
+
+class TestToolCallTracker:
+    """Test detection of repeated tool calls."""
+
+    def test_short_circuits_identical_results(self):
+        """Test a call repeated with the same result is answered from cache."""
+        tracker = ToolCallTracker(repeat_threshold=3, stop_threshold=6)
+        for _ in range(3):
+            assert tracker.before("inv", "read_file", {"path": "a.csv"}) is None
+            tracker.after("inv", "read_file", {"path": "a.csv"}, "x,y\n1,2")
+        response = tracker.before("inv", "read_file", {"path": "./data/../a.csv"})
+        assert response["result"] == "x,y\n1,2" and "[TOOL LOOP]" in response["warning"]
+        assert tracker.before("inv", "read_file", {"path": "b.csv"}) is None
+        assert tracker.before("other", "read_file", {"path": "a.csv"}) is None
+        assert tracker.short_circuited == 1
+
+    def test_served_response_not_recorded(self):
+        """Test the cached response seen by the after-callback does not reset the count."""
+        tracker = ToolCallTracker(repeat_threshold=2, stop_threshold=4)
+        for _ in range(2):
+            tracker.after("inv", "read_file", {"path": "a.csv"}, "x")
+        for _ in range(2):
+            response = tracker.before("inv", "read_file", {"path": "a.csv"})
+            tracker.after("inv", "read_file", {"path": "a.csv"}, response)
+        assert tracker.stopped("inv")
+
+    def test_changed_result_starts_over(self):
+        """Test a call whose result changes is not a loop."""
+        tracker = ToolCallTracker(repeat_threshold=2, stop_threshold=4)
+        for i in range(5):
+            assert tracker.before("inv", "list_directory", {"path": "."}) is None
+            tracker.after("inv", "list_directory", {"path": "."}, {"result": f"{i} files"})
+
+    def test_stop_threshold(self):
+        """Test the invocation is stopped when short-circuited calls continue."""
+        tracker = ToolCallTracker(repeat_threshold=2, stop_threshold=4)
+        for _ in range(2):
+            tracker.after("inv", "get_file_info", {"path": "a.csv"}, {"result": "1 KB"})
+        assert not tracker.before("inv", "get_file_info", {"path": "a.csv"})["warning"].endswith("stopped.")
+        assert tracker.before("inv", "get_file_info", {"path": "a.csv"})["warning"].endswith("stopped.")
+        assert tracker.stopped("inv") and tracker.stops == 1
+        tracker.forget("inv")
+        assert not tracker.stopped("inv")
+
+
+class _StreamingFlow:
+    def __init__(self, author, chunks):
+        self.author = author
+        self.chunks = chunks
+
+    async def run_async(self, ctx):
+        for chunk in self.chunks:
+            await asyncio.sleep(0)  # network wait between chunks
+            content = types.Content(role="model", parts=[types.Part(text=chunk)])
+            yield Event(author=self.author, partial=True, content=content)
+
+
+class _DispatchFlow:
+    """Runs the flow registered for the invocation ID."""
+
+    def __init__(self, flows):
+        self.flows = flows
+
+    def run_async(self, ctx):
+        return self.flows[ctx.invocation_id].run_async(ctx)
+
+
+class _ToolCallingFlow:
+    """Calls the same tool on every turn through the agent's tool callbacks."""
+
+    def __init__(self, agent, turns):
+        self.agent = agent
+        self.turns = turns
+        self.tool_runs = 0
+
+    async def run_async(self, ctx):
+        tool = SimpleNamespace(name="read_file_bound")
+        tool_context = SimpleNamespace(invocation_id=ctx.invocation_id)
+        args = {"path": "data.csv"}
+        for _ in range(self.turns):
+            response = None
+            for callback in self.agent.canonical_before_tool_callbacks:
+                response = callback(tool=tool, args=args, tool_context=tool_context)
+                if response:
+                    break
+            if not response:
+                self.tool_runs += 1
+                response = {"result": "a,b\n1,2"}
+            # As in ADK, after-callbacks also see responses a before-callback short-circuited
+            for callback in self.agent.canonical_after_tool_callbacks:
+                callback(tool=tool, args=args, tool_context=tool_context, tool_response=response)
+            yield Event(author=self.agent.name, content=types.Content(role="user", parts=[types.Part(text="")]))
+
+
+class TestLoopDetectionAgent:
+    """Test the agent's detection helper."""
+
+    def test_detect_pattern_repetition(self):
+        """Test the helper uses the agent's thresholds."""
+        agent = LoopDetectionAgent(name="looper", model="gemini-2.0-flash")
+        pattern = _prose(250, seed=6)
+        loop_detected, found = agent._detect_pattern_repetition(pattern * 5)
+        assert loop_detected and found in pattern * 2
+        assert agent._detect_pattern_repetition(_prose(3000)) == (False, None)
+
+    async def test_stops_streaming_loop(self, monkeypatch):
+        """Test a looping stream is forwarded until the background task finds the loop."""
+        agent = LoopDetectionAgent(name="looper", model="gemini-2.0-flash")
+        pattern = _prose(250, seed=8)
+        chunks = [_prose(400)] + [pattern[i : i + 50] for i in range(0, 250, 50)] * 50
+        monkeypatch.setattr(LoopDetectionAgent, "_llm_flow", property(lambda self: _StreamingFlow("looper", chunks)))
+
+        events = [event async for event in agent._run_async_impl(SimpleNamespace(invocation_id="inv-1"))]
+        assert "[LOOP DETECTED]" in events[-1].content.parts[0].text
+        assert len(events) < len(chunks)
+        assert agent.detection_stats()["chars_scanned"] >= 5 * 250
+
+    async def test_concurrent_invocations(self, monkeypatch):
+        """Test invocations running at once on one agent each get their own detector."""
+        agent = LoopDetectionAgent(name="looper", model="gemini-2.0-flash")
+        pattern = _prose(250, seed=10)
+        chunks = {
+            "loop": [_prose(400)] + [pattern[i : i + 50] for i in range(0, 250, 50)] * 50,
+            "clean": [_prose(50, seed=i) for i in range(400)],
+        }
+        flows = {key: _StreamingFlow("looper", value) for key, value in chunks.items()}
+        monkeypatch.setattr(LoopDetectionAgent, "_llm_flow", property(lambda self: _DispatchFlow(flows)))
+
+        async def run(invocation_id):
+            ctx = SimpleNamespace(invocation_id=invocation_id)
+            return [event async for event in agent._run_async_impl(ctx)]
+
+        looped, clean = await asyncio.gather(run("loop"), run("clean"))
+        assert "[LOOP DETECTED]" in looped[-1].content.parts[0].text
+        assert len(clean) == len(chunks["clean"])
+
+    async def test_stops_tool_call_loop(self, monkeypatch):
+        """Test repeated identical tool calls are served from cache and then stop the agent."""
+        agent = LoopDetectionAgent(
+            name="looper", model="gemini-2.0-flash", tool_repeat_threshold=3, tool_stop_threshold=5
+        )
+        flow = _ToolCallingFlow(agent, turns=20)
+        monkeypatch.setattr(LoopDetectionAgent, "_llm_flow", property(lambda self: flow))
+
+        events = [event async for event in agent._run_async_impl(SimpleNamespace(invocation_id="inv-1"))]
+        assert "repeated identical tool calls" in events[-1].content.parts[0].text
+        assert flow.tool_runs == 3 and len(events) == 6
+        assert agent.detection_stats()["tool_calls_short_circuited"] == 2
+        assert not agent.tool_call_tracker.stopped("inv-1")
+
+    def test_detection_stats(self):
+        """Test streamed text is counted and timed across invocations."""
+        agent = LoopDetectionAgent(name="looper", model="gemini-2.0-flash")
+        for _ in range(2):
+            agent._detect(agent._new_detector(), _prose(500))
+        stats = agent.detection_stats()
+        assert stats["chars_scanned"] == 1000 and stats["detection_ms"] > 0
@@ -0,0 +1,93 @@
+"""Unit tests for tabular file previews."""
+
+import json
+
+import pytest
+
+from backend.preview import PreviewCache, RowIndex, UnsupportedFormat, pq
+
+
+def _write_csv(path, n_rows):
+    lines = ["id,name,score"] + [f"{i},name{i},{i / 2}" for i in range(n_rows)]
+    path.write_text("\n".join(lines) + "\n")
+
+
+class TestRowIndex:
+    """Test the sparse row-offset index."""
+
+    def test_checkpoints_and_count(self, tmp_path):
+        """Test checkpoints land on row starts and the count becomes exact."""
+        path = tmp_path / "t.csv"
+        _write_csv(path, 2500)
+        index = RowIndex(path, "csv", checkpoint_rows=1000)
+
+        index.ensure(2100)
+        assert len(index.offsets) == 3
+        with open(path, "rb") as fh:
+            fh.seek(index.offsets[1])
+            assert fh.readline() == b"999,name999,499.5\n"  # physical row 1000 (header is row 0)
+        assert not index.complete
+
+        index.ensure(10_000)
+        assert index.row_count() == (2500, True)
+
+    def test_quoted_newlines(self, tmp_path):
+        """Test newlines inside quoted fields do not split rows."""
+        path = tmp_path / "q.csv"
+        path.write_text('a,b\n1,"multi\nline"\n2,x\n3,"y"')
+        index = RowIndex(path, "csv", checkpoint_rows=2)
+        index.ensure(100)
+        assert index.row_count() == (3, True)
+        with open(path, "rb") as fh:
+            fh.seek(index.offsets[1])
+            assert fh.readline() == b"2,x\n"
+
+
+class TestPreviewCache:
+    """Test paged previews across formats."""
+
+    def test_csv_page(self, tmp_path):
+        """Test a deep page returns the right rows and inferred schema."""
+        path = tmp_path / "t.csv"
+        _write_csv(path, 5000)
+        result = PreviewCache().preview(path, offset=3998, limit=3)
+
+        assert [c["name"] for c in result["columns"]] == ["id", "name", "score"]
+        assert [c["type"] for c in result["columns"]] == ["integer", "string", "number"]
+        assert [row[0] for row in result["rows"]] == ["3998", "3999", "4000"]
+        assert result["rows"][1] == ["3999", "name3999", "1999.5"]
+        assert result["has_more"] is True
+
+    def test_last_page_is_exact(self, tmp_path):
+        """Test reading past the end reports an exact count."""
+        path = tmp_path / "t.tsv"
+        path.write_text("a\tb\n1\t2\n3\t4\n")
+        result = PreviewCache().preview(path, offset=1, limit=10)
+        assert result["rows"] == [["3", "4"]]
+        assert (result["row_count"], result["row_count_exact"], result["has_more"]) == (2, True, False)
+
+    def test_jsonl_page(self, tmp_path):
+        """Test JSONL records become rows over the union of their keys."""
+        path = tmp_path / "r.jsonl"
+        path.write_text("\n".join(json.dumps({"x": i, **({"y": "a"} if i % 2 else {})}) for i in range(10)) + "\n")
+        result = PreviewCache().preview(path, offset=0, limit=2)
+        assert [c["name"] for c in result["columns"]] == ["x", "y"]
+        assert result["rows"] == [[0, None], [1, "a"]]
+
+    @pytest.mark.skipif(pq is None, reason="pyarrow not installed")
+    def test_parquet_page(self, tmp_path):
+        """Test Parquet pages are read from the overlapping row groups only."""
+        import pyarrow as pa
+
+        path = tmp_path / "t.parquet"
+        pq.write_table(pa.table({"v": list(range(100))}), path, row_group_size=10)
+        result = PreviewCache().preview(path, offset=25, limit=10)
+        assert result["rows"] == [[v] for v in range(25, 35)]
+        assert (result["row_count"], result["row_count_exact"]) == (100, True)
+
+    def test_unsupported_format(self, tmp_path):
+        """Test non-tabular files are rejected."""
+        path = tmp_path / "plot.png"
+        path.write_bytes(b"png")
+        with pytest.raises(UnsupportedFormat):
+            PreviewCache().preview(path)
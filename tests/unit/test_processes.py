@@ -0,0 +1,33 @@
+"""Unit tests for session process cleanup."""
+
+import subprocess
+import sys
+
+import pytest
+
+from backend.processes import PROC, kill_processes_in
+
+
+@pytest.mark.skipif(not PROC.is_dir(), reason="requires /proc")
+class TestKillProcessesIn:
+    """Test only processes running inside the session directory are killed."""
+
+    def test_kills_processes_in_directory(self, tmp_path):
+        """Test a child in the session dir is killed and one elsewhere is left alone."""
+        inside = tmp_path / "session"
+        (inside / "sub").mkdir(parents=True)
+        outside = tmp_path / "other"
+        outside.mkdir()
+        sleep = [sys.executable, "-c", "import time; time.sleep(60)"]
+        victim = subprocess.Popen(sleep, cwd=inside / "sub")
+        bystander = subprocess.Popen(sleep, cwd=outside)
+        try:
+            killed = kill_processes_in(inside)
+            assert victim.pid in killed
+            assert bystander.pid not in killed
+            assert victim.wait(timeout=5) != 0
+            assert bystander.poll() is None
+        finally:
+            for proc in (victim, bystander):
+                proc.kill()
+                proc.wait()
@@ -0,0 +1,84 @@
+"""Unit tests for the prompt registry."""
+
+import os
+
+import pytest
+
+from agentic_data_scientist.agents.claude_code.templates import get_claude_instructions
+from agentic_data_scientist.prompts import PromptRegistry, load_prompt, load_template
+
+
+@pytest.fixture
+def prompt_root(tmp_path):
+    (tmp_path / "base").mkdir()
+    (tmp_path / "domain" / "bio").mkdir(parents=True)
+    (tmp_path / "base" / "greeting.md").write_text("Hello $name")
+    (tmp_path / "base" / "other.md").write_text("Other")
+    (tmp_path / "domain" / "bio" / "greeting.md").write_text("Hello biologist $name")
+    return tmp_path
+
+
+class TestPromptRegistry:
+    """Test prompt caching, domain overlays and hot-reload."""
+
+    def test_cached(self, prompt_root):
+        """Test a prompt is read once and its template compiled once."""
+        registry = PromptRegistry(root=prompt_root)
+        assert registry.get("greeting") == "Hello $name"
+        (prompt_root / "base" / "greeting.md").write_text("Changed")
+
+        assert registry.get("greeting") == "Hello $name"
+        assert registry.template("greeting") is registry.template("greeting")
+        assert registry.stats() == {"entries": 1, "hits": 3, "misses": 1}
+
+    def test_domain_overlay(self, prompt_root):
+        """Test domain prompts override base prompts and fall back to them."""
+        registry = PromptRegistry(root=prompt_root)
+        assert registry.get("greeting", "bio") == "Hello biologist $name"
+        assert registry.get("other", "bio") == "Other"
+        assert registry.get("greeting") == "Hello $name"
+
+        with pytest.raises(FileNotFoundError):
+            registry.get("missing", "bio")
+
+    def test_hot_reload(self, prompt_root):
+        """Test edited and newly overlaid prompts are picked up in hot-reload mode."""
+        registry = PromptRegistry(root=prompt_root, hot_reload=True)
+        path = prompt_root / "base" / "other.md"
+        assert registry.get("other", "bio") == "Other"
+
+        path.write_text("Edited")
+        os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000_000))
+        assert registry.get("other", "bio") == "Edited"
+
+        (prompt_root / "domain" / "bio" / "other.md").write_text("Overlay")
+        assert registry.get("other", "bio") == "Overlay"
+
+    def test_lru_eviction(self, prompt_root):
+        """Test the least recently used prompt is evicted."""
+        registry = PromptRegistry(root=prompt_root, max_entries=2)
+        registry.get("greeting")
+        registry.get("other")
+        registry.get("greeting")
+        registry.get("greeting", "bio")
+
+        assert set(registry._entries) == {("greeting", None), ("greeting", "bio")}
+
+
+class TestPackagePrompts:
+    """Test the shipped prompts through the module-level registry."""
+
+    def test_load(self):
+        """Test base and domain prompts load."""
+        assert load_prompt("coding_base")
+        assert load_prompt("interactive_base", "bioinformatics")
+        assert load_prompt("coding_base", "bioinformatics") == load_prompt("coding_base")
+
+    def test_claude_instructions(self):
+        """Test Claude instructions are built from the cached template."""
+        template = load_template("coding_base")
+        instructions = get_claude_instructions({"implementation_task": "Plot the data"}, "/work")
+
+        assert instructions.startswith(load_prompt("coding_base"))
+        assert "CRITICAL FILE HANDLING CONSTRAINTS" in instructions
+        assert load_template("coding_base") is template
@@ -0,0 +1,85 @@
+"""Unit tests for the LLM rate limiter."""
+
+import asyncio
+import time
+
+from agentic_data_scientist.core.rate_limit import RateLimiter, TokenBucket
+
+
+class TestTokenBucket:
+    """Test refill and settlement of token buckets."""
+
+    def test_delay(self):
+        """Test an empty bucket reports the time until it refills."""
+        bucket = TokenBucket(per_minute=60)
+        assert bucket.delay(60) == 0
+        bucket.tokens = 0
+        assert 0.9 < bucket.delay(1) <= 1.0
+
+    def test_adjust(self):
+        """Test actual usage is charged against the estimate."""
+        bucket = TokenBucket(per_minute=600)
+        bucket.tokens = 100
+        bucket.adjust(150)
+        assert bucket.tokens < -49
+        bucket.adjust(-10_000)
+        assert bucket.tokens == 600
+
+
+class TestRateLimiter:
+    """Test admission, AIMD adaptation and pauses."""
+
+    async def test_window_bounds_concurrency(self):
+        """Test no more requests than the window run at once."""
+        limiter = RateLimiter(max_concurrency=2)
+        peak = 0
+
+        async def request():
+            nonlocal peak
+            async with limiter.admit():
+                peak = max(peak, limiter.active)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(request() for _ in range(6)))
+        assert peak == 2
+        assert limiter.admitted == 6 and limiter.active == 0
+
+    def test_aimd(self):
+        """Test 429s halve the window and successes grow it back additively."""
+        limiter = RateLimiter(max_concurrency=8)
+        limiter.on_rate_limited(retry_after=0)
+        limiter.on_rate_limited(retry_after=0)
+        assert limiter.limit == 2
+
+        for _ in range(4):
+            limiter.on_success(0.1)
+        assert limiter.limit == 3
+        assert limiter.stats()["rate_limited"] == 2
+
+    def test_latency_congestion(self):
+        """Test a response far slower than average shrinks the window."""
+        limiter = RateLimiter(max_concurrency=4)
+        for _ in range(5):
+            limiter.on_success(0.1)
+        limiter.on_success(1.0)
+        assert limiter.window == 3.0
+
+    async def test_pause_after_rate_limit(self):
+        """Test admissions wait out Retry-After."""
+        limiter = RateLimiter(max_concurrency=4)
+        limiter.on_rate_limited(retry_after=0.1)
+
+        started = time.monotonic()
+        async with limiter.admit():
+            pass
+        assert time.monotonic() - started >= 0.09
+
+    async def test_rpm(self):
+        """Test the requests-per-minute bucket delays requests beyond the budget."""
+        limiter = RateLimiter(max_concurrency=4, rpm=600)
+        limiter.requests.tokens = 0
+
+        started = time.monotonic()
+        async with limiter.admit():
+            pass
+        assert time.monotonic() - started >= 0.09
@@ -0,0 +1,126 @@
+"""Unit tests for the LLM response cache."""
+
+import os
+import time
+
+import httpx
+import pytest
+from google.adk.models.lite_llm import LiteLlm
+from google.adk.models.llm_request import LlmRequest
+from google.genai import types
+
+from agentic_data_scientist.core import llm_clients
+from agentic_data_scientist.core.llm_clients import ClientRegistry
+from agentic_data_scientist.core.response_cache import ResponseCache, ResponseCacheMiss, request_key
+
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+ANTHROPIC_RESPONSE = {
+    "id": "msg",
+    "type": "message",
+    "role": "assistant",
+    "model": "claude-sonnet-4-5-20250929",
+    "content": [{"type": "text", "text": "done"}],
+    "stop_reason": "end_turn",
+    "usage": {"input_tokens": 1, "output_tokens": 1},
+}
+
+
+class TestResponseCache:
+    """Test keys, modes, expiry and eviction."""
+
+    def test_request_key(self):
+        """Test credentials and retry settings do not affect the key, parameters do."""
+        key = request_key("m", MESSAGES, None, {"temperature": 0, "api_key": "a", "num_retries": 3})
+        assert key == request_key("m", MESSAGES, None, {"temperature": 0, "api_key": "b"})
+        assert key != request_key("m", MESSAGES, None, {"temperature": 0.5})
+        assert key != request_key("other", MESSAGES, None, {"temperature": 0})
+
+    def test_modes(self, tmp_path):
+        """Test which requests each mode serves and stores."""
+        assert ResponseCache(tmp_path, mode="on").reads({"temperature": 0})
+        assert not ResponseCache(tmp_path, mode="on").stores({"temperature": 0.7})
+        assert ResponseCache(tmp_path, mode="record").stores({"temperature": 0.7})
+        assert not ResponseCache(tmp_path, mode="record").reads({"temperature": 0})
+        with pytest.raises(ValueError):
+            ResponseCache(tmp_path, mode="sometimes")
+
+    def test_ttl(self, tmp_path):
+        """Test expired entries are dropped, except when replaying."""
+        cache = ResponseCache(tmp_path, mode="on", ttl=60)
+        cache.put("ab" * 32, {"id": "x"})
+        assert cache.get("ab" * 32) == {"id": "x"}
+
+        cache.ttl = 1e-9
+        time.sleep(0.01)
+        assert ResponseCache(tmp_path, mode="replay", ttl=1e-9).get("ab" * 32) == {"id": "x"}
+        assert cache.get("ab" * 32) is None
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    def test_lru_eviction(self, tmp_path):
+        """Test the least recently used entries are evicted."""
+        cache = ResponseCache(tmp_path, mode="on", max_entries=3)
+        keys = [f"{i:064x}" for i in range(3)]
+        for age, key in enumerate(keys):
+            cache.put(key, {"id": key})
+            os.utime(cache._path(key), (1000 + age, 1000 + age))
+        cache.get(keys[0])
+
+        cache.put(f"{9:064x}", {"id": "new"})
+        assert cache.evictions == 2
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[1]) is None and cache.get(keys[2]) is None
+
+    def test_replay_miss(self, tmp_path):
+        """Test replay mode refuses unrecorded requests."""
+        with pytest.raises(ResponseCacheMiss):
+            ResponseCache(tmp_path, mode="replay").get("cd" * 32)
+
+
+class TestCachedCompletions:
+    """Test the pooled LLM client serves cached responses."""
+
+    @staticmethod
+    async def _ask(registry):
+        llm = LiteLlm(model="claude-sonnet-4-5-20250929", api_key="test", llm_client=registry.client("anthropic"))
+        request = LlmRequest(
+            contents=[types.Content(role="user", parts=[types.Part(text="hi")])],
+            config=types.GenerateContentConfig(temperature=0.0),
+        )
+        responses = [r async for r in llm.generate_content_async(request)]
+        return responses[-1].content.parts[0].text
+
+    async def test_record_and_replay(self, tmp_path, monkeypatch):
+        """Test recorded responses are replayed without calling the provider."""
+        calls = []
+
+        def handle(request):
+            calls.append(request.url.path)
+            return httpx.Response(200, json=ANTHROPIC_RESPONSE)
+
+        monkeypatch.setattr(llm_clients, "_transport", lambda: httpx.MockTransport(handle))
+        registry = ClientRegistry()
+        registry.cache = ResponseCache(tmp_path, mode="record")
+        assert await self._ask(registry) == "done"
+
+        registry.cache = ResponseCache(tmp_path, mode="replay")
+        assert await self._ask(registry) == "done"
+        assert calls == ["/v1/messages"]
+        assert registry.cache.stats()["hits"] == 1
+
+    async def test_deterministic_requests_cached(self, tmp_path, monkeypatch):
+        """Test a repeated temperature-0 request is served from the cache."""
+        calls = []
+
+        def handle(request):
+            calls.append(request.url.path)
+            return httpx.Response(200, json=ANTHROPIC_RESPONSE)
+
+        monkeypatch.setattr(llm_clients, "_transport", lambda: httpx.MockTransport(handle))
+        registry = ClientRegistry()
+        registry.cache = ResponseCache(tmp_path, mode="on")
+
+        assert await self._ask(registry) == "done"
+        assert await self._ask(registry) == "done"
+        assert len(calls) == 1
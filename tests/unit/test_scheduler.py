@@ -0,0 +1,97 @@
+"""Unit tests for the session admission scheduler."""
+
+import asyncio
+
+import pytest
+
+from backend.scheduler import SessionScheduler
+
+
+class TestSessionScheduler:
+    """Test concurrency limits, priorities and queue positions."""
+
+    async def test_concurrency_cap_and_priority(self):
+        """Test at most N runs execute and simple runs are admitted first."""
+        started, gates = [], {}
+        scheduler = SessionScheduler(max_concurrent=1, on_start=started.append)
+
+        def job(name):
+            gates[name] = asyncio.Event()
+            return gates[name].wait
+
+        assert scheduler.submit("o1", "orchestrated", job("o1")) is None
+        assert scheduler.submit("o2", "orchestrated", job("o2")) == 1
+        assert scheduler.submit("s1", "simple", job("s1")) == 1
+        assert scheduler.position("o2") == 2
+        assert scheduler.stats() == {"running": 1, "queued": 2, "max_concurrent": 1}
+
+        gates["o1"].set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert started == ["o1", "s1"]
+        assert scheduler.position("o2") == 1
+
+        gates["s1"].set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert started == ["o1", "s1", "o2"]
+        gates["o2"].set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert scheduler.running == 0
+
+    async def test_discard_queued(self):
+        """Test a queued run can be dropped before it starts."""
+        gate = asyncio.Event()
+        started = []
+        scheduler = SessionScheduler(max_concurrent=1, on_start=started.append)
+        scheduler.submit("a", "simple", gate.wait)
+        scheduler.submit("b", "simple", gate.wait)
+        assert scheduler.discard("b") is True
+        assert scheduler.discard("b") is False
+        gate.set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert started == ["a"]
+
+    async def test_failed_run_frees_slot(self):
+        """Test an exception in a run does not leak its slot."""
+
+        async def boom():
+            raise RuntimeError("boom")
+
+        scheduler = SessionScheduler(max_concurrent=1)
+        scheduler.submit("a", "simple", boom)
+        done = asyncio.Event()
+        scheduler.submit("b", "simple", done.wait)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert scheduler.task("b") is not None
+        done.set()
+
+    async def test_cancel_running(self):
+        """Test cancelling a running session unwinds it and admits the next one."""
+        unwound = []
+
+        async def run():
+            try:
+                await asyncio.Event().wait()
+            finally:
+                unwound.append("a")
+
+        started = []
+        scheduler = SessionScheduler(max_concurrent=1, on_start=started.append)
+        scheduler.submit("a", "simple", run)
+        scheduler.submit("b", "simple", asyncio.Event().wait)
+        await asyncio.sleep(0)
+
+        assert await scheduler.cancel("a", timeout=1) is True
+        assert unwound == ["a"]
+        assert started == ["a", "b"]
+        assert await scheduler.cancel("missing", timeout=1) is False
+        await scheduler.cancel("b", timeout=1)
+
+    def test_invalid_limit(self):
+        """Test a non-positive cap is rejected."""
+        with pytest.raises(ValueError):
+            SessionScheduler(max_concurrent=0)
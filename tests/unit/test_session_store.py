@@ -0,0 +1,181 @@
+"""Unit tests for the backend session store."""
+
+import pytest
+
+from backend.session_store import MemoryBackend, SessionStore, SQLiteBackend, decode_cursor
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path):
+    """Factory for stores over each backend; reopening reuses the same database."""
+    stores = []
+
+    def _make():
+        backend = MemoryBackend() if request.param == "memory" else SQLiteBackend(tmp_path / "sessions.db")
+        store = SessionStore(backend=backend, event_log_dir=tmp_path / "events")
+        stores.append(store)
+        return store
+
+    yield _make
+    for store in stores:
+        store.close()
+
+
+class TestSessionStore:
+    """Test SessionStore over the pluggable backends."""
+
+    def test_create_and_get(self, make_store):
+        """Test created sessions are retrievable with a live event log."""
+        store = make_store()
+        record = store.create("s1", "query", "simple", "/tmp/s1")
+        assert store.get("s1") is record
+        assert record.event_log is not None
+        assert record.status == "running"
+
+    def test_update_is_persisted(self, make_store):
+        """Test updates reach the backend after a flush."""
+        store = make_store()
+        store.create("s1", "query", "simple", "/tmp/s1")
+        store.update("s1", status="completed", duration=1.5, files_created=["a.csv"])
+        store.flush()
+        row = store._backend.load("s1")
+        assert row["status"] == "completed"
+        assert row["duration"] == 1.5
+        assert row["files_created"] == ["a.csv"]
+
+    def test_list_page_newest_first(self, make_store):
+        """Test listing order and cursor pagination."""
+        store = make_store()
+        for i in range(5):
+            record = store.create(f"s{i}", "q", "simple", "/tmp")
+            store.update(record.session_id, created_at=f"2025-01-0{i + 1}T00:00:00Z")
+
+        page, cursor = store.list_page(limit=2)
+        assert [r.session_id for r in page] == ["s4", "s3"]
+        assert cursor is not None
+        assert decode_cursor(cursor) == ("2025-01-04T00:00:00Z", "s3")
+
+        page, cursor = store.list_page(limit=2, cursor=cursor)
+        assert [r.session_id for r in page] == ["s2", "s1"]
+
+        page, cursor = store.list_page(limit=2, cursor=cursor)
+        assert [r.session_id for r in page] == ["s0"]
+        assert cursor is None
+
+    def test_list_page_offset_and_status(self, make_store):
+        """Test offset pagination and status filtering."""
+        store = make_store()
+        for i in range(4):
+            record = store.create(f"s{i}", "q", "simple", "/tmp")
+            store.update(record.session_id, created_at=f"2025-01-0{i + 1}T00:00:00Z")
+        store.update("s1", status="completed")
+        store.update("s3", status="completed")
+
+        page, _ = store.list_page(limit=2, offset=1)
+        assert [r.session_id for r in page] == ["s2", "s1"]
+
+        page, _ = store.list_page(limit=10, status="completed")
+        assert [r.session_id for r in page] == ["s3", "s1"]
+
+    def test_delete(self, make_store):
+        """Test deletion from both cache and backend."""
+        store = make_store()
+        store.create("s1", "q", "simple", "/tmp")
+        assert store.delete("s1") is True
+        assert store.get("s1") is None
+        assert store.delete("s1") is False
+
+    async def test_async_reads(self, make_store):
+        """Test the awaitable variants read through the writer thread without blocking."""
+        store = make_store()
+        store.create("s1", "q", "simple", "/tmp")
+        store.flush()
+        store._sessions.clear()  # force a backend load
+        record = await store.get_async("s1")
+        assert record.session_id == "s1" and await store.get_async("missing") is None
+        page, _ = await store.list_page_async(limit=10)
+        assert [r.session_id for r in page] == ["s1"]
+        assert await store.delete_async("s1") is True
+        assert await store.get_async("s1") is None
+
+    def test_finished_sessions_evicted(self, make_store):
+        """Test finished sessions beyond the cap leave memory and reload on demand."""
+        store = make_store()
+        store.max_cached = 2
+        records = [store.create(f"s{i}", "q", "simple", "/tmp") for i in range(3)]
+        store.update("s0", status="completed")
+        records[0].event_log.close()
+        store.create("s3", "q", "simple", "/tmp")
+        assert list(store._sessions) == ["s1", "s2", "s3"]  # running sessions stay
+        store.flush()
+        reloaded = store.get("s0")
+        assert reloaded is not records[0] and reloaded.status == "completed" and reloaded.event_log is None
+
+    def test_idle_sessions_evicted(self, make_store):
+        """Test finished sessions idle past the TTL are evicted."""
+        store = make_store()
+        store.idle_seconds = 0
+        record = store.create("s1", "q", "simple", "/tmp")
+        store.update("s1", status="error")
+        record.event_log.close()
+        store.create("s2", "q", "simple", "/tmp")
+        assert list(store._sessions) == ["s2"]
+
+    def test_invalid_cursor(self, make_store):
+        """Test malformed cursors are rejected."""
+        store = make_store()
+        with pytest.raises(ValueError):
+            store.list_page(cursor="not-a-cursor")
+
+
+class TestSQLiteDurability:
+    """Test that SQLite-backed sessions survive a restart."""
+
+    def test_sessions_survive_restart(self, tmp_path):
+        """Test records are reloaded and running sessions marked interrupted."""
+        store = SessionStore(backend=SQLiteBackend(tmp_path / "sessions.db"), event_log_dir=tmp_path / "events")
+        store.create("done", "q", "simple", "/tmp")
+        store.update("done", status="completed")
+        store.create("live", "q", "orchestrated", "/tmp")
+        store.close()
+
+        reopened = SessionStore(backend=SQLiteBackend(tmp_path / "sessions.db"), event_log_dir=tmp_path / "events")
+        try:
+            reopened.recover_interrupted()
+            reopened.flush()
+            done = reopened.get("done")
+            assert done.status == "completed"
+            assert done.event_log is None
+
+            live = reopened.get("live")
+            assert live.status == "error"
+            assert "restart" in live.error
+            assert len(reopened.list_all()) == 2
+        finally:
+            reopened.close()
+
+    def test_open_leaves_sessions_alone(self, tmp_path):
+        """Test opening a store does not touch sessions another process may be running."""
+        store = SessionStore(backend=SQLiteBackend(tmp_path / "sessions.db"), event_log_dir=tmp_path / "events")
+        store.create("live", "q", "orchestrated", "/tmp")
+        store.close()
+
+        reopened = SessionStore(backend=SQLiteBackend(tmp_path / "sessions.db"), event_log_dir=tmp_path / "events")
+        try:
+            assert reopened.get("live").status == "running"
+        finally:
+            reopened.close()
+
+    def test_queued_sessions_marked_interrupted(self, tmp_path):
+        """Test sessions still waiting for admission are not left queued forever."""
+        store = SessionStore(backend=SQLiteBackend(tmp_path / "sessions.db"), event_log_dir=tmp_path / "events")
+        store.create("waiting", "q", "simple", "/tmp", status="queued")
+        store.close()
+
+        reopened = SessionStore(backend=SQLiteBackend(tmp_path / "sessions.db"), event_log_dir=tmp_path / "events")
+        try:
+            reopened.recover_interrupted()
+            reopened.flush()
+            assert reopened.get("waiting").status == "error"
+        finally:
+            reopened.close()
@@ -0,0 +1,63 @@
+"""Unit tests for lazy imports and the startup profile."""
+
+import subprocess
+import sys
+
+from agentic_data_scientist.cli.startup_profile import format_summary, parse_importtime, summarize
+
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   encodings.aliases
+import time:       300 |        400 | encodings
+import time:      2000 |       2000 |     click.types
+import time:      1000 |       3000 |   click.core
+import time:       500 |       3500 | click
+"""
+
+
+def _loaded_after(statement):
+    """Heavy modules present in sys.modules after running ``statement`` in a fresh interpreter."""
+    code = f"{statement}; import sys; print(sorted(m for m in ('google.adk', 'litellm') if m in sys.modules))"
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return proc.stdout.strip()
+
+
+class TestLazyImports:
+    """Test the CLI and the package do not import the agent runtime up front."""
+
+    def test_cli_import(self):
+        """Test importing the CLI loads neither ADK nor LiteLLM."""
+        assert _loaded_after("import agentic_data_scientist.cli.main") == "[]"
+
+    def test_package_attribute(self):
+        """Test package attributes resolve on access."""
+        assert _loaded_after("import agentic_data_scientist") == "[]"
+        assert _loaded_after("from agentic_data_scientist import DataScientist") == "['google.adk']"
+
+    def test_models_deferred(self):
+        """Test LiteLLM is imported only when a model is first used."""
+        statement = "import agentic_data_scientist.agents.adk.utils as utils"
+        assert _loaded_after(statement) == "['google.adk']"
+        assert _loaded_after(f"{statement}; utils.DEFAULT_MODEL") == "['google.adk', 'litellm']"
+
+
+class TestStartupProfile:
+    """Test parsing and summarizing -X importtime output."""
+
+    def test_parse(self):
+        """Test timings and nesting depth are parsed and the header skipped."""
+        timings = parse_importtime(IMPORTTIME_OUTPUT)
+        assert [(t.module, t.self_us, t.cumulative_us, t.depth) for t in timings] == [
+            ("encodings.aliases", 100, 100, 1),
+            ("encodings", 300, 400, 0),
+            ("click.types", 2000, 2000, 2),
+            ("click.core", 1000, 3000, 1),
+            ("click", 500, 3500, 0),
+        ]
+
+    def test_summarize(self):
+        """Test totals come from top-level imports and packages aggregate self time."""
+        summary = summarize(parse_importtime(IMPORTTIME_OUTPUT), top=1)
+        assert summary == {"total_ms": 3.9, "packages": [("click", 3.5)], "modules": [("click.types", 2.0)]}
+        assert "within 200 ms budget" in format_summary("cli", "click", summary, budget_ms=200)
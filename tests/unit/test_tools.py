@@ -7,12 +7,16 @@ security boundary validation and edge cases.
 
 import base64
 import json
+import os
+import sys
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 
 import pytest
 
 from agentic_data_scientist.tools import (
+    WORKING_DIR_STATE_KEY,
     directory_tree,
     fetch_url,
     get_file_info,
@@ -21,6 +25,17 @@ from agentic_data_scientist.tools import (
     read_media_file,
     search_files,
 )
+from agentic_data_scientist.tools.file_ops import (
+    ToolResultCache,
+    _enforce_total_budget,
+    directory_tree_bound,
+    forget_session_cache,
+    get_file_info_bound,
+    list_directory_bound,
+    read_file_bound,
+    session_tool_cache,
+    tool_cache_stats,
+)
 
 
 @pytest.fixture
@@ -446,3 +461,110 @@ class TestSecurityValidation:
 
         # Should work as it resolves within working dir
         assert "Hello, world!" in result
+
+
+class TestSessionTools:
+    """Test the agent-facing tools resolve paths against the session's working directory."""
+
+    def test_reads_from_session_working_dir(self, temp_workspace):
+        """Test the sandbox root comes from the tool context state."""
+        context = SimpleNamespace(state={WORKING_DIR_STATE_KEY: str(temp_workspace)})
+
+        assert read_file_bound("test.txt", context) == "Hello, world!"
+        assert "[FILE]test.txt" in list_directory_bound(context)
+        assert "Error" in read_file_bound("../outside.txt", context)
+
+    def test_missing_working_dir(self, temp_workspace):
+        """Test tools refuse to run without a session working directory."""
+        result = read_file_bound(str(temp_workspace / "test.txt"), SimpleNamespace(state={}))
+
+        assert result.startswith("Error")
+
+
+def _session_context(workspace, session_id):
+    return SimpleNamespace(state={WORKING_DIR_STATE_KEY: str(workspace)}, session=SimpleNamespace(id=session_id))
+
+
+def _bump(path, content):
+    """Rewrite a file and move its mtime forward so the change is visible on coarse clocks."""
+    mtime = path.stat().st_mtime_ns
+    path.write_text(content)
+    os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+
+
+class TestToolResultCache:
+    """Test memoized results of the read-only file tools."""
+
+    def test_repeated_read_is_cached(self, temp_workspace):
+        """Test a second read of an unchanged file is a cache hit."""
+        context = _session_context(temp_workspace, "cache-read")
+        assert read_file_bound("test.txt", context) == "Hello, world!"
+        assert read_file_bound("./subdir/../test.txt", context) == "Hello, world!"
+        assert read_file_bound("test.txt", context, head=1) == "Hello, world!"
+
+        stats = session_tool_cache(context).stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 2)
+        assert tool_cache_stats()["sessions"]["cache-read"] == stats
+
+    def test_changed_file_invalidates(self, temp_workspace):
+        """Test a modified file is read again."""
+        context = _session_context(temp_workspace, "cache-invalidate")
+        assert read_file_bound("test.txt", context) == "Hello, world!"
+        _bump(temp_workspace / "test.txt", "Changed")
+        assert read_file_bound("test.txt", context) == "Changed"
+        assert "size: 7.0 B" in get_file_info_bound("test.txt", context)
+        assert session_tool_cache(context).stats()["invalidations"] == 1
+
+    def test_directory_tools(self, temp_workspace):
+        """Test listings are invalidated by entries added anywhere in the tree."""
+        context = _session_context(temp_workspace, "cache-dirs")
+        listing = list_directory_bound(context)
+        tree = directory_tree_bound(context)
+        assert list_directory_bound(context) == listing and directory_tree_bound(context) == tree
+        assert session_tool_cache(context).stats()["hits"] == 2
+
+        (temp_workspace / "subdir" / "nested" / "new.txt").write_text("new")
+        assert directory_tree_bound(context) != tree
+        assert list_directory_bound(context) == listing
+
+    def test_errors_not_cached(self, temp_workspace):
+        """Test a missing file is found once it is created."""
+        context = _session_context(temp_workspace, "cache-errors")
+        assert read_file_bound("later.txt", context).startswith("Error")
+        (temp_workspace / "later.txt").write_text("here now")
+        assert read_file_bound("later.txt", context) == "here now"
+
+    def test_file_info_not_cached(self, temp_workspace):
+        """Test file metadata is read fresh, as its access time changes on every read."""
+        context = _session_context(temp_workspace, "cache-info")
+        assert get_file_info_bound("test.txt", context) == get_file_info_bound("test.txt", context)
+        assert session_tool_cache(context).stats()["entries"] == 0
+
+    def test_total_byte_budget(self, temp_workspace, monkeypatch):
+        """Test the least recently used sessions give up results beyond the shared budget."""
+        first, second = (_session_context(temp_workspace, f"cache-total-{i}") for i in range(2))
+        read_file_bound("test.txt", first)
+        read_file_bound("test.txt", second)
+        budget = session_tool_cache(second).bytes
+        monkeypatch.setattr("agentic_data_scientist.tools.file_ops.TOOL_CACHE_TOTAL_BYTES", budget)
+        _enforce_total_budget()
+        assert session_tool_cache(first).stats()["entries"] == 0
+        assert session_tool_cache(second).stats()["entries"] == 1
+
+    def test_forget_session_cache(self, temp_workspace):
+        """Test a session's cache is dropped when its run closes."""
+        context = _session_context(temp_workspace, "cache-forget")
+        read_file_bound("test.txt", context)
+        forget_session_cache("cache-forget")
+        assert "cache-forget" not in tool_cache_stats()["sessions"]
+
+    def test_lru_byte_budget(self):
+        """Test the least recently used results are evicted beyond the byte budget."""
+        cache = ToolResultCache(max_bytes=3 * sys.getsizeof("x" * 100), max_entries=10)
+        for name in "abcd":
+            cache.put(("read_file", name, ()), "x" * 100, (), ())
+            if name == "b":
+                assert cache.get(("read_file", "a", ())) is not None
+        assert cache.get(("read_file", "b", ())) is None
+        assert cache.get(("read_file", "a", ())) is not None
+        assert cache.stats()["evictions"] == 1
@@ -0,0 +1,61 @@
+"""Unit tests for streaming upload handling."""
+
+import hashlib
+import io
+from types import SimpleNamespace
+
+import pytest
+
+from backend.uploads import UploadBudget, UploadTooLarge, copy_stream, safe_filename, save_uploads
+
+
+def _upload(name: str, data: bytes):
+    """Minimal stand-in for a Starlette UploadFile."""
+    return SimpleNamespace(filename=name, file=io.BytesIO(data))
+
+
+class TestCopyStream:
+    """Test chunked copying with hashing and limits."""
+
+    def test_size_and_hash(self, tmp_path):
+        """Test size and SHA-256 are computed while copying."""
+        data = b"a,b\n1,2\n" * 1000
+        size, sha256 = copy_stream(io.BytesIO(data), tmp_path / "out.csv", UploadBudget(), chunk_size=64)
+        assert size == len(data)
+        assert sha256 == hashlib.sha256(data).hexdigest()
+        assert (tmp_path / "out.csv").read_bytes() == data
+
+    def test_per_file_limit(self, tmp_path):
+        """Test an oversized file is rejected and removed."""
+        with pytest.raises(UploadTooLarge):
+            copy_stream(io.BytesIO(b"x" * 100), tmp_path / "big", UploadBudget(), max_file_bytes=50, chunk_size=10)
+        assert not (tmp_path / "big").exists()
+
+    def test_session_budget(self, tmp_path):
+        """Test the shared budget caps the total across files."""
+        budget = UploadBudget(limit=150)
+        copy_stream(io.BytesIO(b"x" * 100), tmp_path / "a", budget)
+        with pytest.raises(UploadTooLarge):
+            copy_stream(io.BytesIO(b"x" * 100), tmp_path / "b", budget)
+
+
+class TestSaveUploads:
+    """Test concurrent saving of multiple uploads."""
+
+    async def test_save_multiple(self, tmp_path):
+        """Test all uploads are written with their metadata."""
+        results = await save_uploads([_upload("a.csv", b"1"), _upload("b.csv", b"22")], tmp_path, UploadBudget())
+        assert [(r.name, r.size) for r in results] == [("a.csv", 1), ("b.csv", 2)]
+        assert (tmp_path / "b.csv").read_bytes() == b"22"
+
+    async def test_duplicate_names_rejected(self, tmp_path):
+        """Test duplicate filenames in one request are rejected."""
+        with pytest.raises(ValueError):
+            await save_uploads([_upload("a.csv", b"1"), _upload("a.csv", b"2")], tmp_path, UploadBudget())
+
+    def test_safe_filename(self):
+        """Test directory components are stripped from client filenames."""
+        assert safe_filename("../../etc/passwd") == "passwd"
+        assert safe_filename("C:\\data\\x.csv") == "x.csv"
+        with pytest.raises(ValueError):
+            safe_filename("..")
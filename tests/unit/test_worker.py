@@ -0,0 +1,60 @@
+"""Unit tests for the out-of-process agent worker."""
+
+import io
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import agentic_data_scientist
+from backend import worker
+
+
+class _FakeDataScientist:
+    closed = False
+
+    def __init__(self, agent_type, working_dir, auto_cleanup):
+        self.agent_type = agent_type
+
+    async def run_async(self, query, files=None, stream=False):
+        async def events():
+            yield {"type": "message", "content": query, "files": [name for name, _ in files]}
+            yield {"type": "completed", "duration": 0.1}
+
+        return events()
+
+    async def close(self):
+        _FakeDataScientist.closed = True
+
+
+class TestWorker:
+    """Test the worker's event framing and crash reporting."""
+
+    async def test_run_writes_event_lines(self, monkeypatch):
+        """Test each event is written as one JSON line."""
+        monkeypatch.setattr(agentic_data_scientist, "DataScientist", _FakeDataScientist)
+        out = io.StringIO()
+        job = {"query": "hi", "agent_type": "adk", "working_dir": "/tmp", "files": [["a.csv", "/tmp/a.csv"]]}
+
+        await worker._run(job, out)
+
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert lines == [
+            {"type": "message", "content": "hi", "files": ["a.csv"]},
+            {"type": "completed", "duration": 0.1},
+        ]
+        assert _FakeDataScientist.closed
+
+    def test_kill_without_process_groups(self, monkeypatch):
+        """Test platforms without killpg (Windows) kill the worker process itself."""
+        monkeypatch.delattr(worker.os, "killpg", raising=False)
+        proc = SimpleNamespace(pid=1, kill=lambda: killed.append(True))
+        killed = []
+        worker._kill_group(proc)
+        assert killed == [True]
+
+    async def test_crashed_worker_raises(self):
+        """Test a worker exiting with a non-zero status surfaces as WorkerCrashed."""
+        with pytest.raises(worker.WorkerCrashed, match="code 1"):
+            async for _ in worker.run_in_worker({}):
+                pass
@@ -0,0 +1,115 @@
+"""Unit tests for the workspace watcher."""
+
+import asyncio
+import hashlib
+from datetime import datetime
+from types import SimpleNamespace
+
+from agentic_data_scientist.core.api import DataScientist
+from agentic_data_scientist.core.workspace import (
+    ManifestEntry,
+    WorkspaceWatcher,
+    build_manifest,
+    is_artifact,
+    scan_artifacts,
+)
+
+
+class TestIsArtifact:
+    """Test which workspace paths count as agent outputs."""
+
+    def test_excluded_paths(self):
+        """Test hidden directories and user data are excluded."""
+        assert is_artifact(("results", "plot.png"))
+        assert not is_artifact(("user_data", "data.csv"))
+        assert not is_artifact((".venv", "lib", "x.py"))
+        assert not is_artifact(())
+
+
+class TestManifest:
+    """Test the single-pass artifact manifest."""
+
+    def test_prunes_excluded_subtrees(self, tmp_path):
+        """Test hidden directories and user_data are never descended into."""
+        (tmp_path / ".venv" / "lib").mkdir(parents=True)
+        (tmp_path / ".venv" / "lib" / "mod.py").write_text("x")
+        (tmp_path / "user_data").mkdir()
+        (tmp_path / "user_data" / "in.csv").write_text("x")
+        (tmp_path / "figs").mkdir()
+        (tmp_path / "figs" / "a.png").write_bytes(b"png")
+        (tmp_path / "report.md").write_text("# hi")
+
+        assert sorted(scan_artifacts(tmp_path)) == ["figs/a.png", "report.md"]
+        manifest = build_manifest(tmp_path)
+        assert [e.path for e in manifest] == ["figs/a.png", "report.md"]
+        assert manifest[0].size == 3
+        assert manifest[0].sha256 == hashlib.sha256(b"png").hexdigest()
+
+    def test_reuses_hashes_of_unchanged_files(self, tmp_path):
+        """Test files with the same size and mtime are not re-hashed."""
+        (tmp_path / "a.txt").write_text("a")
+        first = build_manifest(tmp_path)
+        stale = {e.path: ManifestEntry(e.path, e.size, e.mtime, "cached") for e in first}
+        assert build_manifest(tmp_path, previous=stale)[0].sha256 == "cached"
+
+
+class TestWorkspaceWatcher:
+    """Test live and final file events."""
+
+    async def test_reports_created_and_modified(self, tmp_path):
+        """Test new and changed files are reported once each."""
+        (tmp_path / "existing.txt").write_text("old")
+        (tmp_path / "user_data").mkdir()
+        events = []
+
+        async def on_event(event):
+            events.append((event.type, event.file_path, event.file_size))
+
+        watcher = WorkspaceWatcher(tmp_path, on_event, debounce_ms=50)
+        await watcher.start()
+        await asyncio.sleep(0.2)
+        (tmp_path / "out").mkdir()
+        (tmp_path / "out" / "table.csv").write_text("a,b")
+        (tmp_path / "user_data" / "ignored.csv").write_text("x")
+        for _ in range(50):
+            if events:
+                break
+            await asyncio.sleep(0.05)
+        (tmp_path / "existing.txt").write_text("changed")
+        final = await watcher.stop()
+        events += [(e.type, e.file_path, e.file_size) for e in final]
+
+        assert ("file_created", "out/table.csv", 3) in events
+        assert ("file_modified", "existing.txt", 7) in events
+        assert len(events) == 2
+        assert watcher.files == ["existing.txt", "out/table.csv"]
+
+
+class _FakeRunner:
+    """Runner stand-in that writes a file between two text events."""
+
+    def __init__(self, working_dir):
+        self.working_dir = working_dir
+
+    async def run_async(self, **kwargs):
+        part = SimpleNamespace(text="working", thought=False, function_call=None, function_response=None)
+        yield SimpleNamespace(author="agent", content=SimpleNamespace(parts=[part]), usage_metadata=None)
+        (self.working_dir / "result.txt").write_text("done")
+        yield SimpleNamespace(author="agent", content=SimpleNamespace(parts=[part]), usage_metadata=None)
+
+
+class TestStreamFileEvents:
+    """Test file events are interleaved into the response stream."""
+
+    async def test_stream_includes_file_events(self, tmp_path):
+        """Test the stream reports artifacts and lists them on completion."""
+        ds = DataScientist(agent_type="adk", working_dir=str(tmp_path))
+        ds.runner = _FakeRunner(tmp_path)
+
+        events = [e async for e in ds._stream_responses("prompt", datetime.now())]
+        assert [e["type"] for e in events].count("message") == 2
+        created = next(e for e in events if e["type"] == "file_created")
+        assert (created["file_path"], created["file_size"]) == ("result.txt", 4)
+        assert events[-1]["type"] == "completed"
+        assert events[-1]["files_created"] == ["result.txt"]
+        assert events[-1]["manifest"][0]["sha256"] == hashlib.sha256(b"done").hexdigest()